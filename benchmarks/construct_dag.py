@@ -0,0 +1,193 @@
+"""
+Benchmark DAG construction on a synthetic manifest.
+
+Times `construct_dag` end to end on a generated manifest, from an empty cache dir
+and from a warm one, and compares building the DAG records as the slotted
+dataclasses used by `orchestra_dbt.models` against equivalent validating
+pydantic models.
+
+    uv run python benchmarks/construct_dag.py --nodes 50000
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import timeit
+from datetime import datetime
+from pathlib import Path
+from typing import Literal
+
+from pydantic import BaseModel
+
+from orchestra_dbt.dag import construct_dag
+from orchestra_dbt.models import (
+    Edge,
+    Freshness,
+    FreshnessConfig,
+    MaterialisationNode,
+    NodeType,
+    SourceFreshness,
+    StateApiModel,
+)
+from orchestra_dbt.run_context import invalidate_run_context
+
+
+class _PydanticFreshnessConfig(BaseModel):
+    inherited_from: str | None = None
+    minutes_sla: int | None = None
+    updates_on: Literal["any", "all"] = "any"
+
+
+class _PydanticMaterialisationNode(BaseModel):
+    last_updated: datetime | None = None
+    node_type: NodeType = NodeType.MATERIALISATION
+    asset_external_id: str
+    checksum: str
+    dbt_path: str
+    file_path: str
+    freshness_config: _PydanticFreshnessConfig
+    freshness: Freshness
+    reason: str
+    sources: dict[str, datetime]
+
+
+class _PydanticEdge(BaseModel):
+    from_: str
+    to_: str
+
+
+def _synthetic_manifest(node_count: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    nodes: dict[str, dict] = {}
+    child_map: dict[str, list[str]] = {}
+    source_ids = [
+        f"source.bench.raw.table_{i}" for i in range(max(1, node_count // 50))
+    ]
+    for source_id in source_ids:
+        child_map[source_id] = []
+
+    node_ids = [f"model.bench.model_{i}" for i in range(node_count)]
+    for i, node_id in enumerate(node_ids):
+        upstream = (
+            [rng.choice(source_ids)]
+            if i < len(source_ids) or rng.random() < 0.1
+            else []
+        )
+        upstream += rng.sample(node_ids[:i], k=min(i, rng.randint(1, 3))) if i else []
+        nodes[node_id] = {
+            "resource_type": "model",
+            "package_name": "bench",
+            "original_file_path": f"models/model_{i}.sql",
+            "relation_name": f'"db"."bench"."model_{i}"',
+            "checksum": {"name": "sha256", "checksum": f"{i:064x}"},
+            "depends_on": {"nodes": upstream, "macros": []},
+            "config": {
+                "materialized": "table",
+                "freshness": (
+                    {"build_after": {"count": 1, "period": "hour"}}
+                    if rng.random() < 0.2
+                    else None
+                ),
+            },
+            "compiled_code": "select 1 as id\n" * 20,
+        }
+        child_map[node_id] = []
+        for parent in upstream:
+            child_map[parent].append(node_id)
+
+    return {
+        "metadata": {"project_name": "bench"},
+        "nodes": nodes,
+        "child_map": child_map,
+    }
+
+
+def _time(label: str, fn, repeat: int, setup=lambda: None) -> float:
+    best = min(timeit.repeat(fn, setup, number=1, repeat=repeat))
+    print(f"{label:<48} {best:8.3f}s")
+    return best
+
+
+def _record_kwargs(i: int) -> dict:
+    return {
+        "asset_external_id": f"model.bench.model_{i}",
+        "checksum": f"{i:064x}",
+        "dbt_path": f"models/model_{i}.sql",
+        "file_path": f"models/model_{i}.sql",
+        "freshness": Freshness.DIRTY,
+        "reason": "Model not previously seen in state.",
+        "sources": {},
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--nodes", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    records = [_record_kwargs(i) for i in range(args.nodes)]
+    print(f"Building {args.nodes} DAG records (+2 edges each):")
+    pydantic_seconds = _time(
+        "pydantic BaseModel",
+        lambda: [
+            (
+                _PydanticMaterialisationNode(
+                    **record, freshness_config=_PydanticFreshnessConfig()
+                ),
+                _PydanticEdge(from_="a", to_=record["asset_external_id"]),
+                _PydanticEdge(from_="b", to_=record["asset_external_id"]),
+            )
+            for record in records
+        ],
+        args.repeat,
+    )
+    dataclass_seconds = _time(
+        "slotted dataclass",
+        lambda: [
+            (
+                MaterialisationNode(**record, freshness_config=FreshnessConfig()),
+                Edge(from_="a", to_=record["asset_external_id"]),
+                Edge(from_="b", to_=record["asset_external_id"]),
+            )
+            for record in records
+        ],
+        args.repeat,
+    )
+    print(f"{'speedup':<48} {pydantic_seconds / dataclass_seconds:8.1f}x\n")
+
+    with tempfile.TemporaryDirectory() as project_dir:
+        manifest_path = Path(project_dir) / "manifest.json"
+        manifest_path.write_text(json.dumps(_synthetic_manifest(args.nodes)))
+        size_mb = manifest_path.stat().st_size / 1024 / 1024
+        print(f"construct_dag on a {args.nodes}-node manifest ({size_mb:.0f}MB):")
+
+        # Keep settings discovery and the local state backend inside the temp dir.
+        os.chdir(project_dir)
+        os.environ["ORCHESTRA_STATE_FILE"] = str(Path(project_dir) / "state.json")
+
+        def build() -> None:
+            construct_dag(
+                SourceFreshness(sources={}),
+                StateApiModel(state={}),
+                manifest_override=str(manifest_path),
+            )
+
+        cache_dirs = iter(range(args.repeat))
+
+        def fresh_cache_dir() -> None:
+            cache_dir = Path(project_dir) / f"cache_{next(cache_dirs)}"
+            os.environ["ORCHESTRA_CACHE_DIR"] = str(cache_dir)
+            invalidate_run_context()
+
+        # Each cold repeat starts from an empty cache dir, so nothing it times
+        # was written by an earlier repeat.
+        _time("construct_dag (cold cache)", build, args.repeat, fresh_cache_dir)
+        # The last cold repeat left its cache dir populated.
+        _time("construct_dag (warm cache)", build, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,3 @@
-from collections import defaultdict, deque
 from typing import cast
 
 from .models import FreshnessConfig, MaterialisationNode, Node, NodeType, ParsedDag
@@ -40,37 +39,8 @@ def parse_freshness_config(config_on_node: dict | None) -> FreshnessConfig:
     return freshness_config
 
 
-def _build_reverse_dependency_graphs(
-    dag: ParsedDag,
-) -> tuple[dict[str, list[str]], dict[str, list[str]], dict[str, int]]:
-    """
-    Build reverse dependency graph structures from DAG edges for backwards traversal.
-
-    Returns:
-        - children: parent -> list of children
-        - parents: child -> list of parents
-        - out_degree: node -> number of downstream dependencies (children count)
-    """
-    children: dict[str, list[str]] = defaultdict(list)
-    parents: dict[str, list[str]] = defaultdict(list)
-    out_degree: dict[str, int] = defaultdict(int)
-
-    for edge in dag.edges:
-        parent, child = edge.from_, edge.to_
-        children[parent].append(child)
-        parents[child].append(parent)
-        out_degree[parent] += 1
-
-    # Initialize out_degree for all nodes (nodes with no children will have 0)
-    for node_id in dag.nodes.keys():
-        if node_id not in out_degree:
-            out_degree[node_id] = 0
-
-    return children, parents, out_degree
-
-
 def _propagate_config_to_node(
-    node_id: str, children: dict[str, list[str]], dag: ParsedDag
+    node_id: str, child_ids: list[str], dag: ParsedDag
 ) -> None:
     """
     Propagate freshness config from children to the current node.
@@ -88,7 +58,6 @@ def _propagate_config_to_node(
     if materialisation_node.freshness_config.minutes_sla is not None:
         return
 
-    child_ids = children.get(node_id, [])
     if not child_ids:
         return
 
@@ -117,19 +86,6 @@ def _propagate_config_to_node(
             break
 
 
-def _enqueue_parents(
-    node_id: str,
-    parents: dict[str, list[str]],
-    out_degree: dict[str, int],
-    queue: deque[str],
-) -> None:
-    """Enqueue parent nodes for processing after the current node is processed."""
-    for parent in parents[node_id]:
-        out_degree[parent] -= 1
-        if out_degree[parent] == 0:
-            queue.append(parent)
-
-
 def propagate_freshness_config(parsed_dag: ParsedDag) -> None:
     """
     Propagate freshness config backwards through the DAG.
@@ -138,18 +94,15 @@ def propagate_freshness_config(parsed_dag: ParsedDag) -> None:
     propagating the minimum minutes_sla from children to parents.
     Only updates nodes that don't already have a config.
     """
-    children, parents, out_degree = _build_reverse_dependency_graphs(parsed_dag)
-
-    # Queue for nodes with no children (out_degree 0) - these are at the end of the DAG
-    queue = deque[str]([n for n in parsed_dag.nodes.keys() if out_degree[n] == 0])
-
-    while queue:
-        current = queue.popleft()
-
-        # Process the node to potentially propagate config from children
-        _propagate_config_to_node(node_id=current, children=children, dag=parsed_dag)
-
-        # Queue parents for processing (work backwards)
-        _enqueue_parents(
-            node_id=current, parents=parents, out_degree=out_degree, queue=queue
+    graph = parsed_dag.graph
+
+    # Children first (end of DAG), working backwards to their parents
+    for current in reversed(graph.topological_order()):
+        # Edge endpoints that are not DAG nodes have no config to update.
+        if current >= graph.node_count:
+            continue
+        _propagate_config_to_node(
+            node_id=graph.ids[current],
+            child_ids=graph.child_ids(current),
+            dag=parsed_dag,
         )
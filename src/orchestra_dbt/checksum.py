@@ -1,26 +1,111 @@
-from hashlib import sha256
-from os.path import getsize
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
-from .constants import MAX_SEED_SIZE_BYTES
-from .logger import log_error, log_warn
-from .utils import load_seed_bytes
+from .logger import log_debug, log_error
+from .utils import write_bytes_atomically
+
+# Seed checksums in state without a recorded algorithm were made with this.
+DEFAULT_SEED_CHECKSUM_ALGORITHM = "sha256"
+_CACHE_FILE = "seed_checksums.json"
+# A file modified this recently may still change within the same mtime tick,
+# so its digest is not remembered (the same rule git uses for its index).
+_RACY_WINDOW_NS = 2 * 10**9
+
+
+def _seed_digest(file_path: str, algorithm: str) -> str:
+    # Streamed in fixed-size chunks, so memory use does not grow with the seed.
+    with open(file_path, "rb") as f:
+        return hashlib.file_digest(f, algorithm).hexdigest()
+
+
+class SeedChecksumCache:
+    """
+    Seed digests remembered in `directory` against each file's path, size,
+    mtime and inode, so unchanged seeds are not re-read on every run. Only
+    the seeds looked up during a run are kept when it is saved. Safe to use
+    from several threads.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._path = directory / _CACHE_FILE
+        try:
+            entries = json.loads(self._path.read_text("utf-8"))
+        except (OSError, ValueError):
+            entries = {}
+        self._known: dict[str, list] = entries if isinstance(entries, dict) else {}
+        self._used: dict[str, list] = {}
+        self._lock = threading.Lock()
+
+    def digest(
+        self, file_path: str, algorithm: str = DEFAULT_SEED_CHECKSUM_ALGORITHM
+    ) -> str:
+        """Raises `OSError` if the seed cannot be read."""
+        stat = os.stat(file_path)
+        key = f"{algorithm}:{os.path.abspath(file_path)}"
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        known = self._known.get(key)
+        if isinstance(known, list) and len(known) == 4 and known[:3] == signature:
+            digest = str(known[3])
+        else:
+            digest = _seed_digest(file_path, algorithm)
+            if time.time_ns() - stat.st_mtime_ns < _RACY_WINDOW_NS:
+                return digest
+        with self._lock:
+            self._used[key] = [*signature, digest]
+        return digest
+
+    def save(self) -> None:
+        if self._used == self._known:
+            return
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            write_bytes_atomically(self._path, json.dumps(self._used).encode())
+        except OSError as e:
+            log_debug(f"Could not write the seed checksum cache: {e}")
 
 
 def calculate_checksum(
-    resource_type: str, node_checksum: str, file_path: str
+    resource_type: str,
+    node_checksum: str,
+    file_path: str,
+    cache: SeedChecksumCache | None = None,
+    algorithm: str = DEFAULT_SEED_CHECKSUM_ALGORITHM,
 ) -> str | None:
     if resource_type != "seed":
         return node_checksum
 
     try:
-        file_size = getsize(file_path)
-        if file_size > MAX_SEED_SIZE_BYTES:
-            log_warn(
-                f"Seed file {file_path} ({file_size / 1024 / 1024:.2f}MB) is over "
-                f"{MAX_SEED_SIZE_BYTES / 1024 / 1024:.2f}MB. Skipping checksum."
-            )
-            return None
-        return sha256(load_seed_bytes(file_path)).hexdigest()
+        if cache is not None:
+            return cache.digest(file_path, algorithm)
+        return _seed_digest(file_path, algorithm)
     except FileNotFoundError:
         log_error(f"Seed file {file_path} not found. Cannot check state for this node.")
         return None
+
+
+def calculate_seed_checksums(
+    file_paths: Iterable[str],
+    cache: SeedChecksumCache | None = None,
+    algorithm: str = DEFAULT_SEED_CHECKSUM_ALGORITHM,
+) -> dict[str, str | None]:
+    """
+    `calculate_checksum` for each seed in `file_paths`, keyed by path. hashlib
+    releases the GIL while hashing, so the seeds are hashed concurrently.
+    """
+    unique_paths = list(dict.fromkeys(file_paths))
+    if not unique_paths:
+        return {}
+
+    def checksum(file_path: str) -> str | None:
+        return calculate_checksum(
+            "seed", "", file_path, cache=cache, algorithm=algorithm
+        )
+
+    with ThreadPoolExecutor() as executor:
+        return dict(zip(unique_paths, executor.map(checksum, unique_paths)))
@@ -8,15 +8,10 @@ import click
 
 from .build_after import propagate_freshness_config
 from .compatibility import dbt_core_import_error_message
-from .config import (
-    get_orchestra_api_key,
-    load_orchestra_dbt_settings,
-    resolve_state_backend_config,
-)
+from .config import get_orchestra_api_key
 from .constants import SERVICE_NAME
 from .dag import construct_dag
-from .logger import log_debug, log_error, log_info, log_reused_nodes
-from .ls import get_paths_to_run
+from .logger import log_debug, log_error, log_info, log_reused_nodes, log_warn
 from .models import (
     MaterialisationNode,
     NodeType,
@@ -30,12 +25,23 @@ from .modify import (
     snapshot_selectors_file,
 )
 from .orchestra import is_warn
-from .patcher import patch_seed_properties, patch_sql_files, revert_patching
+from .patcher import (
+    PatchSnapshot,
+    patch_seed_properties,
+    patch_sql_files,
+    restore_partial_parse,
+    revert_patching,
+    snapshot_partial_parse,
+)
+from .prefetch import prefetch_run_inputs
+from .reused_selectors import load_reused_node_selectors
+from .run_context import get_run_context
+from .run_results import write_reused_run_results
 from .sao import Freshness, calculate_nodes_to_run
-from .source_freshness import get_source_freshness
-from .state import StateLoadError, StateSaveError, load_state, save_state, update_state
-from .state_types import StateBackendKind
-from .target_finder import find_target_in_args
+from .selection import UnsupportedSelectionError
+from .session import DbtSession
+from .state import StateSaveError, save_state, update_state
+from .state_types import StateBackendConfig, StateBackendKind
 
 
 def _usage_program() -> str:
@@ -50,8 +56,7 @@ def _welcome() -> None:
     log_info(f"Version: {project_version}. Stateful orchestration enabled.")
 
 
-def _validate_environment() -> None:
-    backend_cfg = resolve_state_backend_config()
+def _validate_environment(backend_cfg: StateBackendConfig) -> None:
     match backend_cfg.kind:
         case StateBackendKind.LOCAL_FILE:
             log_debug("State backend: local file (path configured).")
@@ -80,6 +85,41 @@ def _run_dbt_passthrough(dbt_args: tuple[str, ...]) -> None:
         sys.exit(1)
 
 
+def _run_dbt(cmd: list[str], session: DbtSession | None) -> int:
+    if session is None:
+        return subprocess.run(cmd).returncode
+    exit_code = session.run(cmd)
+    session.close()
+    return exit_code
+
+
+def _open_session(dbt_args: tuple[str, ...]) -> DbtSession | None:
+    session = DbtSession(dbt_args[2:])
+    try:
+        if session.open():
+            return session
+    except ImportError as import_error:
+        log_error(dbt_core_import_error_message(import_error))
+        sys.exit(1)
+    log_warn(
+        "Could not parse the dbt project once for the run. Using separate dbt invocations."
+    )
+    return None
+
+
+def _reused_node_selectors(
+    nodes_to_reuse: dict[str, MaterialisationNode],
+) -> list[str] | None:
+    try:
+        return load_reused_node_selectors(nodes_to_reuse.keys())
+    # No readable manifest, or reused nodes it cannot express as selectors.
+    except (UnsupportedSelectionError, OSError, ValueError) as e:
+        log_warn(
+            f"Could not build selectors for the reused nodes ({e}). Patching the reused files instead."
+        )
+        return None
+
+
 def _complete_run(
     state: StateApiModel,
     parsed_dag: ParsedDag,
@@ -130,94 +170,129 @@ def main(args: tuple[str, ...]) -> None:
         sys.exit(0)
 
     try:
-        settings = load_orchestra_dbt_settings()
+        context = get_run_context()
     except ValueError as exc:
         log_error(str(exc))
         sys.exit(1)
 
+    settings = context.settings
     if not settings.use_stateful:
         log_debug("Stateful orchestration is disabled. Running dbt command directly.")
         _run_dbt_passthrough(dbt_args)
 
-    if dbt_args[1] not in ["build", "run", "test"]:
+    if dbt_args[1] not in ["build", "run", "test", "seed"]:
         log_debug(
             f"dbt command '{dbt_args[1]}' not supported for stateful orchestration."
         )
         _run_dbt_passthrough(dbt_args)
 
-    _welcome()
-    _validate_environment()
+    # `dbt seed` only loads seeds, so it is only worth orchestrating when seeds
+    # can be reused.
+    seeds_only = dbt_args[1] == "seed"
+    if seeds_only and not settings.seed_state_orchestration:
+        log_debug(
+            "Seed state orchestration is disabled. Running dbt seed command directly."
+        )
+        _run_dbt_passthrough(dbt_args)
 
-    try:
-        paths_to_run: list[str] | None = get_paths_to_run(dbt_args[2:])
-    except ImportError as import_error:
-        log_error(dbt_core_import_error_message(import_error))
-        sys.exit(1)
+    _welcome()
+    _validate_environment(context.state_backend_config)
 
-    try:
-        source_freshness: SourceFreshness | None = get_source_freshness(
-            target=find_target_in_args(list(dbt_args))
-        )
-    except ImportError as import_error:
-        log_error(dbt_core_import_error_message(import_error))
-        sys.exit(1)
-    if not source_freshness:
-        sys.exit(subprocess.run(dbt_args).returncode)
-    log_info(f"Collected {len(source_freshness.sources)} source(s) information.")
+    session = _open_session(dbt_args) if settings.single_session else None
 
     try:
-        state = load_state()
-    except StateLoadError as e:
-        log_error(str(e))
-        sys.exit(1)
+        try:
+            prefetched = prefetch_run_inputs(dbt_args, session=session)
+        except ImportError as import_error:
+            log_error(dbt_core_import_error_message(import_error))
+            sys.exit(1)
+        source_freshness = prefetched.source_freshness
+        if not source_freshness:
+            sys.exit(_run_dbt(list(dbt_args), session))
+        log_info(f"Collected {len(source_freshness.sources)} source(s) information.")
+        node_ids_to_run = prefetched.node_ids_to_run
+
+        if prefetched.state is None:
+            log_error(str(prefetched.state_load_error))
+            sys.exit(1)
+        state = prefetched.state
 
-    parsed_dag = construct_dag(source_freshness, state)
+        parsed_dag = construct_dag(source_freshness, state)
 
-    # Propagate freshness config to upstream nodes
-    propagate_freshness_config(parsed_dag)
+        # Propagate freshness config to upstream nodes
+        propagate_freshness_config(parsed_dag)
 
-    if "--full-refresh" in dbt_args:
-        log_info("Full refresh detected. Stateful orchestration disabled.")
-        _complete_run(
-            state,
-            parsed_dag,
-            source_freshness,
-            dbt_exit_code=subprocess.run(dbt_args).returncode,
-        )
+        if "--full-refresh" in dbt_args:
+            log_info("Full refresh detected. Stateful orchestration disabled.")
+            _complete_run(
+                state,
+                parsed_dag,
+                source_freshness,
+                dbt_exit_code=_run_dbt(list(dbt_args), session),
+            )
 
-    # Edit the DAG inline.
-    calculate_nodes_to_run(parsed_dag)
-
-    nodes_to_reuse: dict[str, MaterialisationNode] = {}
-    node_count = 0
-    for node_id, node in parsed_dag.nodes.items():
-        if node.node_type != NodeType.MATERIALISATION:
-            continue
-        materialisation_node: MaterialisationNode = cast(MaterialisationNode, node)
-        if paths_to_run and materialisation_node.dbt_path not in paths_to_run:
-            continue
-        node_count += 1
-        if materialisation_node.freshness == Freshness.CLEAN:
-            nodes_to_reuse[node_id] = materialisation_node
-
-    log_reused_nodes(nodes_to_reuse)
-
-    if len(nodes_to_reuse) != 0:
-        patch_sql_files(nodes_to_reuse)
-        patch_seed_properties(nodes_to_reuse)
-
-        selectors_snapshot = snapshot_selectors_file()
-        result = subprocess.run(modify_dbt_command(cmd=list(dbt_args)))
-
-        log_info(f"{len(nodes_to_reuse)}/{node_count} nodes reused.")
-        if settings.local_run:
-            revert_patching(
-                file_paths_to_revert=[
-                    node.file_path for node in nodes_to_reuse.values()
-                ]
+        # Edit the DAG inline.
+        calculate_nodes_to_run(parsed_dag)
+
+        nodes_to_reuse: dict[str, MaterialisationNode] = {}
+        node_count = 0
+        for node_id, node in parsed_dag.nodes.items():
+            if node.node_type != NodeType.MATERIALISATION:
+                continue
+            if node_ids_to_run is not None and node_id not in node_ids_to_run:
+                continue
+            if seeds_only and not node_id.startswith("seed."):
+                continue
+            materialisation_node: MaterialisationNode = cast(MaterialisationNode, node)
+            node_count += 1
+            if materialisation_node.freshness == Freshness.CLEAN:
+                nodes_to_reuse[node_id] = materialisation_node
+
+        log_reused_nodes(nodes_to_reuse)
+
+        if settings.skip_noop_runs and 0 < node_count == len(nodes_to_reuse):
+            log_info(
+                f"All {node_count} selected node(s) are reused. Skipping the dbt invocation."
+            )
+            if session:
+                session.close()
+            write_reused_run_results(nodes_to_reuse, dbt_args)
+            _complete_run(state, parsed_dag, source_freshness, dbt_exit_code=0)
+
+        if len(nodes_to_reuse) != 0:
+            reused_selectors: list[str] | None = None
+            if session:
+                session.tag_reused_nodes(nodes_to_reuse)
+            elif settings.reuse_mode == "selector":
+                reused_selectors = _reused_node_selectors(nodes_to_reuse)
+            patch_snapshot: PatchSnapshot | None = None
+            partial_parse_snapshot: bytes | None = None
+            if not session and reused_selectors is None:
+                if settings.local_run and settings.preserve_partial_parse:
+                    partial_parse_snapshot = snapshot_partial_parse()
+                patch_snapshot = patch_sql_files(nodes_to_reuse)
+                patch_snapshot |= patch_seed_properties(nodes_to_reuse)
+
+            selectors_snapshot = snapshot_selectors_file()
+            dbt_exit_code = _run_dbt(
+                modify_dbt_command(
+                    cmd=list(dbt_args), reused_selectors=reused_selectors
+                ),
+                session,
             )
-            restore_selectors_file(selectors_snapshot)
-    else:
-        result = subprocess.run(list(dbt_args))
 
-    _complete_run(state, parsed_dag, source_freshness, dbt_exit_code=result.returncode)
+            log_info(f"{len(nodes_to_reuse)}/{node_count} nodes reused.")
+            if settings.local_run:
+                if patch_snapshot is not None:
+                    revert_patching(patch_snapshot)
+                    restore_partial_parse(partial_parse_snapshot)
+                restore_selectors_file(selectors_snapshot)
+        else:
+            dbt_exit_code = _run_dbt(list(dbt_args), session)
+
+        _complete_run(state, parsed_dag, source_freshness, dbt_exit_code=dbt_exit_code)
+    finally:
+        # `sys.exit` unwinds through here too, so dbt always gets its
+        # adapter management back.
+        if session:
+            session.close()
@@ -22,10 +22,28 @@ class OrchestraDbtSettings(BaseModel):
     debug: bool = False
     integration_account_id: str | None = None
     seed_state_orchestration: bool = False
-
-    @field_validator("orchestra_env", mode="before")
+    single_session: bool = False
+    skip_noop_runs: bool = False
+    cache_dir: str = ".orchestra/cache"
+    dag_cache: bool = True
+    reuse_mode: Literal["patch", "selector"] = "patch"
+    preserve_partial_parse: bool = True
+    seed_checksum_cache: bool = True
+    seed_checksum_algorithm: Literal["sha256", "blake2b"] = "sha256"
+    scope_source_freshness: bool = True
+    plan_source_freshness: bool = False
+    source_freshness_ttl_minutes: int | None = None
+    source_freshness_cache: Literal["local", "state"] = "local"
+
+    @field_validator(
+        "orchestra_env",
+        "reuse_mode",
+        "seed_checksum_algorithm",
+        "source_freshness_cache",
+        mode="before",
+    )
     @classmethod
-    def _normalize_orchestra_env(cls, v: object) -> object:
+    def _normalize_literal(cls, v: object) -> object:
         if isinstance(v, str):
             return v.lower()
         return v
@@ -75,11 +93,72 @@ def _merge_env_overrides(settings: OrchestraDbtSettings) -> OrchestraDbtSettings
 
     seed_state = _env_bool("ORCHESTRA_SEED_STATE_ORCHESTRATION")
     if seed_state is not None:
+        settings = settings.model_copy(update={"seed_state_orchestration": seed_state})
+
+    single_session = _env_bool("ORCHESTRA_SINGLE_SESSION")
+    if single_session is not None:
+        settings = settings.model_copy(update={"single_session": single_session})
+
+    skip_noop_runs = _env_bool("ORCHESTRA_SKIP_NOOP_RUNS")
+    if skip_noop_runs is not None:
+        settings = settings.model_copy(update={"skip_noop_runs": skip_noop_runs})
+
+    cache_dir = _env_str("ORCHESTRA_CACHE_DIR")
+    if cache_dir is not None:
+        settings = settings.model_copy(update={"cache_dir": cache_dir})
+
+    dag_cache = _env_bool("ORCHESTRA_DAG_CACHE")
+    if dag_cache is not None:
+        settings = settings.model_copy(update={"dag_cache": dag_cache})
+
+    reuse_mode = _env_str("ORCHESTRA_REUSE_MODE")
+    if reuse_mode is not None:
+        settings = settings.model_copy(update={"reuse_mode": reuse_mode})
+
+    preserve_partial_parse = _env_bool("ORCHESTRA_PRESERVE_PARTIAL_PARSE")
+    if preserve_partial_parse is not None:
+        settings = settings.model_copy(
+            update={"preserve_partial_parse": preserve_partial_parse}
+        )
+
+    seed_checksum_cache = _env_bool("ORCHESTRA_SEED_CHECKSUM_CACHE")
+    if seed_checksum_cache is not None:
+        settings = settings.model_copy(
+            update={"seed_checksum_cache": seed_checksum_cache}
+        )
+
+    seed_checksum_algorithm = _env_str("ORCHESTRA_SEED_CHECKSUM_ALGORITHM")
+    if seed_checksum_algorithm is not None:
+        settings = settings.model_copy(
+            update={"seed_checksum_algorithm": seed_checksum_algorithm}
+        )
+
+    scope_source_freshness = _env_bool("ORCHESTRA_SCOPE_SOURCE_FRESHNESS")
+    if scope_source_freshness is not None:
+        settings = settings.model_copy(
+            update={"scope_source_freshness": scope_source_freshness}
+        )
+
+    plan_source_freshness = _env_bool("ORCHESTRA_PLAN_SOURCE_FRESHNESS")
+    if plan_source_freshness is not None:
+        settings = settings.model_copy(
+            update={"plan_source_freshness": plan_source_freshness}
+        )
+
+    source_freshness_ttl = _env_str("ORCHESTRA_SOURCE_FRESHNESS_TTL_MINUTES")
+    if source_freshness_ttl is not None:
+        settings = settings.model_copy(
+            update={"source_freshness_ttl_minutes": source_freshness_ttl}
+        )
+
+    source_freshness_cache = _env_str("ORCHESTRA_SOURCE_FRESHNESS_CACHE")
+    if source_freshness_cache is not None:
         settings = settings.model_copy(
-            update={"seed_state_orchestration": seed_state}
+            update={"source_freshness_cache": source_freshness_cache}
         )
 
-    return OrchestraDbtSettings.model_validate(settings.model_dump())
+    # Env overrides are copied in unvalidated (e.g. numbers as strings).
+    return OrchestraDbtSettings.model_validate(settings.model_dump(warnings=False))
 
 
 def load_orchestra_dbt_settings(cwd: Path | None = None) -> OrchestraDbtSettings:
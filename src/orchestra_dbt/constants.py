@@ -1,5 +1,8 @@
-MAX_SEED_SIZE_BYTES = 100 * 1024 * 1024  # 100 MB
 ORCHESTRA_REUSED_NODE = "ORCHESTRA_REUSED_NODE"
+# Snapshots opt into reuse with `meta: {orchestra_reuse: true}` in their config.
+ORCHESTRA_REUSE_META_KEY = "orchestra_reuse"
+# Sources override `source_freshness_ttl_minutes` with this key in their meta.
+ORCHESTRA_FRESHNESS_TTL_META_KEY = "orchestra_freshness_ttl_minutes"
 INDIRECT_SELECTION_CAUTIOUS = "cautious"
 RESOURCE_TYPES_TO_LS = ["model", "snapshot", "seed"]
 SERVICE_NAME = "dbt-orchestra"
@@ -1,22 +1,53 @@
+from pathlib import Path
+
 from .asset_external_id import generate_asset_external_id
 from .build_after import parse_freshness_config
-from .checksum import calculate_checksum
-from .config import load_orchestra_dbt_settings, resolve_state_backend_config
-from .logger import log_warn
+from .checksum import (
+    DEFAULT_SEED_CHECKSUM_ALGORITHM,
+    SeedChecksumCache,
+    calculate_checksum,
+    calculate_seed_checksums,
+)
+from .constants import ORCHESTRA_REUSE_META_KEY
+from .dag_cache import DagCache
+from .logger import log_debug, log_warn
+from .manifest_reader import Projection, load_manifest
 from .models import (
     Edge,
     Freshness,
+    ManifestDag,
+    ManifestNode,
     MaterialisationNode,
     Node,
     ParsedDag,
     SourceFreshness,
     SourceNode,
     StateApiModel,
+    StateItem,
 )
+from .run_context import get_run_context
 from .state_types import StateBackendKind
-from .utils import load_json
 
 _IGNORED_PREFIXES = ("function.",)
+# The only parts of the manifest `construct_dag` reads.
+_MANIFEST_PROJECTION: Projection = {
+    "metadata": {"project_name": True},
+    "child_map": True,
+    "nodes": {
+        "*": {
+            "resource_type": True,
+            "checksum": True,
+            "package_name": True,
+            "original_file_path": True,
+            "depends_on": {"nodes": True},
+            "config": {
+                "freshness": True,
+                "meta": {ORCHESTRA_REUSE_META_KEY: True},
+            },
+            "relation_name": True,
+        }
+    },
+}
 
 
 def calculate_freshness_on_node(
@@ -28,10 +59,11 @@ def calculate_freshness_on_node(
     from_external_package: bool,
     depends_on_nodes: list[str] | None,
     seed_state_orchestration: bool = False,
+    reuse_snapshot: bool = False,
 ) -> tuple[Freshness, str]:
-    if resource_type == "snapshot":
-        # Note: currently, we always run snapshots. Need to configure how to propagate
-        # the ability not to run snapshots via tags/meta.
+    if resource_type == "snapshot" and not reuse_snapshot:
+        # Snapshots record history, so they only take part in state
+        # orchestration when they opt in through their meta.
         return Freshness.DIRTY, "Snapshot is always dirty."
 
     if not track_state:
@@ -56,103 +88,218 @@ def calculate_freshness_on_node(
     return Freshness.CLEAN, f"{resource_type.capitalize()} in same state as last run."
 
 
+def _read_manifest_dag(manifest: dict) -> ManifestDag:
+    project_name_from_manifest = manifest["metadata"]["project_name"]
+    source_ids = [
+        str(node_id)
+        for node_id in manifest.get("child_map", {}).keys()
+        if str(node_id).startswith("source.")
+    ]
+
+    nodes: list[ManifestNode] = []
+    for node_id, node in manifest.get("nodes", {}).items():
+        resource_type = str(node.get("resource_type"))
+
+        match resource_type:
+            case "seed" | "model" | "snapshot":
+                dbt_path = str(node["original_file_path"])
+                config = node.get("config") or {}
+                from_external_package = (
+                    node["package_name"] != project_name_from_manifest
+                )
+                if from_external_package:
+                    file_path = f"dbt_packages/{node['package_name']}/{dbt_path}"
+                else:
+                    file_path = dbt_path
+
+                nodes.append(
+                    ManifestNode(
+                        node_id=str(node_id),
+                        resource_type=resource_type,
+                        relation_name=node.get("relation_name"),
+                        node_checksum=str(node["checksum"]["checksum"]),
+                        dbt_path=dbt_path,
+                        file_path=file_path,
+                        from_external_package=from_external_package,
+                        depends_on_nodes=[
+                            str(dep)
+                            for dep in node.get("depends_on", {}).get("nodes", [])
+                        ],
+                        freshness_config=parse_freshness_config(
+                            config_on_node=config.get("freshness")
+                        ),
+                        reuse_snapshot=(
+                            resource_type == "snapshot"
+                            and (config.get("meta") or {}).get(ORCHESTRA_REUSE_META_KEY)
+                            is True
+                        ),
+                    )
+                )
+            case _:
+                continue
+
+    return ManifestDag(source_ids=source_ids, nodes=nodes)
+
+
+def load_manifest_dag(manifest_path: str, cache_dir: str | None) -> ManifestDag:
+    """
+    Read the state-independent part of the DAG from `manifest_path`, going
+    through the on-disk DAG cache in `cache_dir` unless it is `None`.
+    """
+    if cache_dir is None:
+        return _read_manifest_dag(load_manifest(manifest_path, _MANIFEST_PROJECTION))
+
+    cache = DagCache(Path(cache_dir) / "dag")
+    try:
+        fingerprint = cache.fingerprint(Path(manifest_path))
+    except OSError:
+        return _read_manifest_dag(load_manifest(manifest_path, _MANIFEST_PROJECTION))
+
+    manifest_dag = cache.load(fingerprint)
+    if manifest_dag is not None:
+        log_debug(f"Loaded the DAG for {manifest_path} from the cache.")
+        return manifest_dag
+
+    manifest_dag = _read_manifest_dag(
+        load_manifest(manifest_path, _MANIFEST_PROJECTION)
+    )
+    cache.store(fingerprint, manifest_dag)
+    return manifest_dag
+
+
+def _checksum_to_compare(
+    node: ManifestNode,
+    checksum: str,
+    checksum_algorithm: str | None,
+    previous: StateItem | None,
+    cache: SeedChecksumCache | None,
+) -> str:
+    """
+    The checksum to compare with `previous`. When the seed checksum algorithm
+    has changed since `previous` was saved, the seed is hashed again with the
+    old algorithm, so switching algorithms does not make every seed dirty.
+    """
+    if checksum_algorithm is None or previous is None:
+        return checksum
+    previous_algorithm = previous.checksum_algorithm or DEFAULT_SEED_CHECKSUM_ALGORITHM
+    if previous_algorithm == checksum_algorithm:
+        return checksum
+    try:
+        previous_checksum = calculate_checksum(
+            node.resource_type,
+            node.node_checksum,
+            node.file_path,
+            cache=cache,
+            algorithm=previous_algorithm,
+        )
+    except ValueError:
+        log_debug(
+            f"Unknown checksum algorithm {previous_algorithm} in state for "
+            f"{node.node_id}."
+        )
+        return checksum
+    return previous_checksum or checksum
+
+
 def construct_dag(
     source_freshness: SourceFreshness,
     state: StateApiModel,
     manifest_override: str | None = None,
 ) -> ParsedDag:
-    manifest = load_json(manifest_override or "target/manifest.json")
+    context = get_run_context()
+    settings = context.settings
+    manifest_dag = load_manifest_dag(
+        manifest_override or "target/manifest.json",
+        settings.cache_dir if settings.dag_cache else None,
+    )
 
+    seed_checksum_cache = (
+        SeedChecksumCache(Path(settings.cache_dir))
+        if settings.seed_checksum_cache
+        else None
+    )
+    seed_checksum_algorithm = settings.seed_checksum_algorithm
+    seed_checksums = calculate_seed_checksums(
+        (node.file_path for node in manifest_dag.nodes if node.resource_type == "seed"),
+        cache=seed_checksum_cache,
+        algorithm=seed_checksum_algorithm,
+    )
     nodes: dict[str, Node] = {}
     edges: list[Edge] = []
 
-    project_name_from_manifest = manifest["metadata"]["project_name"]
-    settings = load_orchestra_dbt_settings()
     integration_account_id = settings.integration_account_id
-    state_backend_kind = resolve_state_backend_config().kind
+    state_backend_kind = context.state_backend_config.kind
     if not integration_account_id and state_backend_kind == StateBackendKind.HTTP:
         log_warn(
             "No integration account ID found. Will use node ID as the asset external ID."
         )
 
-    for node_id in manifest.get("child_map", {}).keys():
-        node_id = str(node_id)
-        if not node_id.startswith("source."):
-            continue
+    for node_id in manifest_dag.source_ids:
         nodes[node_id] = SourceNode(last_updated=source_freshness.sources.get(node_id))
 
-    for node_id, node in manifest.get("nodes", {}).items():
-        resource_type = str(node.get("resource_type"))
-
-        match resource_type:
-            case "seed" | "model" | "snapshot":
-                node_id: str = str(node_id)
-                asset_external_id: str = generate_asset_external_id(
-                    node_id=node_id,
-                    relation_name=node.get("relation_name"),
-                    integration_account_id=integration_account_id,
-                    local_run=settings.local_run,
-                )
+    for node in manifest_dag.nodes:
+        asset_external_id: str = generate_asset_external_id(
+            node_id=node.node_id,
+            relation_name=node.relation_name,
+            integration_account_id=integration_account_id,
+            local_run=settings.local_run,
+        )
 
-                dbt_path = str(node["original_file_path"])
-                from_external_package = (
-                    node["package_name"] != project_name_from_manifest
-                )
-                depends_on_nodes = node.get("depends_on", {}).get("nodes", [])
-                if from_external_package:
-                    file_path = f"dbt_packages/{node['package_name']}/{dbt_path}"
-                else:
-                    file_path = dbt_path
+        track_state = True
+        checksum: str | None = node.node_checksum
+        checksum_algorithm: str | None = None
+        if node.resource_type == "seed":
+            checksum = seed_checksums.get(node.file_path)
+            checksum_algorithm = seed_checksum_algorithm
+        if not checksum:
+            track_state = False
+            checksum = node.node_checksum
+            checksum_algorithm = None
 
-                track_state = True
-                checksum: str | None = calculate_checksum(
-                    resource_type,
-                    node_checksum=str(node["checksum"]["checksum"]),
-                    file_path=file_path,
-                )
-                if not checksum:
-                    track_state = False
-                    checksum = str(node["checksum"]["checksum"])
-
-                freshness, reason = calculate_freshness_on_node(
-                    asset_external_id,
-                    checksum,
-                    state,
-                    resource_type,
-                    track_state,
-                    from_external_package,
-                    depends_on_nodes,
-                    settings.seed_state_orchestration,
-                )
+        freshness, reason = calculate_freshness_on_node(
+            asset_external_id,
+            _checksum_to_compare(
+                node,
+                checksum,
+                checksum_algorithm,
+                state.state.get(asset_external_id),
+                seed_checksum_cache,
+            ),
+            state,
+            node.resource_type,
+            track_state,
+            node.from_external_package,
+            node.depends_on_nodes,
+            settings.seed_state_orchestration,
+            node.reuse_snapshot,
+        )
 
-                nodes[node_id] = MaterialisationNode(
-                    asset_external_id=asset_external_id,
-                    checksum=checksum,
-                    freshness_config=parse_freshness_config(
-                        config_on_node=node.get("config", {}).get("freshness")
-                    ),
-                    freshness=freshness,
-                    dbt_path=dbt_path,
-                    reason=reason,
-                    sources=(
-                        state.state[asset_external_id].sources
-                        if asset_external_id in state.state
-                        else {}
-                    ),
-                    file_path=file_path,
-                    last_updated=(
-                        state.state[asset_external_id].last_updated
-                        if asset_external_id in state.state
-                        else None
-                    ),
-                )
+        nodes[node.node_id] = MaterialisationNode(
+            asset_external_id=asset_external_id,
+            checksum=checksum,
+            checksum_algorithm=checksum_algorithm,
+            freshness_config=node.freshness_config,
+            freshness=freshness,
+            dbt_path=node.dbt_path,
+            reason=reason,
+            sources=(
+                state.state[asset_external_id].sources
+                if asset_external_id in state.state
+                else {}
+            ),
+            file_path=node.file_path,
+            last_updated=(
+                state.state[asset_external_id].last_updated
+                if asset_external_id in state.state
+                else None
+            ),
+        )
 
-                for dep in depends_on_nodes:
-                    dep = str(dep)
-                    if dep.startswith(_IGNORED_PREFIXES):
-                        continue
-                    edges.append(Edge(from_=dep, to_=node_id))
-            case _:
+        for dep in node.depends_on_nodes:
+            if dep.startswith(_IGNORED_PREFIXES):
                 continue
+            edges.append(Edge(from_=dep, to_=node.node_id))
 
+    if seed_checksum_cache is not None:
+        seed_checksum_cache.save()
     return ParsedDag(nodes=nodes, edges=edges)
@@ -0,0 +1,185 @@
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+import zlib
+from pathlib import Path
+
+from .logger import log_debug
+from .models import FreshnessConfig, ManifestDag, ManifestNode
+from .utils import write_bytes_atomically
+
+# Bump whenever the layout of a cached entry changes. Entries are also tied to
+# the interpreter, since `marshal` output is only guaranteed to round-trip on
+# the Python version that wrote it.
+_FORMAT_VERSION = 2
+_HEADER = f"orchestra-dag:{_FORMAT_VERSION}:{sys.implementation.cache_tag}\n".encode()
+_ENTRY_SUFFIX = ".dag"
+_INDEX_FILE = "fingerprints.json"
+_MAX_ENTRIES = 8
+_CHUNK_SIZE = 1024 * 1024
+# dbt stamps these on every parse, even when nothing in the project changed, so
+# they are left out of the content digest. None of their values contain a comma.
+_VOLATILE_FIELDS = re.compile(
+    rb'"(?:created_at|generated_at|invocation_id|invocation_started_at)"'
+    rb'\s*:\s*(?:"[^"]*"|[^,}\]]*)'
+)
+
+
+def _content_digest(path: Path) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    carry = b""
+    with path.open("rb") as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            buffer = carry + chunk
+            # Only hash up to the last comma: a volatile field never spans one,
+            # so none can be cut in half between two chunks.
+            cut = buffer.rfind(b",") + 1
+            digest.update(_VOLATILE_FIELDS.sub(b"", buffer[:cut]))
+            carry = buffer[cut:]
+    digest.update(_VOLATILE_FIELDS.sub(b"", carry))
+    return digest.hexdigest()
+
+
+def _dump(dag: ManifestDag) -> bytes:
+    nodes = [
+        (
+            node.node_id,
+            node.resource_type,
+            node.relation_name,
+            node.node_checksum,
+            node.dbt_path,
+            node.file_path,
+            node.from_external_package,
+            tuple(node.depends_on_nodes),
+            (
+                node.freshness_config.inherited_from,
+                node.freshness_config.minutes_sla,
+                node.freshness_config.updates_on,
+            ),
+            node.reuse_snapshot,
+        )
+        for node in dag.nodes
+    ]
+    return _HEADER + zlib.compress(marshal.dumps((dag.source_ids, nodes)), 1)
+
+
+def _load(payload: bytes) -> ManifestDag | None:
+    if not payload.startswith(_HEADER):
+        return None
+    source_ids, nodes = marshal.loads(zlib.decompress(payload[len(_HEADER) :]))
+    return ManifestDag(
+        source_ids=list(source_ids),
+        nodes=[
+            ManifestNode(
+                node_id=node_id,
+                resource_type=resource_type,
+                relation_name=relation_name,
+                node_checksum=node_checksum,
+                dbt_path=dbt_path,
+                file_path=file_path,
+                from_external_package=from_external_package,
+                depends_on_nodes=list(depends_on_nodes),
+                freshness_config=FreshnessConfig(*freshness_config),
+                reuse_snapshot=reuse_snapshot,
+            )
+            for (
+                node_id,
+                resource_type,
+                relation_name,
+                node_checksum,
+                dbt_path,
+                file_path,
+                from_external_package,
+                depends_on_nodes,
+                freshness_config,
+                reuse_snapshot,
+            ) in nodes
+        ],
+    )
+
+
+class DagCache:
+    """
+    On-disk cache of the state-independent part of the DAG (`ManifestDag`),
+    keyed by a fingerprint of `manifest.json`.
+
+    The fingerprint is a digest of the manifest's content, ignoring the
+    timestamps and invocation ids dbt rewrites on every parse. The digest is
+    remembered against the file's size and mtime, so an untouched manifest is
+    not even re-read. At most `max_entries` entries are kept; the least
+    recently used are evicted first. The cache is best-effort: a missing,
+    stale or corrupt entry is simply a miss.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = _MAX_ENTRIES) -> None:
+        self._directory = directory
+        self._max_entries = max_entries
+
+    def _entry_path(self, fingerprint: str) -> Path:
+        return self._directory / f"{fingerprint}{_ENTRY_SUFFIX}"
+
+    def _read_index(self) -> dict[str, list]:
+        try:
+            index = json.loads((self._directory / _INDEX_FILE).read_text("utf-8"))
+        except (OSError, ValueError):
+            return {}
+        return index if isinstance(index, dict) else {}
+
+    def fingerprint(self, manifest_path: Path) -> str:
+        """Raises `OSError` if the manifest cannot be read."""
+        stat = manifest_path.stat()
+        key = str(manifest_path.resolve())
+        index = self._read_index()
+        known = index.pop(key, None)
+        if (
+            isinstance(known, list)
+            and len(known) == 3
+            and known[:2] == [stat.st_size, stat.st_mtime_ns]
+        ):
+            fingerprint = str(known[2])
+        else:
+            fingerprint = _content_digest(manifest_path)
+        # Most recently used last, so the oldest manifests drop out first.
+        index[key] = [stat.st_size, stat.st_mtime_ns, fingerprint]
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            write_bytes_atomically(
+                self._directory / _INDEX_FILE,
+                json.dumps(dict(list(index.items())[-self._max_entries :])).encode(),
+            )
+        except OSError as e:
+            log_debug(f"Could not update the DAG cache index: {e}")
+        return fingerprint
+
+    def load(self, fingerprint: str) -> ManifestDag | None:
+        path = self._entry_path(fingerprint)
+        try:
+            dag = _load(path.read_bytes())
+            # Mark the entry as recently used.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError, EOFError, zlib.error) as e:
+            log_debug(f"Ignoring unreadable DAG cache entry {path}: {e}")
+            return None
+        return dag
+
+    def store(self, fingerprint: str, dag: ManifestDag) -> None:
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            write_bytes_atomically(self._entry_path(fingerprint), _dump(dag))
+            self._evict()
+        except OSError as e:
+            log_debug(f"Could not write the DAG cache: {e}")
+
+    def _evict(self) -> None:
+        entries = sorted(
+            self._directory.glob(f"*{_ENTRY_SUFFIX}"),
+            key=lambda entry: entry.stat().st_mtime_ns,
+            reverse=True,
+        )
+        for entry in entries[self._max_entries :]:
+            entry.unlink(missing_ok=True)
@@ -0,0 +1,158 @@
+from array import array
+from collections import deque
+from collections.abc import Iterable
+
+# Signed 32-bit ints: ample for node/edge counts and half the size of a Python
+# int pointer per entry.
+_INDEX_TYPECODE = "i"
+# One byte per node for boolean attributes.
+_FLAG_TYPECODE = "b"
+
+
+def _offsets(keys: array, node_count: int) -> array:
+    offsets = array(_INDEX_TYPECODE, [0]) * (node_count + 1)
+    for key in keys:
+        offsets[key + 1] += 1
+    for i in range(node_count):
+        offsets[i + 1] += offsets[i]
+    return offsets
+
+
+def _scatter(keys: array, values: array, offsets: array) -> array:
+    # Counting sort: stable, so each node's neighbours keep their edge order.
+    cursor = offsets[:-1]
+    scattered = array(_INDEX_TYPECODE, [0]) * len(keys)
+    for key, value in zip(keys, values):
+        scattered[cursor[key]] = value
+        cursor[key] += 1
+    return scattered
+
+
+class DagGraph:
+    """
+    Integer-indexed adjacency of a DAG in CSR (compressed sparse row) form.
+
+    Node ids are interned to ints; the parents of node `i` are
+    `parent_indices[parent_offsets[i]:parent_offsets[i + 1]]` (likewise for
+    children), in the order their edges were given. The first `node_count`
+    ids are the DAG's own nodes, in their original order; any further ids are
+    edge endpoints that are not nodes of the DAG.
+
+    Per-node attributes that never change once the DAG is built live in
+    arrays indexed the same way (`is_source`). Attributes a run updates, such
+    as freshness, stay on the node records.
+    """
+
+    __slots__ = (
+        "_child_indices",
+        "_child_offsets",
+        "_index",
+        "_parent_indices",
+        "_parent_offsets",
+        "_topological_order",
+        "ids",
+        "is_source",
+        "node_count",
+    )
+
+    def __init__(
+        self,
+        node_ids: Iterable[str],
+        edges: Iterable[tuple[str, str]],
+        source_ids: Iterable[str] = (),
+    ) -> None:
+        self.ids: list[str] = []
+        self._index: dict[str, int] = {}
+        for node_id in node_ids:
+            self._intern(node_id)
+        self.node_count = len(self.ids)
+
+        sources = array(_INDEX_TYPECODE)
+        targets = array(_INDEX_TYPECODE)
+        for from_, to_ in edges:
+            sources.append(self._intern(from_))
+            targets.append(self._intern(to_))
+
+        total = len(self.ids)
+        self._parent_offsets = _offsets(targets, total)
+        self._parent_indices = memoryview(
+            _scatter(targets, sources, self._parent_offsets)
+        )
+        self._child_offsets = _offsets(sources, total)
+        self._child_indices = memoryview(
+            _scatter(sources, targets, self._child_offsets)
+        )
+        self._topological_order: array | None = None
+
+        # Edge endpoints outside the DAG are not known to be sources.
+        self.is_source = array(_FLAG_TYPECODE, [0]) * total
+        for source_id in source_ids:
+            index = self._index.get(source_id)
+            if index is not None and index < self.node_count:
+                self.is_source[index] = 1
+
+    def _intern(self, node_id: str) -> int:
+        index = self._index.get(node_id)
+        if index is None:
+            index = self._index[node_id] = len(self.ids)
+            self.ids.append(node_id)
+        return index
+
+    def index_of(self, node_id: str) -> int | None:
+        return self._index.get(node_id)
+
+    def parents(self, index: int) -> memoryview:
+        return self._parent_indices[
+            self._parent_offsets[index] : self._parent_offsets[index + 1]
+        ]
+
+    def children(self, index: int) -> memoryview:
+        return self._child_indices[
+            self._child_offsets[index] : self._child_offsets[index + 1]
+        ]
+
+    def parent_ids(self, index: int) -> list[str]:
+        return [self.ids[parent] for parent in self.parents(index)]
+
+    def child_ids(self, index: int) -> list[str]:
+        return [self.ids[child] for child in self.children(index)]
+
+    def source_parent_ids(self, index: int) -> list[str]:
+        return [
+            self.ids[parent] for parent in self.parents(index) if self.is_source[parent]
+        ]
+
+    def in_degrees(self) -> array:
+        """A fresh, mutable array of each node's number of parents."""
+        offsets = self._parent_offsets
+        return array(
+            _INDEX_TYPECODE,
+            (offsets[i + 1] - offsets[i] for i in range(len(self.ids))),
+        )
+
+    def out_degrees(self) -> array:
+        """A fresh, mutable array of each node's number of children."""
+        offsets = self._child_offsets
+        return array(
+            _INDEX_TYPECODE,
+            (offsets[i + 1] - offsets[i] for i in range(len(self.ids))),
+        )
+
+    def topological_order(self) -> array:
+        """
+        Every id, parents before children (Kahn's algorithm), built once.
+        Ids on or downstream of a cycle are left out.
+        """
+        if self._topological_order is None:
+            in_degree = self.in_degrees()
+            queue = deque[int](i for i in range(len(self.ids)) if in_degree[i] == 0)
+            order = array(_INDEX_TYPECODE)
+            while queue:
+                current = queue.popleft()
+                order.append(current)
+                for child in self.children(current):
+                    in_degree[child] -= 1
+                    if in_degree[child] == 0:
+                        queue.append(child)
+            self._topological_order = order
+        return self._topological_order
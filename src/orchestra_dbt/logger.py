@@ -2,9 +2,9 @@ from datetime import UTC, datetime
 
 import click
 
-from .config import load_orchestra_dbt_settings
 from .constants import SERVICE_NAME
 from .models import MaterialisationNode
+from .run_context import get_run_context
 
 
 def _log(msg: str, fg: str | None, error: bool = False) -> None:
@@ -16,7 +16,7 @@ def _log(msg: str, fg: str | None, error: bool = False) -> None:
 
 
 def log_debug(msg) -> None:
-    if load_orchestra_dbt_settings().debug:
+    if get_run_context().settings.debug:
         _log(msg, None)
 
 
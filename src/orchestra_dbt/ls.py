@@ -1,8 +1,18 @@
+import json
+
 from .compatibility import dbt_core_import_error_message
 from .constants import RESOURCE_TYPES_TO_LS
 from .logger import log_debug, log_error, log_info, log_warn
+from .manifest_reader import load_manifest
+from .selection import (
+    MANIFEST_PROJECTION,
+    UnsupportedSelectionError,
+    resolve_selection,
+)
+from .session import DbtSession
 
 DBT_LS_ARGS_NOT_ACCEPTED = ["--empty"]
+_MANIFEST_PATH = "target/manifest.json"
 
 
 def get_args_for_ls(user_args: tuple) -> list[str]:
@@ -11,7 +21,7 @@ def get_args_for_ls(user_args: tuple) -> list[str]:
     for resource_type in RESOURCE_TYPES_TO_LS:
         resource_type_args.append("--resource-type")
         resource_type_args.append(resource_type)
-    output_args = ["--output", "path", "-q"]
+    output_args = ["--output", "json", "--output-keys", "unique_id", "-q"]
 
     # Remove args not accepted by dbt ls
     list_user_args = []
@@ -23,7 +33,9 @@ def get_args_for_ls(user_args: tuple) -> list[str]:
     return command_args + resource_type_args + list_user_args + output_args
 
 
-def get_paths_to_run(args: tuple) -> list[str] | None:
+def _get_node_ids_from_ls(
+    args: tuple, session: DbtSession | None = None
+) -> set[str] | None:
     try:
         from dbt.cli.main import (
             dbtRunner,
@@ -33,17 +45,18 @@ def get_paths_to_run(args: tuple) -> list[str] | None:
         log_error(dbt_core_import_error_message(missing_dbt_core_error))
         raise missing_dbt_core_error
 
-    log_info("Finding node paths to be executed:")
-
     try:
-        res: dbtRunnerResult = dbtRunner().invoke(get_args_for_ls(args))
+        ls_args = get_args_for_ls(args)
+        res: dbtRunnerResult = (
+            session.invoke(ls_args) if session else dbtRunner().invoke(ls_args)
+        )
         if not res.success:
             raise ValueError(f"dbt ls failed to run correctly: {res.exception}")
 
         if isinstance(res.result, list) and all(
             isinstance(item, str) for item in res.result
         ):
-            return res.result
+            return {str(json.loads(item)["unique_id"]) for item in res.result}
 
         raise ValueError(f"Unexpected result from dbt ls: {res.result}")
     except Exception as e:
@@ -51,3 +64,37 @@ def get_paths_to_run(args: tuple) -> list[str] | None:
 
     log_warn("Error getting [dbt ls] of nodes that will be executed.")
     return None
+
+
+def get_node_ids_to_run(
+    args: tuple, session: DbtSession | None = None
+) -> set[str] | None:
+    """
+    Resolve the unique_ids the dbt command will execute. The selection is
+    evaluated against `target/manifest.json`, falling back to `dbt ls` when it
+    uses syntax only dbt can evaluate.
+    """
+    log_info("Finding nodes to be executed:")
+
+    node_ids = get_node_ids_from_manifest(args)
+    if node_ids is not None:
+        return node_ids
+    log_debug("Falling back to dbt ls.")
+    return _get_node_ids_from_ls(args, session)
+
+
+def get_node_ids_from_manifest(args: tuple) -> set[str] | None:
+    """
+    Resolve the selection against `target/manifest.json` only, or return
+    `None` when that needs `dbt ls` (or the manifest cannot be read).
+    """
+    try:
+        return resolve_selection(
+            args, load_manifest(_MANIFEST_PATH, MANIFEST_PROJECTION)
+        )
+    except UnsupportedSelectionError as e:
+        log_debug(str(e))
+    # The manifest is missing, unreadable or not valid JSON.
+    except (OSError, ValueError) as e:
+        log_debug(f"Could not resolve selection from the manifest: {e}")
+    return None
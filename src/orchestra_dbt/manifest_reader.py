@@ -0,0 +1,231 @@
+import json
+import re
+from collections.abc import Iterator
+from json.decoder import scanstring  # pyright: ignore[reportAttributeAccessIssue]
+from typing import IO, Any
+
+# A projection says which parts of a JSON document to keep. `True` keeps a
+# value whole; a dict keeps only the listed keys of an object (`"*"` matches
+# any key), each projected in turn. Everything else is discarded as it is read.
+Projection = bool | dict[str, "Projection"]
+
+_CHUNK_SIZE = 1024 * 1024
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+# Characters that can continue a number; `1.` or `15e` cut at a chunk boundary
+# still decode, as 1 and 15.
+_NUMBER_CONTINUATION = frozenset("0123456789.eE+-")
+_DECODER = json.JSONDecoder()
+
+
+def _project(value: Any, projection: Projection) -> Any:
+    if not isinstance(projection, dict) or not isinstance(value, dict):
+        return value
+    wildcard = projection.get("*")
+    if not wildcard:
+        return {
+            key: _project(value[key], member_projection)
+            for key, member_projection in projection.items()
+            if member_projection and key in value
+        }
+    projected: dict[str, Any] = {}
+    for key, member in value.items():
+        member_projection = projection.get(key, wildcard)
+        if member_projection:
+            projected[key] = _project(member, member_projection)
+    return projected
+
+
+class _JsonStream:
+    """
+    Reads a JSON document incrementally. Objects can be walked member by member
+    so that only one member value is ever decoded (and held) at a time.
+    """
+
+    def __init__(self, file: IO[str], chunk_size: int = _CHUNK_SIZE) -> None:
+        self._file = file
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        if self._pos:
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+        # Read at least as much as is already buffered, so a value that keeps
+        # not fitting is retried a logarithmic number of times.
+        chunk = self._file.read(max(self._chunk_size, len(self._buffer)))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            match = _WHITESPACE.match(self._buffer, self._pos)
+            self._pos = match.end() if match else self._pos
+            if self._pos < len(self._buffer) or not self._fill():
+                return
+
+    def _peek(self) -> str:
+        self._skip_whitespace()
+        if self._pos >= len(self._buffer):
+            raise ValueError("Unexpected end of JSON document.")
+        return self._buffer[self._pos]
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found}' in JSON document.")
+        self._pos += 1
+
+    def _is_complete(self, end: int) -> bool:
+        if end < len(self._buffer) and self._buffer[end] in _NUMBER_CONTINUATION:
+            return False
+        match = _WHITESPACE.match(self._buffer, end)
+        return (match.end() if match else end) < len(self._buffer)
+
+    def read_value(self) -> Any:
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self._buffer, self._pos)
+                # A value cut short by the buffer (e.g. a number) can decode
+                # successfully, so only trust it once the next token is visible
+                # and cannot be the rest of a number.
+                if self._eof or self._is_complete(end):
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def _read_key(self) -> str:
+        if self._peek() != '"':
+            raise ValueError("Expected an object key in JSON document.")
+        while True:
+            try:
+                key, end = scanstring(self._buffer, self._pos + 1)
+                self._pos = end
+                return key
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+
+    def peek_is_object(self) -> bool:
+        return self._peek() == "{"
+
+    def iter_object(self) -> Iterator[str]:
+        """
+        Yield the keys of the object at the current position. After each key the
+        caller must consume the member's value before resuming iteration.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self._read_key()
+            self._expect(":")
+            yield key
+            separator = self._peek()
+            self._pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                raise ValueError(
+                    f"Expected ',' or '}}' but found '{separator}' in JSON document."
+                )
+
+    def peek_is_array(self) -> bool:
+        return self._peek() == "["
+
+    def iter_array(self) -> Iterator[None]:
+        """
+        Yield once per element of the array at the current position. After
+        each yield the caller must consume the element before resuming.
+        """
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield
+            separator = self._peek()
+            self._pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                raise ValueError(
+                    f"Expected ',' or ']' but found '{separator}' in JSON document."
+                )
+
+    def skip_value(self, stream_depth: int) -> None:
+        if stream_depth > 0 and self.peek_is_object():
+            for _ in self.iter_object():
+                self.skip_value(stream_depth - 1)
+        else:
+            self.read_value()
+
+    def read_projected(self, projection: Projection, stream_depth: int) -> Any:
+        """
+        Read the value at the current position, keeping only its `projection`.
+        The outer `stream_depth` levels of objects are walked member by member;
+        anything deeper is decoded whole and then projected.
+        """
+        if (
+            stream_depth == 0
+            or not isinstance(projection, dict)
+            or not self.peek_is_object()
+        ):
+            return _project(self.read_value(), projection)
+        wildcard = projection.get("*")
+        projected: dict[str, Any] = {}
+        for key in self.iter_object():
+            member_projection = projection.get(key, wildcard)
+            if member_projection:
+                projected[key] = self.read_projected(
+                    member_projection, stream_depth - 1
+                )
+            else:
+                self.skip_value(stream_depth - 1)
+        return projected
+
+
+def load_manifest(path: str, projection: Projection) -> dict:
+    """
+    Load only the `projection` of a (potentially very large) `manifest.json`.
+
+    The file is streamed, and each top-level section is walked one member at a
+    time, so peak memory is bounded by the largest single node/macro/doc rather
+    than by the whole manifest.
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        if not stream.peek_is_object():
+            raise ValueError(f"Expected a JSON object in {path}.")
+        # Stream the document and its top-level sections (`nodes`, `macros`,
+        # ...); each node, macro or doc is decoded on its own.
+        return stream.read_projected(projection, stream_depth=2)
+
+
+def iter_projected_array(path: str, key: str, projection: Projection) -> Iterator[Any]:
+    """
+    Yield the `projection` of each element of the top-level array `key` of the
+    JSON document at `path` (e.g. the `results` of `run_results.json`). Only
+    one element is decoded at a time.
+    """
+    with open(path, encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        if not stream.peek_is_object():
+            raise ValueError(f"Expected a JSON object in {path}.")
+        for member in stream.iter_object():
+            if member != key or not stream.peek_is_array():
+                stream.skip_value(stream_depth=1)
+                continue
+            for _ in stream.iter_array():
+                yield stream.read_projected(projection, stream_depth=0)
@@ -1,9 +1,12 @@
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Literal
 
 from pydantic import BaseModel
 
+from .graph import DagGraph
+
 
 class Freshness(str, Enum):
     CLEAN = "CLEAN"
@@ -18,6 +21,9 @@ class NodeType(str, Enum):
 class StateItem(BaseModel):
     last_updated: datetime
     checksum: str
+    # Only set for seeds whose checksum `orc` computed with an algorithm other
+    # than sha256, so state files and the API payload otherwise stay unchanged.
+    checksum_algorithm: str | None = None
     sources: dict[str, datetime]
 
 
@@ -27,23 +33,44 @@ class StateApiModel(BaseModel):
 
 class SourceFreshness(BaseModel):
     sources: dict[str, datetime]
+    # When each queried source was checked; sources carried over from state or
+    # the freshness cache have none.
+    snapshotted_at: dict[str, datetime] = {}
+
+
+class CachedSourceFreshness(BaseModel):
+    max_loaded_at: datetime
+    snapshotted_at: datetime
+
+
+class SourceFreshnessCacheFile(BaseModel):
+    sources: dict[str, CachedSourceFreshness]
 
 
-class FreshnessConfig(BaseModel):
+# The DAG records below are built in bulk from our own parsed manifest, so they
+# are plain slotted dataclasses rather than validating pydantic models. Pydantic
+# is kept for data crossing a boundary (state files and API payloads).
+
+
+@dataclass(slots=True)
+class FreshnessConfig:
     inherited_from: str | None = None
     minutes_sla: int | None = None
     updates_on: Literal["any", "all"] = "any"
 
 
-class Node(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class Node:
     last_updated: datetime | None = None
     node_type: NodeType
 
 
+@dataclass(slots=True, kw_only=True)
 class SourceNode(Node):
     node_type: NodeType = NodeType.SOURCE
 
 
+@dataclass(slots=True, kw_only=True)
 class MaterialisationNode(Node):
     node_type: NodeType = NodeType.MATERIALISATION
 
@@ -55,13 +82,66 @@ class MaterialisationNode(Node):
     freshness: Freshness
     reason: str
     sources: dict[str, datetime]
+    checksum_algorithm: str | None = None
 
 
-class Edge(BaseModel):
+@dataclass(slots=True)
+class Edge:
     from_: str
     to_: str
 
 
-class ParsedDag(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class ManifestNode:
+    """The state-independent part of a seed, model or snapshot in the manifest."""
+
+    node_id: str
+    resource_type: str
+    relation_name: str | None
+    node_checksum: str
+    dbt_path: str
+    file_path: str
+    from_external_package: bool
+    depends_on_nodes: list[str]
+    freshness_config: FreshnessConfig
+    # Only ever set on snapshots that opted into reuse through their meta.
+    reuse_snapshot: bool = False
+
+
+@dataclass(slots=True)
+class ManifestDag:
+    """What `construct_dag` reads from a manifest, before state is overlaid."""
+
+    source_ids: list[str]
+    nodes: list[ManifestNode]
+
+
+@dataclass(slots=True)
+class ParsedDag:
     nodes: dict[str, Node]
     edges: list[Edge]
+
+    _graph: DagGraph | None = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def graph(self) -> DagGraph:
+        """The integer-indexed adjacency of `nodes` and `edges`, built once."""
+        if self._graph is None:
+            self._graph = DagGraph(
+                self.nodes.keys(),
+                ((edge.from_, edge.to_) for edge in self.edges),
+                source_ids=(
+                    node_id
+                    for node_id, node in self.nodes.items()
+                    if node.node_type == NodeType.SOURCE
+                ),
+            )
+        return self._graph
+
+    def source_parent_ids(self, node_id: str) -> list[str]:
+        """The direct parents of `node_id` that are sources, in edge order."""
+        graph = self.graph
+        index = graph.index_of(node_id)
+        if index is None:
+            return []
+        return graph.source_parent_ids(index)
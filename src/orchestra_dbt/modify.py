@@ -31,24 +31,48 @@ def restore_selectors_file(snapshot: bytes | None) -> None:
         pass
 
 
-def _reused_exclusion_criteria() -> dict[str, Any]:
-    return {
-        "method": "tag",
-        "value": ORCHESTRA_REUSED_NODE,
-        "indirect_selection": INDIRECT_SELECTION_CAUTIOUS,
-    }
+def _reused_exclusions(reused_selectors: list[str] | None) -> list[str]:
+    # Without explicit selectors, reused nodes carry the reused-node tag.
+    if reused_selectors is None:
+        return [f"tag:{ORCHESTRA_REUSED_NODE}"]
+    return reused_selectors
+
+
+def _cautious_criteria(selector: str) -> dict[str, Any]:
+    criteria: list[dict[str, Any]] = [
+        {
+            "method": method,
+            "value": value,
+            "indirect_selection": INDIRECT_SELECTION_CAUTIOUS,
+        }
+        for method, value in (part.split(":", 1) for part in selector.split(","))
+    ]
+    return criteria[0] if len(criteria) == 1 else {"intersection": criteria}
 
 
-def _get_reused_selector_definition(existing_selector: str) -> dict[str, Any]:
+def _reused_exclusion_criteria(
+    reused_selectors: list[str] | None,
+) -> list[dict[str, Any]]:
+    return [
+        _cautious_criteria(selector)
+        for selector in _reused_exclusions(reused_selectors)
+    ]
+
+
+def _get_reused_selector_definition(
+    existing_selector: str, reused_selectors: list[str] | None = None
+) -> dict[str, Any]:
     return {
         "intersection": [
             {"method": "selector", "value": existing_selector},
-            {"exclude": [_reused_exclusion_criteria()]},
+            {"exclude": _reused_exclusion_criteria(reused_selectors)},
         ]
     }
 
 
-def update_selectors_yaml(selector_tag: str) -> bool:
+def update_selectors_yaml(
+    selector_tag: str, reused_selectors: list[str] | None = None
+) -> bool:
     try:
         selectors_yml = load_yaml(_SELECTORS_FILE)
     except FileNotFoundError:
@@ -77,7 +101,7 @@ def update_selectors_yaml(selector_tag: str) -> bool:
         {
             "name": selector_tag,
             "definition": _get_reused_selector_definition(
-                random_uuid_underscore_selector_tag
+                random_uuid_underscore_selector_tag, reused_selectors
             ),
         }
     )
@@ -91,7 +115,7 @@ def update_selectors_yaml(selector_tag: str) -> bool:
     return True
 
 
-def _split_selection_args(
+def split_selection_args(
     args: list[str],
 ) -> tuple[list[str], list[str], list[str]]:
     passthrough: list[str] = []
@@ -118,10 +142,14 @@ def _split_selection_args(
 
 
 def _build_generated_selector_definition(
-    includes: list[str], excludes: list[str]
+    includes: list[str],
+    excludes: list[str],
+    reused_selectors: list[str] | None = None,
 ) -> dict[str, Any]:
     union: list[Any] = list(includes) if includes else ["fqn:*"]
-    union.append({"exclude": [*excludes, _reused_exclusion_criteria()]})
+    union.append(
+        {"exclude": [*excludes, *_reused_exclusion_criteria(reused_selectors)]}
+    )
     return {"union": union}
 
 
@@ -160,12 +188,22 @@ def _command_runs_tests(cmd: list[str]) -> bool:
     return len(cmd) > 1 and cmd[1] in _TEST_RUNNING_SUBCOMMANDS
 
 
-def modify_dbt_command(cmd: list[str]) -> list[str]:
+def modify_dbt_command(
+    cmd: list[str], reused_selectors: list[str] | None = None
+) -> list[str]:
+    """
+    Rewrite a dbt command so that reused nodes are not run. Reused nodes are
+    matched by the reused-node tag patched onto them, or, when
+    `reused_selectors` is given, by those selectors (see
+    `reused_selectors.reused_node_selectors`) with no project files patched.
+    """
     if "--selector" in cmd:
         success_updating_selectors = False
         try:
             selector_tag = cmd[cmd.index("--selector") + 1]
-            success_updating_selectors = update_selectors_yaml(selector_tag)
+            success_updating_selectors = update_selectors_yaml(
+                selector_tag, reused_selectors
+            )
             if not success_updating_selectors:
                 log_warn("dbt will not run in stateful mode.")
         except IndexError:
@@ -174,20 +212,24 @@ def modify_dbt_command(cmd: list[str]) -> list[str]:
             )
         return cmd
 
-    passthrough, includes, excludes = _split_selection_args(cmd[2:])
+    passthrough, includes, excludes = split_selection_args(cmd[2:])
     user_has_selection = bool(includes or excludes)
 
     if user_has_selection and _command_runs_tests(cmd):
-        definition = _build_generated_selector_definition(includes, excludes)
+        definition = _build_generated_selector_definition(
+            includes, excludes, reused_selectors
+        )
         selector_name = _append_generated_selector(definition)
         if selector_name is not None:
             return [cmd[0], cmd[1], *passthrough, "--selector", selector_name]
         log_warn(
-            "Could not write a generated selector; falling back to tag exclusion, "
+            "Could not write a generated selector; falling back to `--exclude`, "
             "which may skip tests that span reused and freshly-built models."
         )
 
-    cmd += ["--exclude", f"tag:{ORCHESTRA_REUSED_NODE}"]
+    exclusions = _reused_exclusions(reused_selectors)
+    if exclusions:
+        cmd += ["--exclude", *exclusions]
     user_set_indirect_selection = any(
         arg == "--indirect-selection" or arg.startswith("--indirect-selection=")
         for arg in cmd
@@ -1,15 +1,14 @@
-from .utils import load_json
+from .run_results import RunResult, load_run_results
 
 
-def is_warn() -> None:
+def is_warn(run_results: dict[str, RunResult] | None = None) -> None:
     status = "SUCCEEDED"
 
     try:
-        run_results = load_json(path="target/run_results.json")
-        for result in run_results.get("results", []):
-            if result.get("status") == "warn":
-                status = "WARNING"
-                break
+        if run_results is None:
+            run_results = load_run_results()
+        if any(result.status == "warn" for result in run_results.values()):
+            status = "WARNING"
     except Exception:
         pass
 
@@ -1,13 +1,56 @@
 import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
 from .constants import ORCHESTRA_REUSED_NODE
 from .logger import log_debug, log_error, log_info, log_warn
 from .models import MaterialisationNode
-from .utils import load_yaml, save_yaml
+from .utils import load_yaml, save_yaml, write_bytes_atomically
+
+
+@dataclass(frozen=True, slots=True)
+class PatchedFile:
+    """A file as it was before `patch_file`, restored by `revert_patching`."""
+
+    content: bytes
+    atime_ns: int
+    mtime_ns: int
+
+
+# `None` marks a file the patching created, which reverting deletes.
+PatchSnapshot = dict[Path, PatchedFile | None]
+
+_PARTIAL_PARSE_PATH = "target/partial_parse.msgpack"
+
+_PATCH_PREFIX = f'{{{{ config(tags=["{ORCHESTRA_REUSED_NODE}"], meta='
+_PATCH_SUFFIX = ") }}\n\n"
+# dbt only reads what is inside a snapshot's block, so the config goes there.
+_SNAPSHOT_BLOCK_START = re.compile(r"{%-?\s*snapshot\s[^%]*%}")
+
+
+def _patch_offset(content: str) -> int:
+    match = _SNAPSHOT_BLOCK_START.search(content)
+    return match.end() if match else 0
+
+
+def _patch_header(
+    reason: str, freshness: int | None, last_updated: datetime | None
+) -> str:
+    meta_dict: dict[str, str | int] = {
+        "orchestra_reused_reason": reason.replace("'", "").replace('"', "")
+    }
+    if freshness is not None:
+        meta_dict["orchestra_freshness"] = freshness
+    if last_updated:
+        meta_dict["orchestra_last_updated"] = last_updated.isoformat()
+
+    # Replace double quotes with single quotes
+    meta_config: str = json.dumps(meta_dict).replace('"', "'")
+    return f"{_PATCH_PREFIX}{meta_config}{_PATCH_SUFFIX}"
 
 
 def patch_file(
@@ -15,7 +58,7 @@ def patch_file(
     reason: str,
     freshness: int | None,
     last_updated: datetime | None,
-) -> None:
+) -> PatchedFile:
     """
     This function should add the following config to the top of the file:
     ```
@@ -30,98 +73,133 @@ def patch_file(
       )
     }}
     ```
+    The file is replaced atomically; its original content and timestamps are
+    returned.
     """
+    stat = file_path.stat()
+    original = PatchedFile(
+        content=file_path.read_bytes(),
+        atime_ns=stat.st_atime_ns,
+        mtime_ns=stat.st_mtime_ns,
+    )
+    content = original.content.decode("utf-8")
+    offset = _patch_offset(content)
+    patched = (
+        content[:offset]
+        + _patch_header(reason, freshness, last_updated)
+        + content[offset:]
+    )
+    write_bytes_atomically(file_path, patched.encode("utf-8"))
+    return original
 
-    meta_dict: dict[str, str | int] = {
-        "orchestra_reused_reason": reason.replace("'", "").replace('"', "")
-    }
-    if freshness is not None:
-        meta_dict["orchestra_freshness"] = freshness
-    if last_updated:
-        meta_dict["orchestra_last_updated"] = last_updated.isoformat()
 
-    # Replace double quotes with single quotes
-    meta_config: str = json.dumps(meta_dict).replace('"', "'")
+def _sql_files_to_patch(file_paths: list[str]) -> dict[str, Path]:
+    """
+    Resolve project-relative `.sql` paths (as in `MaterialisationNode.file_path`)
+    against the working directory, skipping files that do not exist.
+    """
+    cwd = Path(os.getcwd())
+    sql_files: dict[str, Path] = {}
+    for file_path in file_paths:
+        if not file_path.endswith(".sql") or file_path in sql_files:
+            continue
+        file = cwd / file_path
+        if not file.is_file():
+            log_warn(f"Could not find {file_path} in the project directory.")
+            continue
+        sql_files[file_path] = file
+    return sql_files
 
-    file_path.write_text(
-        f'{{{{ config(tags=["{ORCHESTRA_REUSED_NODE}"], meta={meta_config}) }}}}\n\n'
-        + file_path.read_text(encoding="utf-8"),
-        encoding="utf-8",
-    )
 
+def patch_sql_files(nodes_to_reuse: dict[str, MaterialisationNode]) -> PatchSnapshot:
+    """
+    Tag the `.sql` file of every reused node, patching files concurrently.
+    Returns the original state of the patched files for `revert_patching`.
+    """
+    file_paths_to_nodes: dict[str, MaterialisationNode] = {
+        node.file_path: node for node in nodes_to_reuse.values()
+    }
 
-def revert_patch_file(file_path: Path) -> None:
-    # This should remove the config added by `patch_file`.
-    content = file_path.read_text(encoding="utf-8")
+    def patch(relative_path: str, file: Path) -> tuple[Path, PatchedFile] | None:
+        node: MaterialisationNode = file_paths_to_nodes[relative_path]
+        try:
+            log_debug(f"Patching {relative_path}...")
+            original = patch_file(
+                file_path=file,
+                reason=node.reason,
+                freshness=node.freshness_config.minutes_sla,
+                last_updated=node.last_updated,
+            )
+        except Exception as e:
+            log_warn(f"Failed to add tag to {file}: {e}")
+            return None
+        return file, original
 
-    # Match the config line with meta dict (handles both single and double quotes)
-    pattern = (
-        re.escape('{{ config(tags=["')
-        + re.escape(ORCHESTRA_REUSED_NODE)
-        + re.escape('"], meta=')
-        + r".*?"
-        + re.escape(") }}\n\n")
-    )
-    content = re.sub(pattern, "", content, count=1)  # Remove only the first occurrence
-    file_path.write_text(content, encoding="utf-8")
+    sql_files = _sql_files_to_patch(list(file_paths_to_nodes))
+    if not sql_files:
+        return {}
+    with ThreadPoolExecutor() as executor:
+        patched = executor.map(patch, sql_files.keys(), sql_files.values())
+        return dict(result for result in patched if result is not None)
 
 
-def _get_sql_files(cwd: Path) -> list[Path]:
-    filtered_files: list[Path] = []
-    for root, _, files in os.walk(cwd, followlinks=True):
-        # Skip .venv directories
-        if ".venv" in root:
-            continue
-        for name in files:
-            if name.endswith(".sql"):
-                filtered_files.append(Path(root) / name)
-    return filtered_files
+def revert_patching(snapshot: PatchSnapshot) -> None:
+    """
+    Restore the files in `snapshot` to their original content and timestamps
+    (deleting the ones patching created), concurrently, so tools that track changes by mtime see them as untouched.
+    """
 
+    def restore(file: Path, original: PatchedFile | None) -> None:
+        try:
+            if original is None:
+                file.unlink(missing_ok=True)
+                return
+            write_bytes_atomically(file, original.content)
+            os.utime(file, ns=(original.atime_ns, original.mtime_ns))
+        except Exception as e:
+            log_warn(f"Failed to reset tag from {file}: {e}")
 
-def patch_sql_files(nodes_to_reuse: dict[str, MaterialisationNode]) -> None:
-    cwd = Path(os.getcwd())
-    sql_files = _get_sql_files(cwd)
+    if not snapshot:
+        return
+    with ThreadPoolExecutor() as executor:
+        # Consume the results so every restore finishes before returning.
+        list(executor.map(restore, snapshot.keys(), snapshot.values()))
 
-    if not sql_files:
-        log_warn("No .sql files found in project directory.")
 
-    file_paths_to_nodes: dict[str, MaterialisationNode] = {
-        node.file_path: node for node in nodes_to_reuse.values()
-    }
+def snapshot_partial_parse(path: str = _PARTIAL_PARSE_PATH) -> bytes | None:
+    """
+    dbt's partial parse state before patching. A run against patched files
+    saves their patched hashes, so restoring this afterwards (once the files
+    are reverted) keeps the next parse warm.
+    """
+    try:
+        with open(path, "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
 
-    for file in sql_files:
-        relative_path = str(file.relative_to(cwd))
-        if relative_path in file_paths_to_nodes:
-            node: MaterialisationNode = file_paths_to_nodes[relative_path]
-            try:
-                log_debug(f"Patching {relative_path}...")
-                patch_file(
-                    file_path=file,
-                    reason=node.reason,
-                    freshness=node.freshness_config.minutes_sla,
-                    last_updated=node.last_updated,
-                )
-            except Exception as e:
-                log_warn(f"Failed to add tag to {file}: {e}")
-
-
-def revert_patching(file_paths_to_revert: list[str]) -> None:
-    cwd = Path(os.getcwd())
-    sql_files = _get_sql_files(cwd)
 
-    for file in sql_files:
-        relative_path = str(file.relative_to(cwd))
-        if relative_path in file_paths_to_revert:
-            try:
-                revert_patch_file(file_path=file)
-            except Exception as e:
-                log_warn(f"Failed to reset tag from {file}: {e}")
+def restore_partial_parse(
+    snapshot: bytes | None, path: str = _PARTIAL_PARSE_PATH
+) -> None:
+    # Without a snapshot, whatever the run saved is still better than nothing.
+    if snapshot is None:
+        return
+    try:
+        write_bytes_atomically(Path(path), snapshot)
+    except OSError as e:
+        log_warn(f"Failed to restore {path}: {e}")
 
 
 def patch_seed_properties(
     nodes_to_reuse: dict[str, MaterialisationNode],
     seed_properties_file_path: str = "seeds/properties.yml",
-) -> None:
+) -> PatchSnapshot:
+    """
+    Tag the reused seeds in the seed properties file, creating it if needed.
+    Returns the file's original state for `revert_patching`, so the tags do
+    not outlive the run.
+    """
     seeds_to_reuse: dict[str, MaterialisationNode] = {
         node.file_path.split("/")[-1].removesuffix(".csv"): node
         for node in nodes_to_reuse.values()
@@ -129,7 +207,21 @@ def patch_seed_properties(
     }
 
     if not seeds_to_reuse:
-        return
+        return {}
+
+    properties_file = Path(seed_properties_file_path)
+    try:
+        stat = properties_file.stat()
+        original: PatchedFile | None = PatchedFile(
+            content=properties_file.read_bytes(),
+            atime_ns=stat.st_atime_ns,
+            mtime_ns=stat.st_mtime_ns,
+        )
+    except FileNotFoundError:
+        original = None
+    except OSError as e:
+        log_error(f"Error reading {seed_properties_file_path}: {e}")
+        return {}
 
     try:
         seeds_properties = load_yaml(seed_properties_file_path)
@@ -145,7 +237,7 @@ def patch_seed_properties(
         seeds_properties: dict = {"seeds": []}
     except Exception as e:
         log_error(f"Error loading {seed_properties_file_path}: {e}")
-        return
+        return {}
 
     for seed_properties in seeds_properties.get("seeds", []):
         seed_name = seed_properties.get("name")
@@ -200,3 +292,4 @@ def patch_seed_properties(
         log_info(f"Patched {seed_properties_file_path}")
     except Exception as e:
         log_error(f"Error saving {seed_properties_file_path}: {e}")
+    return {properties_file: original}
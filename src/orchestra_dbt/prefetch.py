@@ -0,0 +1,278 @@
+from collections.abc import Callable, Collection
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import get_context
+from time import perf_counter
+from typing import Any, TypeVar
+
+from .build_after import propagate_freshness_config
+from .dag import construct_dag
+from .logger import log_debug, log_info
+from .ls import get_node_ids_from_manifest, get_node_ids_to_run
+from .manifest_reader import load_manifest
+from .models import SourceFreshness, StateApiModel
+from .run_context import get_run_context
+from .session import DbtSession, get_args_for_parse
+from .source_freshness import get_source_freshness
+from .source_freshness.cache import open_source_freshness_cache
+from .source_freshness.plan import plan_source_freshness
+from .source_freshness.scope import (
+    SCOPE_PROJECTION,
+    command_node_ids,
+    source_selectors,
+    upstream_source_ids,
+)
+from .state import StateLoadError, load_state
+from .target_finder import find_target_in_args
+
+T = TypeVar("T")
+
+_MANIFEST_PATH = "target/manifest.json"
+
+
+@dataclass
+class PrefetchedInputs:
+    source_freshness: SourceFreshness | None
+    node_ids_to_run: set[str] | None
+    state: StateApiModel | None
+    state_load_error: StateLoadError | None = None
+
+
+def _timed(fn: Callable[..., T], *args: Any) -> tuple[T, float]:
+    start = perf_counter()
+    result = fn(*args)
+    return result, perf_counter() - start
+
+
+def _load_scope_manifest() -> dict | None:
+    try:
+        return load_manifest(_MANIFEST_PATH, SCOPE_PROJECTION)
+    # The manifest is missing, unreadable or not valid JSON.
+    except (OSError, ValueError) as e:
+        log_debug(f"Could not read sources from the manifest: {e}")
+        return None
+
+
+def _source_selection(
+    manifest: dict | None,
+    node_ids: set[str] | None,
+    skipped: Collection[str],
+    command: str | None = None,
+) -> tuple[list[str] | None, list[str]]:
+    """
+    The `--select` and `--exclude` source selectors for source freshness: the
+    sources upstream of `node_ids` (every source when `None`), less `skipped`.
+    With `command`, only the nodes of `node_ids` it executes count.
+    """
+    if command is not None and manifest is not None:
+        node_ids = command_node_ids(command, node_ids, manifest)
+    if node_ids is None or manifest is None:
+        return None, source_selectors(skipped, manifest or {})
+    source_ids = upstream_source_ids(node_ids, manifest)
+    log_info(
+        f"Scoping source freshness to {len(source_ids)} source(s) upstream of "
+        f"{len(node_ids)} selected node(s)."
+    )
+    return source_selectors(source_ids.difference(skipped), manifest), []
+
+
+def _with_carried_sources(
+    source_freshness: SourceFreshness | None,
+    skipped_sources: dict[str, datetime],
+) -> SourceFreshness | None:
+    if not source_freshness or not skipped_sources:
+        return source_freshness
+    return source_freshness.model_copy(
+        update={"sources": {**skipped_sources, **source_freshness.sources}}
+    )
+
+
+def _query_source_freshness(
+    target: str | None,
+    session: DbtSession | None,
+    node_ids: set[str] | None,
+    skipped_sources: dict[str, datetime],
+    command: str | None = None,
+) -> tuple[SourceFreshness | None, bool]:
+    """
+    Run source freshness for the sources upstream of `node_ids` (every source
+    when `None`) that are neither in `skipped_sources` nor still fresh in the
+    source freshness cache. With `command`, only the sources upstream of the
+    nodes it executes are queried. Also returns whether dbt ran, and so wrote
+    the manifest.
+    """
+    manifest = _load_scope_manifest()
+    cache = open_source_freshness_cache(get_run_context(), manifest or {})
+    if cache is not None:
+        cached_sources = cache.fresh_sources()
+        if cached_sources:
+            log_info(f"Using cached freshness for {len(cached_sources)} source(s).")
+        skipped_sources = {**skipped_sources, **cached_sources}
+
+    select, exclude = _source_selection(manifest, node_ids, skipped_sources, command)
+    source_freshness = get_source_freshness(
+        target=target, session=session, select=select, exclude=exclude
+    )
+    if source_freshness and cache is not None:
+        cache.update(source_freshness)
+    return _with_carried_sources(source_freshness, skipped_sources), select != []
+
+
+def _parse_project(user_args: tuple[str, ...]) -> bool:
+    from dbt.cli.main import dbtRunner
+
+    res = dbtRunner().invoke(get_args_for_parse(user_args))
+    if not res.success:
+        log_debug(f"dbt parse failed: {res.exception}")
+    return res.success
+
+
+def _collect_dbt_inputs(
+    dbt_args: tuple[str, ...],
+    session: DbtSession | None = None,
+    skipped_sources: dict[str, datetime] | None = None,
+) -> tuple[SourceFreshness | None, set[str] | None]:
+    """
+    Run source freshness and resolve the selection. `skipped_sources` (from
+    `plan_source_freshness`) and sources the freshness cache still holds are
+    not queried; their last known `max_loaded_at` is carried into the result
+    instead.
+    """
+    skipped_sources = skipped_sources or {}
+    user_args = dbt_args[2:]
+    target = find_target_in_args(list(dbt_args))
+    scope = get_run_context().settings.scope_source_freshness
+    if scope and session is not None:
+        # The session parse has written the manifest, so the selection is
+        # resolved once, up front, and only its upstream sources are queried.
+        node_ids_to_run = get_node_ids_to_run(user_args, session=session)
+        source_freshness, _ = _query_source_freshness(
+            target, session, node_ids_to_run, skipped_sources, dbt_args[1]
+        )
+        if not source_freshness:
+            return None, None
+        return source_freshness, node_ids_to_run
+
+    # Without a session, the manifest left by the previous invocation picks the
+    # sources; sources added since then count as having new data.
+    source_freshness, dbt_ran = _query_source_freshness(
+        target,
+        session,
+        get_node_ids_from_manifest(user_args) if scope else None,
+        skipped_sources,
+        dbt_args[1] if scope else None,
+    )
+    if not source_freshness:
+        return None, None
+    if not dbt_ran and session is None and not _parse_project(user_args):
+        # Without a freshness run nothing has refreshed the manifest.
+        return None, None
+    # Source freshness (or the session parse) has written the manifest that
+    # the selection is resolved against.
+    return source_freshness, get_node_ids_to_run(user_args, session=session)
+
+
+def _collect_dbt_inputs_in_worker(
+    dbt_args: tuple[str, ...],
+    skipped_sources: dict[str, datetime] | None = None,
+) -> tuple[tuple[SourceFreshness | None, set[str] | None], float]:
+    # dbt is not thread-safe, so it gets a process of its own rather than
+    # sharing the interpreter with the state download.
+    try:
+        executor = ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn"))
+    except OSError as e:
+        log_debug(f"Could not start a dbt worker process ({e}). Running in-process.")
+        return _timed(_collect_dbt_inputs, dbt_args, None, skipped_sources)
+
+    with executor:
+        try:
+            return executor.submit(
+                _timed, _collect_dbt_inputs, dbt_args, None, skipped_sources
+            ).result()
+        except BrokenProcessPool as e:
+            log_debug(
+                f"dbt worker process stopped unexpectedly ({e}). Running in-process."
+            )
+    return _timed(_collect_dbt_inputs, dbt_args, None, skipped_sources)
+
+
+def _plan_from_state(
+    dbt_args: tuple[str, ...], state_future: Future[tuple[StateApiModel, float]]
+) -> dict[str, datetime]:
+    if (
+        not get_run_context().settings.plan_source_freshness
+        or "--full-refresh" in dbt_args
+    ):
+        return {}
+    try:
+        state, _ = state_future.result()
+    except StateLoadError:
+        return {}
+    try:
+        # The DAG of the previous invocation's manifest (or the session's);
+        # source freshness only matters for nodes that can rebuild.
+        parsed_dag = construct_dag(SourceFreshness(sources={}), state)
+    # No manifest from a previous invocation, or one that is not valid JSON.
+    except (OSError, ValueError) as e:
+        log_debug(f"Could not plan source freshness from the manifest: {e}")
+        return {}
+    propagate_freshness_config(parsed_dag)
+    skipped_sources = plan_source_freshness(parsed_dag)
+    if skipped_sources:
+        log_info(
+            f"Skipping freshness for {len(skipped_sources)} source(s) whose "
+            "dependents are all within their build_after window."
+        )
+    return skipped_sources
+
+
+def prefetch_run_inputs(
+    dbt_args: tuple[str, ...], session: DbtSession | None = None
+) -> PrefetchedInputs:
+    """
+    Collect source freshness, the selected node ids and the stored state
+    concurrently: state loads on a background thread while dbt runs in a worker
+    process. With a `session`, dbt stays in this process (the session owns the
+    parsed manifest) and only the state load runs in the background.
+
+    With `plan_source_freshness` (off by default), dbt waits for the state
+    instead, so that sources no node can rebuild from are left out of source
+    freshness.
+    """
+    start = perf_counter()
+    with ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="orchestra-state"
+    ) as executor:
+        state_future = executor.submit(_timed, load_state)
+        skipped_sources = _plan_from_state(dbt_args, state_future)
+        if session is None:
+            (source_freshness, node_ids_to_run), dbt_seconds = (
+                _collect_dbt_inputs_in_worker(dbt_args, skipped_sources)
+            )
+        else:
+            (source_freshness, node_ids_to_run), dbt_seconds = _timed(
+                _collect_dbt_inputs, dbt_args, session, skipped_sources
+            )
+
+        state: StateApiModel | None = None
+        state_load_error: StateLoadError | None = None
+        state_seconds = 0.0
+        try:
+            state, state_seconds = state_future.result()
+        except StateLoadError as e:
+            state_load_error = e
+
+    elapsed = perf_counter() - start
+    saved = max(0.0, dbt_seconds + state_seconds - elapsed)
+    log_info(
+        f"Prefetched source freshness, selection and state in {elapsed:.1f}s "
+        f"({saved:.1f}s saved by running them concurrently)."
+    )
+    return PrefetchedInputs(
+        source_freshness=source_freshness,
+        node_ids_to_run=node_ids_to_run,
+        state=state,
+        state_load_error=state_load_error,
+    )
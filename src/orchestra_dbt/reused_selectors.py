@@ -0,0 +1,206 @@
+import heapq
+import re
+from collections import Counter, defaultdict
+from collections.abc import Collection, Iterator
+from pathlib import PurePosixPath
+from typing import TypeGuard
+
+from .logger import log_debug
+from .manifest_reader import Projection, load_manifest
+from .selection import NON_SOURCE_KEYS
+
+_MANIFEST_PATH = "target/manifest.json"
+_MEMBER_PROJECTION: Projection = {
+    "fqn": True,
+    "resource_type": True,
+    "original_file_path": True,
+    "package_name": True,
+    "tags": True,
+}
+# The parts of the manifest needed to express reused nodes as selectors. dbt's
+# `fqn` method matches every non-source resource, so all of them are read;
+# sources are read for their tags, which `tag:` selects as well.
+_MANIFEST_PROJECTION: Projection = {
+    "metadata": {"project_name": True},
+    "sources": {"*": {"tags": True}},
+    **{key: {"*": _MEMBER_PROJECTION} for key in NON_SOURCE_KEYS},
+}
+# A package, directory or tag is only worth a criterion of its own when it
+# stands in for at least this many reused nodes.
+_MIN_GROUP_SIZE = 2
+# Values dbt would read as globs, or that break up a selector, are never
+# collapsed into a single criterion.
+_UNSAFE_VALUE = re.compile(r"[*?\[\],\s]")
+
+
+def _flat_fqn(node: dict) -> list[str]:
+    # Dots in fqn segments act as separators for `fqn:` selection too.
+    return [part for segment in node.get("fqn") or [] for part in segment.split(".")]
+
+
+def _fqn_prefixes(flat_fqn: list[str]) -> Iterator[tuple[str, ...]]:
+    # `fqn:a.b` matches any node whose fqn, with or without its package, starts
+    # with `a.b`.
+    for parts in (flat_fqn, flat_fqn[1:]):
+        for end in range(1, len(parts) + 1):
+            yield tuple(parts[:end])
+
+
+def _is_safe(value: object) -> TypeGuard[str]:
+    return isinstance(value, str) and bool(value) and not _UNSAFE_VALUE.search(value)
+
+
+def _collapse_packages(
+    members: dict[str, dict], reused: set[str], remaining: dict[str, None]
+) -> Iterator[str]:
+    groups: dict[tuple[str, str], list[str]] = defaultdict(list)
+    for unique_id, member in members.items():
+        package = member.get("package_name")
+        resource_type = member.get("resource_type")
+        if _is_safe(package) and package != "this" and _is_safe(resource_type):
+            groups[(package, resource_type)].append(unique_id)
+    for (package, resource_type), unique_ids in groups.items():
+        covered = [unique_id for unique_id in unique_ids if unique_id in remaining]
+        if len(covered) >= _MIN_GROUP_SIZE and reused.issuperset(unique_ids):
+            for unique_id in covered:
+                del remaining[unique_id]
+            yield f"package:{package},resource_type:{resource_type}"
+
+
+def _collapse_directories(
+    members: dict[str, dict],
+    reused: set[str],
+    remaining: dict[str, None],
+    project_name: str | None,
+) -> Iterator[str]:
+    # `path:` is resolved against the root project's directory, but matches
+    # the (package-relative) file path of every resource, so a directory is
+    # only usable if it exists in the root project, and only when everything
+    # of that resource type beneath it, in any package, is reused.
+    if project_name is None:
+        return
+    groups: dict[tuple[str, PurePosixPath], list[str]] = defaultdict(list)
+    root_directories: set[tuple[str, PurePosixPath]] = set()
+    for unique_id, member in members.items():
+        resource_type = member.get("resource_type")
+        original_file_path = member.get("original_file_path")
+        if not _is_safe(resource_type) or not isinstance(original_file_path, str):
+            continue
+        for directory in PurePosixPath(original_file_path).parents[:-1]:
+            groups[(resource_type, directory)].append(unique_id)
+            if member.get("package_name") == project_name:
+                root_directories.add((resource_type, directory))
+
+    # Outermost directories first, so each subtree gets a single criterion.
+    for resource_type, directory in sorted(
+        root_directories, key=lambda group: (len(group[1].parts), group)
+    ):
+        unique_ids = groups[(resource_type, directory)]
+        covered = [unique_id for unique_id in unique_ids if unique_id in remaining]
+        if (
+            len(covered) >= _MIN_GROUP_SIZE
+            and _is_safe(str(directory))
+            and reused.issuperset(unique_ids)
+        ):
+            for unique_id in covered:
+                del remaining[unique_id]
+            yield f"path:{directory},resource_type:{resource_type}"
+
+
+def _collapse_tags(
+    manifest: dict, reused: set[str], remaining: dict[str, None]
+) -> Iterator[str]:
+    # `tag:` is not narrowed by resource type, so a tag is only usable when
+    # every resource carrying it, sources and tests included, is reused.
+    tagged: dict[str, list[str]] = defaultdict(list)
+    for key in (*NON_SOURCE_KEYS, "sources"):
+        for unique_id, member in (manifest.get(key) or {}).items():
+            for tag in set(member.get("tags") or []):
+                tagged[tag].append(unique_id)
+    # Greedily take the tags standing in for the most reused nodes first.
+    # Coverage only shrinks as nodes are taken, so a stale count is an upper
+    # bound and a tag only needs recounting when it reaches the top.
+    heap = [
+        (-len(unique_ids), tag)
+        for tag, unique_ids in tagged.items()
+        if _is_safe(tag) and reused.issuperset(unique_ids)
+    ]
+    heapq.heapify(heap)
+    while heap:
+        _, tag = heapq.heappop(heap)
+        covered = [unique_id for unique_id in tagged[tag] if unique_id in remaining]
+        if heap and len(covered) < -heap[0][0]:
+            heapq.heappush(heap, (-len(covered), tag))
+            continue
+        if len(covered) < _MIN_GROUP_SIZE:
+            return
+        for unique_id in covered:
+            del remaining[unique_id]
+        yield f"tag:{tag}"
+
+
+def reused_node_selectors(
+    reused_node_ids: Collection[str], manifest: dict
+) -> list[str]:
+    """
+    Express the reused nodes as dbt selectors (`method:value`, with commas for
+    intersections) that together match those nodes and no other resource in
+    `manifest`.
+
+    To keep the list short for large reuse sets, packages and root project
+    directories whose resources of a type are all reused are selected with
+    `package:` or `path:` (narrowed by `resource_type:`), and tags carried only
+    by reused resources with `tag:`. Each remaining node is selected by its
+    fqn when nothing else shares that fqn as a prefix (e.g. a `models/orders/`
+    folder next to `models/orders.sql`); otherwise the fqn is narrowed by the
+    node's file name and resource type.
+    """
+    members = {
+        unique_id: member
+        for key in NON_SOURCE_KEYS
+        for unique_id, member in (manifest.get(key) or {}).items()
+    }
+    remaining = dict.fromkeys(
+        unique_id
+        for unique_id in reused_node_ids
+        if unique_id in members and _flat_fqn(members[unique_id])
+    )
+    reused = set(remaining)
+    project_name = (manifest.get("metadata") or {}).get("project_name")
+
+    selectors = [
+        *_collapse_packages(members, reused, remaining),
+        *_collapse_directories(members, reused, remaining, project_name),
+        *_collapse_tags(manifest, reused, remaining),
+    ]
+    if not remaining:
+        return selectors
+
+    prefix_counts = Counter(
+        prefix
+        for member in members.values()
+        for prefix in set(_fqn_prefixes(_flat_fqn(member)))
+    )
+    for unique_id in remaining:
+        member = members[unique_id]
+        flat_fqn = _flat_fqn(member)
+        selector = f"fqn:{'.'.join(flat_fqn)}"
+        if prefix_counts[tuple(flat_fqn)] > 1:
+            file_name = PurePosixPath(str(member.get("original_file_path"))).name
+            selector += f",file:{file_name},resource_type:{member['resource_type']}"
+        selectors.append(selector)
+    return selectors
+
+
+def load_reused_node_selectors(
+    reused_node_ids: Collection[str], manifest_path: str = _MANIFEST_PATH
+) -> list[str]:
+    """`reused_node_selectors` against the manifest at `manifest_path`."""
+    selectors = reused_node_selectors(
+        reused_node_ids, load_manifest(manifest_path, _MANIFEST_PROJECTION)
+    )
+    log_debug(
+        f"Excluding {len(reused_node_ids)} reused node(s) with "
+        f"{len(selectors)} selector(s)."
+    )
+    return selectors
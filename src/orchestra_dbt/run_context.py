@@ -0,0 +1,53 @@
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import (
+    OrchestraDbtSettings,
+    load_orchestra_dbt_settings,
+    resolve_state_backend_config,
+)
+from .state_types import StateBackendConfig
+
+
+@dataclass(frozen=True, slots=True)
+class RunContext:
+    """Settings and state backend config, resolved once for a run."""
+
+    cwd: Path
+    settings: OrchestraDbtSettings
+    state_backend_config: StateBackendConfig
+
+
+_lock = threading.Lock()
+_context: RunContext | None = None
+
+
+def get_run_context() -> RunContext:
+    """
+    The `RunContext` for the current working directory. Settings are read from
+    `pyproject.toml` and the environment on first use and then memoized, so
+    call `invalidate_run_context` after changing either (e.g. in tests).
+
+    Raises `ValueError` if `[tool.orchestra_dbt]` is invalid.
+    """
+    global _context
+    cwd = Path.cwd()
+    context = _context
+    if context is not None and context.cwd == cwd:
+        return context
+    with _lock:
+        if _context is None or _context.cwd != cwd:
+            _context = RunContext(
+                cwd=cwd,
+                settings=load_orchestra_dbt_settings(cwd),
+                state_backend_config=resolve_state_backend_config(cwd),
+            )
+        return _context
+
+
+def invalidate_run_context() -> None:
+    """Forget the memoized `RunContext`; the next use resolves it again."""
+    global _context
+    with _lock:
+        _context = None
@@ -1,4 +1,3 @@
-from collections import defaultdict, deque
 from datetime import datetime
 from typing import cast
 
@@ -12,33 +11,21 @@ from .models import (
 )
 
 
-def build_dependency_graphs(
-    dag: ParsedDag,
-) -> tuple[dict[str, list[str]], dict[str, list[str]], dict[str, int]]:
-    """
-    Build dependency graph structures from DAG edges.
-
-    Returns:
-        - children: parent -> list of children (for topological sorting)
-        - parents: child -> list of parents (to know upstream dependencies)
-        - in_degree: node -> number of upstream dependencies
-    """
-    children: dict[str, list[str]] = defaultdict(list)
-    parents: dict[str, list[str]] = defaultdict(list)
-    in_degree: dict[str, int] = defaultdict(int)
-
-    for edge in dag.edges:
-        parent, child = edge.from_, edge.to_
-        children[parent].append(child)
-        parents[child].append(parent)
-        in_degree[child] += 1
+def minutes_since_updated(last_updated: datetime) -> int:
+    return int(
+        (datetime.now(tz=last_updated.tzinfo) - last_updated).total_seconds() / 60
+    )
 
-    # Initialize in_degree for all nodes (nodes with no dependencies will have 0)
-    for node_id in dag.nodes.keys():
-        if node_id not in in_degree:
-            in_degree[node_id] = 0
 
-    return children, parents, in_degree
+def is_within_build_after(node: MaterialisationNode) -> bool:
+    """
+    Whether `node` was last updated inside its `build_after` window, in which
+    case new upstream data does not make it dirty.
+    """
+    minutes_sla = node.freshness_config.minutes_sla
+    if not minutes_sla or not node.last_updated:
+        return False
+    return minutes_since_updated(node.last_updated) < minutes_sla
 
 
 def should_mark_dirty_from_single_upstream(
@@ -78,13 +65,7 @@ def should_mark_dirty_from_single_upstream(
     if not current_node.freshness_config.minutes_sla:
         return upstream_freshness == Freshness.DIRTY, reason
 
-    minutes_since_last_updated: int = int(
-        (
-            datetime.now(tz=current_node.last_updated.tzinfo)
-            - current_node.last_updated
-        ).total_seconds()
-        / 60
-    )
+    minutes_since_last_updated = minutes_since_updated(current_node.last_updated)
 
     if minutes_since_last_updated < current_node.freshness_config.minutes_sla:
         reason = f"Model still within freshness config of {current_node.freshness_config.minutes_sla} minutes. Last updated {minutes_since_last_updated} minutes ago."
@@ -129,9 +110,7 @@ def _should_mark_dirty(
     return should_be_dirty, reason
 
 
-def _process_node(
-    current_id: str, parents: dict[str, list[str]], dag: ParsedDag
-) -> None:
+def _process_node(current_id: str, upstream_ids: list[str], dag: ParsedDag) -> None:
     """
     Process a single node to determine if it should be marked dirty based on upstream dependencies.
     """
@@ -142,7 +121,7 @@ def _process_node(
     materialisation_node: MaterialisationNode = cast(MaterialisationNode, node)
     if materialisation_node.freshness == Freshness.CLEAN:
         should_mark_dirty, reason = _should_mark_dirty(
-            upstream_ids=parents[current_id], node=materialisation_node, dag=dag
+            upstream_ids=upstream_ids, node=materialisation_node, dag=dag
         )
         if should_mark_dirty:
             materialisation_node.freshness = Freshness.DIRTY
@@ -151,31 +130,21 @@ def _process_node(
                 materialisation_node.reason = reason
 
 
-def _enqueue_children(
-    node_id: str,
-    children: dict[str, list[str]],
-    in_degree: dict[str, int],
-    queue: deque[str],
-) -> None:
-    for child in children[node_id]:
-        in_degree[child] -= 1
-        if in_degree[child] == 0:
-            queue.append(child)
-
-
 def calculate_nodes_to_run(dag: ParsedDag):
-    children, parents, in_degree = build_dependency_graphs(dag)
-
-    # Queue for nodes with no upstream dependencies (in_degree 0)
-    queue = deque[str]([n for n in dag.nodes.keys() if in_degree[n] == 0])
-
-    while queue:
-        current = queue.popleft()
-
-        # Process the node to potentially mark it as dirty
-        _process_node(current_id=current, parents=parents, dag=dag)
-
-        # Queue children for processing
-        _enqueue_children(
-            node_id=current, children=children, in_degree=in_degree, queue=queue
+    graph = dag.graph
+
+    # Parents first, so each node sees the final freshness of its upstream nodes
+    for current in graph.topological_order():
+        # Edge endpoints that are not DAG nodes (e.g. disabled or ephemeral
+        # parents) have no record to update or compare against.
+        if current >= graph.node_count or graph.is_source[current]:
+            continue
+        _process_node(
+            current_id=graph.ids[current],
+            upstream_ids=[
+                graph.ids[parent]
+                for parent in graph.parents(current)
+                if parent < graph.node_count
+            ],
+            dag=dag,
         )
@@ -0,0 +1,456 @@
+import os
+import re
+from collections.abc import Iterable, Iterator
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any
+
+from .constants import RESOURCE_TYPES_TO_LS
+from .manifest_reader import Projection
+from .modify import split_selection_args
+
+# Mirrors dbt's `RAW_SELECTOR_PATTERN` (dbt/graph/selector_spec.py).
+_RAW_SELECTOR_PATTERN = re.compile(
+    r"\A"
+    r"(?P<childrens_parents>(\@))?"
+    r"(?P<parents>((?P<parents_depth>(\d*))\+))?"
+    r"((?P<method>([\w.]+)):)?(?P<value>(.*?))"
+    r"(?P<children>(\+(?P<children_depth>(\d*))))?"
+    r"\Z"
+)
+_SUPPORTED_METHODS = frozenset(
+    {"fqn", "tag", "source", "path", "file", "package", "config", "resource_type"}
+)
+# Flags that change which nodes dbt considers; selection is left to `dbt ls`.
+_UNSUPPORTED_FLAGS = frozenset({"--resource-type", "--exclude-resource-type"})
+_SOURCE_KEY = "sources"
+NON_SOURCE_KEYS = (
+    "nodes",
+    "exposures",
+    "metrics",
+    "unit_tests",
+    "semantic_models",
+    "saved_queries",
+    "functions",
+)
+_MEMBER_PROJECTION: Projection = {
+    "fqn": True,
+    "version": True,
+    "tags": True,
+    "original_file_path": True,
+    "patch_path": True,
+    "package_name": True,
+    "source_name": True,
+    "name": True,
+    "config": True,
+    "resource_type": True,
+}
+# The parts of the manifest selection is evaluated against.
+MANIFEST_PROJECTION: Projection = {
+    "metadata": {"project_name": True},
+    "parent_map": True,
+    "child_map": True,
+    "selectors": True,
+    **{key: {"*": _MEMBER_PROJECTION} for key in (*NON_SOURCE_KEYS, _SOURCE_KEY)},
+}
+
+
+class UnsupportedSelectionError(Exception):
+    """The selection uses syntax that only dbt itself can evaluate."""
+
+
+def _probably_path(value: str) -> bool:
+    return os.path.sep in value or (
+        os.path.altsep is not None and os.path.altsep in value
+    )
+
+
+def _default_method(value: str) -> str:
+    if _probably_path(value):
+        return "path"
+    if value.lower().endswith((".sql", ".py", ".csv")):
+        return "file"
+    return "fqn"
+
+
+def _to_depth(raw: Any) -> int | None:
+    if raw in (None, ""):
+        return None
+    try:
+        return int(raw)
+    except (TypeError, ValueError) as e:
+        raise UnsupportedSelectionError(f"Invalid graph operator depth {raw}.") from e
+
+
+def _is_selected_fqn(fqn: list[str], selector: str, is_versioned: bool) -> bool:
+    # Same matching rules as dbt's `is_selected_node`.
+    if is_versioned:
+        flat_selector = selector.split(".")
+        if fqn[-2] == selector:
+            return True
+        if "_".join(fqn[-2:]) == "_".join(flat_selector[-2:]):
+            return True
+    elif fqn and fqn[-1] == selector:
+        return True
+
+    flat_fqn = [item for segment in fqn for item in segment.split(".")]
+    selector_parts = selector.split(".")
+    if len(flat_fqn) < len(selector_parts):
+        return False
+
+    for i, selector_part in enumerate(selector_parts):
+        if any(wildcard in selector_part for wildcard in ("*", "?", "[", "]")):
+            return fnmatch(".".join(flat_fqn[i:]), ".".join(selector_parts[i:]))
+        if flat_fqn[i] != selector_part:
+            return False
+    return True
+
+
+def _config_value_matches(value: Any, selector: Any, case_insensitive: bool) -> bool:
+    def equals(candidate: Any) -> bool:
+        if (
+            case_insensitive
+            and isinstance(candidate, str)
+            and isinstance(selector, str)
+        ):
+            return candidate.upper() == selector.upper()
+        return candidate == selector
+
+    wants_true = isinstance(selector, str) and selector.lower() == "true"
+    wants_false = isinstance(selector, str) and selector.lower() == "false"
+    if isinstance(value, list):
+        return (
+            any(equals(item) for item in value)
+            or (wants_true and True in value)
+            or (wants_false and False in value)
+        )
+    return (
+        equals(value)
+        or (wants_true and value is True)
+        or (wants_false and value is False)
+    )
+
+
+class ManifestSelector:
+    """
+    Evaluates dbt node selection (`--select`, `--exclude`, `--selector` and
+    `selectors.yml` definitions) against a `manifest.json`, without invoking dbt.
+
+    Supports the fqn, tag, source, path, file, package, config and
+    resource_type methods with the `+`, `N+`, `+N` and `@` graph operators.
+    Anything else raises `UnsupportedSelectionError`.
+    """
+
+    def __init__(self, manifest: dict, project_root: Path | None = None) -> None:
+        self._manifest = manifest
+        self._project_root = project_root or Path.cwd()
+        self._parent_map: dict[str, list[str]] = manifest.get("parent_map") or {}
+        self._child_map: dict[str, list[str]] = manifest.get("child_map") or {}
+        self._selectors: dict[str, dict] = manifest.get("selectors") or {}
+        self._project_name = (manifest.get("metadata") or {}).get("project_name")
+
+    def _members(self, keys: Iterable[str]) -> Iterator[tuple[str, dict]]:
+        for key in keys:
+            yield from (self._manifest.get(key) or {}).items()
+
+    def _all_members(self) -> Iterator[tuple[str, dict]]:
+        return self._members((*NON_SOURCE_KEYS, _SOURCE_KEY))
+
+    def select(
+        self,
+        includes: list[str],
+        excludes: list[str],
+        selector_name: str | None = None,
+    ) -> set[str]:
+        """Return the unique_ids of every graph member the selection picks."""
+        if selector_name is not None:
+            return self._select_named(selector_name)
+        if not includes and not excludes:
+            default_selector = next(
+                (
+                    name
+                    for name, selector in self._selectors.items()
+                    if selector.get("default") is True
+                ),
+                None,
+            )
+            if default_selector is not None:
+                return self._select_named(default_selector)
+
+        selected = (
+            self._union_of_cli_items(includes)
+            if includes
+            else {unique_id for unique_id, _ in self._all_members()}
+        )
+        if excludes:
+            selected -= self._union_of_cli_items(excludes)
+        return selected
+
+    def _select_named(self, name: str) -> set[str]:
+        selector = self._selectors.get(name)
+        if selector is None:
+            raise UnsupportedSelectionError(f"Selector `{name}` not found in manifest.")
+        return self._evaluate_definition(selector.get("definition"))
+
+    def _union_of_cli_items(self, items: list[str]) -> set[str]:
+        # Space-separated items are unioned; comma-separated parts intersect.
+        selected: set[str] = set()
+        for item in items:
+            parts = [part for part in item.split(",") if part]
+            if not parts:
+                continue
+            matches = self._evaluate_raw_spec(parts[0])
+            for part in parts[1:]:
+                matches &= self._evaluate_raw_spec(part)
+            selected |= matches
+        return selected
+
+    def _evaluate_definition(self, definition: Any) -> set[str]:
+        if isinstance(definition, str):
+            return self._evaluate_raw_spec(definition)
+        if not isinstance(definition, dict):
+            raise UnsupportedSelectionError(
+                f"Unexpected selector definition: {definition!r}."
+            )
+        if "union" in definition or "intersection" in definition:
+            is_union = "union" in definition
+            include_parts, exclude_part = self._split_set_operands(
+                definition["union" if is_union else "intersection"]
+            )
+            selected: set[str] = set()
+            for i, part in enumerate(include_parts):
+                matches = self._evaluate_definition(part)
+                if i == 0:
+                    selected = matches
+                elif is_union:
+                    selected |= matches
+                else:
+                    selected &= matches
+            if exclude_part is not None:
+                selected -= self._evaluate_exclusions(exclude_part)
+            return selected
+        if len(definition) == 1:
+            method, value = next(iter(definition.items()))
+            return self._evaluate_criteria({"method": method, "value": value})
+        if definition.get("method") == "selector":
+            return self._select_named(str(definition.get("value")))
+        if "method" in definition and "value" in definition:
+            criteria = {k: v for k, v in definition.items() if k != "exclude"}
+            selected = self._evaluate_criteria(criteria)
+            if "exclude" in definition:
+                selected -= self._evaluate_exclusions(definition["exclude"])
+            return selected
+        raise UnsupportedSelectionError(
+            f"Unexpected selector definition: {definition!r}."
+        )
+
+    @staticmethod
+    def _split_set_operands(operands: Any) -> tuple[list[Any], Any]:
+        if not isinstance(operands, list):
+            raise UnsupportedSelectionError(
+                f"Expected a list of selector definitions, got {operands!r}."
+            )
+        include_parts: list[Any] = []
+        exclude_part: Any = None
+        for operand in operands:
+            if isinstance(operand, dict) and "exclude" in operand:
+                exclude_part = operand["exclude"]
+            else:
+                include_parts.append(operand)
+        return include_parts, exclude_part
+
+    def _evaluate_exclusions(self, exclusions: Any) -> set[str]:
+        if not isinstance(exclusions, list):
+            exclusions = [exclusions]
+        excluded: set[str] = set()
+        for exclusion in exclusions:
+            excluded |= self._evaluate_definition(exclusion)
+        return excluded
+
+    def _evaluate_raw_spec(self, raw: str) -> set[str]:
+        match = _RAW_SELECTOR_PATTERN.match(raw)
+        if match is None:
+            raise UnsupportedSelectionError(f"Invalid selector spec `{raw}`.")
+        return self._evaluate_criteria(match.groupdict())
+
+    def _evaluate_criteria(self, criteria: dict[str, Any]) -> set[str]:
+        value = criteria.get("value")
+        raw_method = criteria.get("method")
+        if raw_method is None:
+            if not isinstance(value, str):
+                raise UnsupportedSelectionError(f"Invalid selector value {value!r}.")
+            method, arguments = _default_method(value), []
+        else:
+            method, *arguments = str(raw_method).split(".")
+        if method not in _SUPPORTED_METHODS:
+            raise UnsupportedSelectionError(
+                f"Selection method `{method}` is not supported natively."
+            )
+        if value is None or value == "":
+            raise UnsupportedSelectionError("Selection criteria without a value.")
+
+        selected = set(self._search(method, arguments, value))
+
+        childrens_parents = bool(criteria.get("childrens_parents"))
+        parents = bool(criteria.get("parents"))
+        children = bool(criteria.get("children"))
+        if childrens_parents and children:
+            raise UnsupportedSelectionError(
+                'The "@" prefix and "+" suffix are incompatible.'
+            )
+
+        neighbours: set[str] = set()
+        if childrens_parents:
+            descendants = self._walk(selected, self._child_map, None) | selected
+            neighbours |= self._walk(descendants, self._parent_map, None) | descendants
+        if parents:
+            neighbours |= self._walk(
+                selected, self._parent_map, _to_depth(criteria.get("parents_depth"))
+            )
+        if children:
+            neighbours |= self._walk(
+                selected, self._child_map, _to_depth(criteria.get("children_depth"))
+            )
+        return selected | neighbours
+
+    @staticmethod
+    def _walk(
+        start: set[str], adjacency: dict[str, list[str]], max_depth: int | None
+    ) -> set[str]:
+        found: set[str] = set()
+        frontier = start
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            next_layer = {
+                neighbour
+                for unique_id in frontier
+                for neighbour in adjacency.get(unique_id, ())
+                if neighbour not in found
+            }
+            found |= next_layer
+            frontier = next_layer
+            depth += 1
+        return found
+
+    def _search(self, method: str, arguments: list[str], value: Any) -> Iterator[str]:
+        match method:
+            case "fqn":
+                for unique_id, node in self._members(NON_SOURCE_KEYS):
+                    fqn = node.get("fqn") or []
+                    is_versioned = node.get("version") is not None
+                    if fqn and (
+                        _is_selected_fqn(fqn, str(value), is_versioned)
+                        or _is_selected_fqn(fqn[1:], str(value), is_versioned)
+                    ):
+                        yield unique_id
+            case "tag":
+                for unique_id, node in self._all_members():
+                    if any(fnmatch(tag, str(value)) for tag in node.get("tags") or []):
+                        yield unique_id
+            case "source":
+                yield from self._search_sources(str(value))
+            case "path":
+                yield from self._search_paths(str(value))
+            case "file":
+                for unique_id, node in self._all_members():
+                    original_file_path = Path(node.get("original_file_path") or "")
+                    if fnmatch(original_file_path.name, str(value)) or fnmatch(
+                        original_file_path.stem, str(value)
+                    ):
+                        yield unique_id
+            case "package":
+                package = str(value)
+                if package == "this" and self._project_name is not None:
+                    package = self._project_name
+                for unique_id, node in self._all_members():
+                    if fnmatch(node.get("package_name") or "", package):
+                        yield unique_id
+            case "config":
+                case_insensitive = arguments == ["severity"]
+                for unique_id, node in self._members(("nodes", _SOURCE_KEY)):
+                    config: Any = node.get("config") or {}
+                    for key in arguments:
+                        if not isinstance(config, dict) or key not in config:
+                            break
+                        config = config[key]
+                    else:
+                        if _config_value_matches(config, value, case_insensitive):
+                            yield unique_id
+            case "resource_type":
+                for unique_id, node in self._all_members():
+                    if node.get("resource_type") == value:
+                        yield unique_id
+
+    def _search_sources(self, value: str) -> Iterator[str]:
+        parts = value.split(".")
+        package, table = "*", "*"
+        if len(parts) == 1:
+            source = parts[0]
+        elif len(parts) == 2:
+            source, table = parts
+        elif len(parts) == 3:
+            package, source, table = parts
+        else:
+            raise UnsupportedSelectionError(f"Invalid source selector `{value}`.")
+        for unique_id, node in self._members((_SOURCE_KEY,)):
+            if (
+                fnmatch(node.get("package_name") or "", package)
+                and fnmatch(node.get("source_name") or "", source)
+                and fnmatch(node.get("name") or "", table)
+            ):
+                yield unique_id
+
+    def _search_paths(self, value: str) -> Iterator[str]:
+        try:
+            paths = {
+                path.relative_to(self._project_root)
+                for path in self._project_root.glob(value)
+            }
+        except (NotImplementedError, ValueError) as e:
+            raise UnsupportedSelectionError(f"Invalid path selector `{value}`.") from e
+        for unique_id, node in self._all_members():
+            original_file_path = Path(node.get("original_file_path") or "")
+            patch_path = node.get("patch_path")
+            if (
+                original_file_path in paths
+                or any(parent in paths for parent in original_file_path.parents)
+                or (patch_path and Path(patch_path.split("://", 1)[-1]) in paths)
+            ):
+                yield unique_id
+
+
+def resolve_selection(
+    user_args: tuple[str, ...],
+    manifest: dict,
+    resource_types: Iterable[str] = RESOURCE_TYPES_TO_LS,
+) -> set[str]:
+    """
+    Resolve the nodes a dbt command would select, limited to `resource_types`,
+    as a set of unique_ids. Raises `UnsupportedSelectionError` when the
+    command needs dbt itself to evaluate the selection.
+    """
+    args = list(user_args)
+    selector_name: str | None = None
+    for i, arg in enumerate(args):
+        flag = arg.split("=", 1)[0]
+        if flag in _UNSUPPORTED_FLAGS:
+            raise UnsupportedSelectionError(f"`{flag}` is not supported natively.")
+        if flag == "--selector":
+            if "=" in arg:
+                selector_name = arg.split("=", 1)[1]
+            elif i + 1 < len(args):
+                selector_name = args[i + 1]
+            else:
+                raise UnsupportedSelectionError("`--selector` without a name.")
+
+    _, includes, excludes = split_selection_args(args)
+    selected = ManifestSelector(manifest).select(includes, excludes, selector_name)
+
+    wanted_resource_types = set(resource_types)
+    nodes = manifest.get("nodes") or {}
+    return {
+        unique_id
+        for unique_id in selected
+        if unique_id in nodes
+        and nodes[unique_id].get("resource_type") in wanted_resource_types
+    }
@@ -0,0 +1,130 @@
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from .compatibility import dbt_core_import_error_message
+from .constants import ORCHESTRA_REUSED_NODE
+from .logger import log_debug, log_error, log_info
+from .models import MaterialisationNode
+
+# Flags (taking a value) that change how dbt loads the project and so must be
+# given to the single parse that the whole session shares.
+_PARSE_VALUE_FLAGS = frozenset(
+    {
+        "--target",
+        "-t",
+        "--profile",
+        "--profiles-dir",
+        "--project-dir",
+        "--target-path",
+        "--vars",
+    }
+)
+
+
+def get_args_for_parse(user_args: tuple[str, ...]) -> list[str]:
+    parse_args = ["parse", "-q"]
+    args = list(user_args)
+    for i, arg in enumerate(args):
+        flag = arg.split("=", 1)[0]
+        if flag not in _PARSE_VALUE_FLAGS:
+            continue
+        if "=" in arg:
+            parse_args.append(arg)
+        elif i + 1 < len(args):
+            parse_args.extend([arg, args[i + 1]])
+    return parse_args
+
+
+def exit_code_from_result(result: Any) -> int:
+    """Map a `dbtRunnerResult` to the exit code the dbt CLI would return."""
+    if result.success:
+        return 0
+    return 2 if result.exception is not None else 1
+
+
+@contextmanager
+def _shared_adapter_management() -> Iterator[None]:
+    # dbt resets adapters and closes connections around every invocation. The
+    # session owns that lifecycle instead, so nothing happens per invocation.
+    yield
+
+
+class DbtSession:
+    """
+    A single in-process dbt session.
+
+    The project is parsed once on `open`; every later invocation (`ls`,
+    `source freshness` and the final build/run/test) reuses that in-memory
+    manifest and the same registered adapter and connections.
+    """
+
+    def __init__(self, user_args: tuple[str, ...]) -> None:
+        self._user_args = user_args
+        self._original_adapter_management: Any = None
+        self.manifest: Any = None
+
+    def open(self) -> bool:
+        try:
+            import dbt.cli.requires as dbt_requires
+            from dbt.adapters.factory import reset_adapters
+            from dbt.cli.main import dbtRunner
+        except ImportError as missing_dbt_core_error:
+            log_error(dbt_core_import_error_message(missing_dbt_core_error))
+            raise
+
+        reset_adapters()
+        self._original_adapter_management = dbt_requires.adapter_management  # pyright: ignore[reportPrivateImportUsage]
+        dbt_requires.adapter_management = _shared_adapter_management  # pyright: ignore[reportPrivateImportUsage]
+
+        log_info("Parsing dbt project once for this run.")
+        res = dbtRunner().invoke(get_args_for_parse(self._user_args))
+        if not res.success or res.result is None:
+            log_debug(f"dbt parse failed: {res.exception}")
+            self.close()
+            return False
+
+        self.manifest = res.result
+        return True
+
+    def invoke(self, args: list[str]) -> Any:
+        from dbt.cli.main import dbtRunner
+
+        if self.manifest is None:
+            raise RuntimeError("dbt session is not open.")
+        return dbtRunner(manifest=self.manifest).invoke(args)
+
+    def run(self, cmd: list[str]) -> int:
+        """Run a `dbt ...` command line in the session and return its exit code."""
+        return exit_code_from_result(self.invoke(cmd[1:]))
+
+    def tag_reused_nodes(self, nodes_to_reuse: dict[str, MaterialisationNode]) -> None:
+        """
+        Tag reused nodes on the in-memory manifest (the equivalent of patching
+        their files) so the reused-node exclusion applies without a re-parse.
+        """
+        for node_id, node in nodes_to_reuse.items():
+            manifest_node = self.manifest.nodes.get(node_id)
+            if manifest_node is None:
+                continue
+            log_debug(f"Tagging {node_id} as reused in the session manifest...")
+            meta: dict[str, Any] = {"orchestra_reused_reason": node.reason}
+            if node.freshness_config.minutes_sla is not None:
+                meta["orchestra_freshness"] = node.freshness_config.minutes_sla
+            if node.last_updated:
+                meta["orchestra_last_updated"] = node.last_updated.isoformat()
+            for tags in (manifest_node.tags, manifest_node.config.tags):
+                if ORCHESTRA_REUSED_NODE not in tags:
+                    tags.append(ORCHESTRA_REUSED_NODE)
+            manifest_node.meta.update(meta)
+            manifest_node.config.meta.update(meta)
+
+    def close(self) -> None:
+        if self._original_adapter_management is None:
+            return
+        import dbt.cli.requires as dbt_requires
+        from dbt.adapters.factory import reset_adapters
+
+        dbt_requires.adapter_management = self._original_adapter_management  # pyright: ignore[reportPrivateImportUsage]
+        self._original_adapter_management = None
+        reset_adapters()
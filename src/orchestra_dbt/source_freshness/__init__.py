@@ -4,11 +4,29 @@ from datetime import datetime
 from ..compatibility import dbt_core_import_error_message
 from ..logger import log_error, log_info, log_warn
 from ..models import SourceFreshness
+from ..session import DbtSession
 from ..utils import load_json
-from .fallbacks.registry import FALLBACK_BY_ADAPTER_TYPE, loaded_at_fields_unset
+from .fallbacks.batch import BatchedSourceFreshness
+from .fallbacks.common import build_source_freshness_result_from_loaded_at
+from .fallbacks.registry import (
+    BATCH_FALLBACK_BY_ADAPTER_TYPE,
+    FALLBACK_BY_ADAPTER_TYPE,
+    loaded_at_fields_unset,
+)
+from .scope import selected_source_id
 
 
-def get_source_freshness(target: str | None) -> SourceFreshness | None:
+def get_source_freshness(
+    target: str | None,
+    session: DbtSession | None = None,
+    select: list[str] | None = None,
+    exclude: list[str] | None = None,
+) -> SourceFreshness | None:
+    """
+    Run `dbt source freshness` and read each source's `max_loaded_at`. With
+    `select`, only those sources are queried (an empty list queries none);
+    `exclude` leaves sources out.
+    """
     try:
         from dbt.artifacts.resources.v1.components import FreshnessThreshold
         from dbt.artifacts.schemas.freshness import SourceDefinition
@@ -36,6 +54,12 @@ def get_source_freshness(target: str | None) -> SourceFreshness | None:
             age=0,
         )
 
+    batched = BatchedSourceFreshness(
+        BATCH_FALLBACK_BY_ADAPTER_TYPE,
+        selected=None if select is None else {selected_source_id(s) for s in select},
+        excluded={selected_source_id(s) for s in exclude or []},
+    )
+
     class OrchestraFreshnessRunner(FreshnessRunner):
         def execute(self, compiled_node, manifest) -> SourceFreshnessResult:
             # setting config: freshness: null can impact the execute method
@@ -45,6 +69,15 @@ def get_source_freshness(target: str | None) -> SourceFreshness | None:
                 compiled_node.freshness = FreshnessThreshold()
 
             if loaded_at_fields_unset(compiled_node):
+                max_loaded_at = batched.max_loaded_at(
+                    self.adapter, compiled_node, manifest
+                )
+                if max_loaded_at is not None:
+                    return build_source_freshness_result_from_loaded_at(
+                        max_loaded_at=max_loaded_at,
+                        compiled_node=compiled_node,
+                        adapter_response=None,
+                    )
                 handler = FALLBACK_BY_ADAPTER_TYPE.get(self.adapter.type())
                 if handler:
                     res = handler(self, compiled_node, manifest)
@@ -60,6 +93,10 @@ def get_source_freshness(target: str | None) -> SourceFreshness | None:
                 )
             return default_freshness_result(compiled_node)
 
+    if select is not None and not select:
+        log_info("No sources upstream of the selection. Skipping freshness.")
+        return SourceFreshness(sources={})
+
     log_info("Calculating source freshness")
 
     SourceDefinition.has_freshness = True  # pyright: ignore[reportAttributeAccessIssue]
@@ -69,12 +106,24 @@ def get_source_freshness(target: str | None) -> SourceFreshness | None:
         args: list[str] = ["source", "freshness", "-q"]
         if target:
             args.extend(["--target", target])
-        dbtRunner().invoke(args=args)
+        if select is not None:
+            args.extend(["--select", *select])
+        if exclude:
+            args.extend(["--exclude", *exclude])
+        if session:
+            session.invoke(args)
+        else:
+            dbtRunner().invoke(args=args)
+        results = load_json("target/sources.json")["results"]
         return SourceFreshness(
             sources={
-                source["unique_id"]: source["max_loaded_at"]
-                for source in load_json("target/sources.json")["results"]
-            }
+                source["unique_id"]: source["max_loaded_at"] for source in results
+            },
+            snapshotted_at={
+                source["unique_id"]: source["snapshotted_at"]
+                for source in results
+                if source.get("snapshotted_at")
+            },
         )
     except Exception as e:
         log_warn(f"Error running dbt source freshness: {e}")
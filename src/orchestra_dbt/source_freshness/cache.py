@@ -0,0 +1,145 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytz
+from pydantic import ValidationError
+
+from ..constants import ORCHESTRA_FRESHNESS_TTL_META_KEY
+from ..logger import log_debug, log_warn
+from ..models import CachedSourceFreshness, SourceFreshness, SourceFreshnessCacheFile
+from ..run_context import RunContext
+from ..state_backends import DocumentStore, document_store_beside_state
+from ..state_backends.local_file import LocalFileDocumentStore
+from ..state_errors import StateLoadError, StateSaveError
+
+CACHE_FILE = "source_freshness.json"
+
+
+def _as_utc(value: datetime) -> datetime:
+    return value if value.tzinfo is not None else pytz.UTC.localize(value)
+
+
+def source_ttl_minutes(manifest: dict) -> dict[str, int]:
+    """Per-source TTLs set with `orchestra_freshness_ttl_minutes` in their meta."""
+    ttls: dict[str, int] = {}
+    for source_id, source in (manifest.get("sources") or {}).items():
+        config_meta = (source.get("config") or {}).get("meta") or {}
+        meta = source.get("meta") or {}
+        ttl = config_meta.get(
+            ORCHESTRA_FRESHNESS_TTL_META_KEY, meta.get(ORCHESTRA_FRESHNESS_TTL_META_KEY)
+        )
+        if isinstance(ttl, int) and not isinstance(ttl, bool):
+            ttls[source_id] = ttl
+    return ttls
+
+
+class SourceFreshnessCache:
+    """
+    Each source's last queried `max_loaded_at` and when it was queried, kept in
+    a `DocumentStore`. A source is only queried again once its TTL (from its
+    meta, else `ttl_minutes`) has passed since then. Jobs whose caches share a
+    store share one view of source freshness.
+    """
+
+    def __init__(
+        self,
+        store: DocumentStore,
+        ttl_minutes: int | None,
+        source_ttls: dict[str, int] | None = None,
+    ) -> None:
+        self._store = store
+        self._ttl_minutes = ttl_minutes
+        self._source_ttls = source_ttls or {}
+        self._entries = self._read()
+
+    def _read(self) -> dict[str, CachedSourceFreshness]:
+        try:
+            payload = self._store.read()
+        except StateLoadError as e:
+            log_debug(f"Could not read the source freshness cache: {e}")
+            return {}
+        if payload is None:
+            return {}
+        try:
+            return SourceFreshnessCacheFile.model_validate_json(payload).sources
+        except (ValidationError, ValueError) as e:
+            log_debug(f"Ignoring an invalid source freshness cache: {e}")
+            return {}
+
+    def _ttl(self, source_id: str) -> int | None:
+        return self._source_ttls.get(source_id, self._ttl_minutes)
+
+    def fresh_sources(self, now: datetime | None = None) -> dict[str, datetime]:
+        """The cached `max_loaded_at` of every source still within its TTL."""
+        now = now or datetime.now(pytz.UTC)
+        fresh: dict[str, datetime] = {}
+        for source_id, entry in self._entries.items():
+            ttl = self._ttl(source_id)
+            if not ttl or ttl <= 0:
+                continue
+            if now - _as_utc(entry.snapshotted_at) < timedelta(minutes=ttl):
+                fresh[source_id] = entry.max_loaded_at
+        return fresh
+
+    def update(self, source_freshness: SourceFreshness) -> None:
+        """
+        Record the sources `source_freshness` queried. The store is read again
+        first, so entries written by concurrent jobs are kept unless older.
+        """
+        queried = {
+            source_id: CachedSourceFreshness(
+                max_loaded_at=max_loaded_at,
+                snapshotted_at=source_freshness.snapshotted_at[source_id],
+            )
+            for source_id, max_loaded_at in source_freshness.sources.items()
+            if source_id in source_freshness.snapshotted_at
+        }
+        if not queried:
+            return
+        entries = self._read()
+        for source_id, entry in queried.items():
+            current = entries.get(source_id)
+            if current is None or _as_utc(current.snapshotted_at) <= _as_utc(
+                entry.snapshotted_at
+            ):
+                entries[source_id] = entry
+        try:
+            self._store.write(
+                SourceFreshnessCacheFile(sources=entries)
+                .model_dump_json()
+                .encode("utf-8")
+            )
+        except StateSaveError as e:
+            log_warn(f"Could not save the source freshness cache: {e}")
+            return
+        self._entries = entries
+
+
+def open_source_freshness_cache(
+    context: RunContext, manifest: dict
+) -> SourceFreshnessCache | None:
+    """
+    The cache configured for this run, or `None` when no source has a TTL.
+    With `source_freshness_cache = "state"` it lives next to the state, and
+    otherwise (or for the Orchestra HTTP backend) in `cache_dir`.
+    """
+    settings = context.settings
+    source_ttls = source_ttl_minutes(manifest)
+    if settings.source_freshness_ttl_minutes is None and not source_ttls:
+        return None
+
+    store: DocumentStore | None = None
+    if settings.source_freshness_cache == "state":
+        try:
+            store = document_store_beside_state(
+                context.state_backend_config, CACHE_FILE
+            )
+        except ImportError as e:
+            log_warn(f"Could not keep the source freshness cache with the state: {e}")
+        if store is None:
+            log_debug("Keeping the source freshness cache in cache_dir.")
+    if store is None:
+        store = LocalFileDocumentStore(Path(settings.cache_dir) / CACHE_FILE)
+    return SourceFreshnessCache(
+        store, settings.source_freshness_ttl_minutes, source_ttls
+    )
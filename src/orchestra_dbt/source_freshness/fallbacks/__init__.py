@@ -1,11 +1,15 @@
+from .batch import BatchedSourceFreshness
 from .registry import (
+    BATCH_FALLBACK_BY_ADAPTER_TYPE,
     FALLBACK_BY_ADAPTER_TYPE,
     loaded_at_fields_unset,
     try_registered_fallback,
 )
 
 __all__ = [
+    "BATCH_FALLBACK_BY_ADAPTER_TYPE",
     "FALLBACK_BY_ADAPTER_TYPE",
+    "BatchedSourceFreshness",
     "loaded_at_fields_unset",
     "try_registered_fallback",
 ]
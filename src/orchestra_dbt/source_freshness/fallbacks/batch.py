@@ -0,0 +1,98 @@
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Collection
+from datetime import datetime
+from typing import Any
+
+from ...logger import log_info, log_warn
+from .registry import loaded_at_fields_unset
+
+# Returns the last-modified time of each of a schema's sources, keyed by
+# `unique_id`, with as few queries as the adapter allows.
+BatchFreshnessProvider = Callable[[Any, list[Any]], dict[str, datetime]]
+
+
+def _schema_key(compiled_node: Any) -> tuple[str | None, str]:
+    return (compiled_node.database, compiled_node.schema)
+
+
+class BatchedSourceFreshness:
+    """
+    Last-modified timestamps for sources without `loaded_at_*`, fetched one
+    schema at a time the first time any of its sources is asked for. Freshness
+    runs sources on several threads, so each schema is queried once and shared.
+    Only the sources in `selected` (every source when `None`) and not in
+    `excluded` are queried, as in the freshness invocation itself.
+    """
+
+    def __init__(
+        self,
+        provider_by_adapter_type: dict[str, BatchFreshnessProvider],
+        selected: Collection[str] | None = None,
+        excluded: Collection[str] = (),
+    ) -> None:
+        self._provider_by_adapter_type = provider_by_adapter_type
+        self._selected = selected
+        self._excluded = excluded
+        self._lock = threading.Lock()
+        self._schema_locks: dict[tuple[str | None, str], threading.Lock] = defaultdict(
+            threading.Lock
+        )
+        self._by_schema: dict[tuple[str | None, str], dict[str, datetime]] = {}
+
+    def max_loaded_at(
+        self, adapter: Any, compiled_node: Any, manifest: Any
+    ) -> datetime | None:
+        """`compiled_node`'s last-modified time, or `None` to query it alone."""
+        provider = self._provider_by_adapter_type.get(adapter.type())
+        if provider is None:
+            return None
+        key = _schema_key(compiled_node)
+        with self._lock:
+            schema_lock = self._schema_locks[key]
+        with schema_lock:
+            if key not in self._by_schema:
+                self._by_schema[key] = self._fetch(
+                    adapter, provider, key, compiled_node, manifest
+                )
+        return self._by_schema[key].get(compiled_node.unique_id)
+
+    def _is_selected(self, unique_id: str) -> bool:
+        return (
+            self._selected is None or unique_id in self._selected
+        ) and unique_id not in self._excluded
+
+    def _fetch(
+        self,
+        adapter: Any,
+        provider: BatchFreshnessProvider,
+        key: tuple[str | None, str],
+        compiled_node: Any,
+        manifest: Any,
+    ) -> dict[str, datetime]:
+        from dbt_common.exceptions import DbtRuntimeError
+
+        compiled_nodes = [
+            source
+            for source in manifest.sources.values()
+            if source.unique_id != compiled_node.unique_id
+            and self._is_selected(source.unique_id)
+            and _schema_key(source) == key
+            and loaded_at_fields_unset(source)
+        ]
+        compiled_nodes.append(compiled_node)
+        schema_name = ".".join(part for part in key if part)
+        log_info(
+            f"Using one batched query for the freshness of {len(compiled_nodes)} "
+            f"source(s) in {schema_name}"
+        )
+        try:
+            return provider(adapter, compiled_nodes)
+        # Adapters raise database errors as DbtRuntimeError subclasses; anything
+        # else is a bug in the provider.
+        except DbtRuntimeError as e:
+            log_warn(
+                f"Batched freshness query failed for {schema_name}: {e}. "
+                "Querying its sources one at a time."
+            )
+            return {}
@@ -0,0 +1,24 @@
+from datetime import datetime
+from typing import Any
+
+from .common import fetch_catalog_freshness
+
+
+def bigquery_last_modified_query(database: str | None, schema: str) -> str:
+    """`last_modified_time` for every table in the `schema` dataset."""
+    dataset = f"`{database}`.`{schema}`" if database else f"`{schema}`"
+    return (
+        "select table_id, timestamp_millis(last_modified_time) "
+        f"from {dataset}.__TABLES__"
+    )
+
+
+def bigquery_last_modified(
+    adapter: Any, compiled_nodes: list[Any]
+) -> dict[str, datetime]:
+    first = compiled_nodes[0]
+    return fetch_catalog_freshness(
+        adapter,
+        bigquery_last_modified_query(first.database, first.schema),
+        compiled_nodes,
+    )
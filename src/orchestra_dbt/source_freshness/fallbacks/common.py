@@ -1,4 +1,5 @@
 import threading
+from collections import defaultdict
 from datetime import datetime
 from typing import Any
 
@@ -56,3 +57,37 @@ def build_source_freshness_result_from_loaded_at(
         snapshotted_at=snapshotted_at,
         age=age,
     )
+
+
+def sql_string_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def execute_freshness_query(adapter: Any, sql: str, compiled_node: Any) -> list[Any]:
+    with adapter.connection_named(compiled_node.unique_id, compiled_node):
+        adapter.clear_transaction()
+        _, table = adapter.execute(sql=sql, auto_begin=False, fetch=True)
+    return list(table.rows) if table else []
+
+
+def fetch_catalog_freshness(
+    adapter: Any, sql: str, compiled_nodes: list[Any]
+) -> dict[str, datetime]:
+    """
+    Run `sql`, a catalog query returning `(table name, last modified)` rows,
+    and map them onto `compiled_nodes`. Table names match case-insensitively;
+    sources the catalog does not list are left out.
+    """
+    by_table: dict[str, list[str]] = defaultdict(list)
+    for compiled_node in compiled_nodes:
+        table_name = compiled_node.identifier or compiled_node.name
+        by_table[table_name.casefold()].append(compiled_node.unique_id)
+
+    loaded_at: dict[str, datetime] = {}
+    for row in execute_freshness_query(adapter, sql, compiled_nodes[0]):
+        table_name, timestamp_value = row[0], row[1]
+        if table_name is None or timestamp_value is None:
+            continue
+        for unique_id in by_table.get(str(table_name).casefold(), []):
+            loaded_at[unique_id] = parse_query_timestamp_cell(timestamp_value)
+    return loaded_at
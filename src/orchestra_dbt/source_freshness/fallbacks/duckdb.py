@@ -0,0 +1,80 @@
+from datetime import datetime
+from typing import Any
+
+from ...logger import log_warn
+from .common import (
+    execute_freshness_query,
+    parse_query_timestamp_cell,
+    sql_string_literal,
+)
+
+# dbt-duckdb reads file-backed sources from this meta key, e.g.
+# `external_location: "data/{name}.parquet"`.
+EXTERNAL_LOCATION_META_KEY = "external_location"
+
+
+def _external_location(compiled_node: Any) -> str | None:
+    """
+    The files behind an external source, or `None` for native tables and for
+    locations that are table function calls (e.g. `read_csv(...)`).
+    """
+    config = getattr(compiled_node, "config", None)
+    meta = {
+        **(getattr(compiled_node, "source_meta", None) or {}),
+        **(getattr(compiled_node, "meta", None) or {}),
+        **(getattr(config, "meta", None) or {}),
+    }
+    template = meta.get(EXTERNAL_LOCATION_META_KEY)
+    if not isinstance(template, str) or "(" in template:
+        return None
+    try:
+        return template.format(
+            name=compiled_node.name,
+            identifier=compiled_node.identifier,
+            schema=compiled_node.schema,
+            database=compiled_node.database,
+        )
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+def duckdb_last_modified(
+    adapter: Any, compiled_nodes: list[Any]
+) -> dict[str, datetime]:
+    """
+    External sources get the newest `last_modified` of their files through
+    `read_blob`, which does not read file contents; one query covers all of
+    them. DuckDB keeps no per-table modification times, so native tables (and
+    external sources read through a table function) are left out.
+    """
+    locations: dict[str, str] = {}
+    unresolved: list[str] = []
+    for compiled_node in compiled_nodes:
+        location = _external_location(compiled_node)
+        if location is None:
+            unresolved.append(compiled_node.unique_id)
+        else:
+            locations[compiled_node.unique_id] = location
+    if unresolved:
+        log_warn(
+            "DuckDB has no last-modified time for native tables, or for external "
+            "sources read through a table function. Set loaded_at_field or "
+            "loaded_at_query for: " + ", ".join(sorted(unresolved))
+        )
+    if not locations:
+        return {}
+
+    rows = execute_freshness_query(
+        adapter,
+        " union all ".join(
+            f"select {sql_string_literal(unique_id)}, max(last_modified) "
+            f"from read_blob({sql_string_literal(location)})"
+            for unique_id, location in locations.items()
+        ),
+        compiled_nodes[0],
+    )
+    return {
+        unique_id: parse_query_timestamp_cell(timestamp_value)
+        for unique_id, timestamp_value in rows
+        if timestamp_value is not None
+    }
@@ -1,12 +1,26 @@
 from collections.abc import Callable
+from datetime import datetime
 from typing import Any
 
+from .bigquery import bigquery_last_modified
 from .databricks import try_databricks_fallback
+from .duckdb import duckdb_last_modified
+from .snowflake import snowflake_last_altered
 
 FALLBACK_BY_ADAPTER_TYPE: dict[str, Callable[..., Any]] = {
     "databricks": try_databricks_fallback,
 }
 
+# Adapters that can report every table's last-modified time for a whole schema
+# of sources in one query (see `batch.py`).
+BATCH_FALLBACK_BY_ADAPTER_TYPE: dict[
+    str, Callable[[Any, list[Any]], dict[str, datetime]]
+] = {
+    "bigquery": bigquery_last_modified,
+    "duckdb": duckdb_last_modified,
+    "snowflake": snowflake_last_altered,
+}
+
 
 def loaded_at_fields_unset(compiled_node: Any) -> bool:
     return (
@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Any
+
+from .common import fetch_catalog_freshness, sql_string_literal
+
+
+def snowflake_last_altered_query(database: str | None, schema: str) -> str:
+    """
+    `last_altered` for every table in `schema`. It also moves on DDL, so a
+    table can look newer than its data, never older.
+    """
+    tables = (
+        f"{database}.information_schema.tables"
+        if database
+        else "information_schema.tables"
+    )
+    return (
+        f"select table_name, last_altered from {tables} "
+        f"where upper(table_schema) = upper({sql_string_literal(schema)})"
+    )
+
+
+def snowflake_last_altered(
+    adapter: Any, compiled_nodes: list[Any]
+) -> dict[str, datetime]:
+    first = compiled_nodes[0]
+    return fetch_catalog_freshness(
+        adapter,
+        snowflake_last_altered_query(first.database, first.schema),
+        compiled_nodes,
+    )
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import cast
+
+from ..models import Freshness, MaterialisationNode, NodeType, ParsedDag
+from ..sao import is_within_build_after
+
+
+def _cannot_rebuild(node_id: str, parsed_dag: ParsedDag) -> bool:
+    node = parsed_dag.nodes.get(node_id)
+    if node is None or node.node_type != NodeType.MATERIALISATION:
+        return False
+    materialisation_node = cast(MaterialisationNode, node)
+    return materialisation_node.freshness == Freshness.CLEAN and is_within_build_after(
+        materialisation_node
+    )
+
+
+def plan_source_freshness(parsed_dag: ParsedDag) -> dict[str, datetime]:
+    """
+    The sources not worth querying this run, each mapped to its last known
+    `max_loaded_at` from state.
+
+    `parsed_dag` is built from state before source freshness, with its
+    `build_after` configs propagated. A source is skipped when it has
+    dependents and every one of them is unchanged since its last run, still
+    inside its `build_after` window (so none of them can rebuild, whatever the
+    source holds) and recorded the source's `max_loaded_at` in state. Sources
+    nothing reads, or that state has no record of, are queried.
+    """
+    graph = parsed_dag.graph
+    skipped: dict[str, datetime] = {}
+    for index in range(graph.node_count):
+        if not graph.is_source[index]:
+            continue
+        node_id = graph.ids[index]
+        child_ids = graph.child_ids(index)
+        if not child_ids or not all(
+            _cannot_rebuild(child_id, parsed_dag) for child_id in child_ids
+        ):
+            continue
+        last_known = [
+            recorded
+            for child_id in child_ids
+            if (
+                recorded := cast(
+                    MaterialisationNode, parsed_dag.nodes[child_id]
+                ).sources.get(node_id)
+            )
+            is not None
+        ]
+        if len(last_known) == len(child_ids):
+            skipped[node_id] = max(last_known)
+    return skipped
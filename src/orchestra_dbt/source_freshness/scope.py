@@ -0,0 +1,87 @@
+from collections.abc import Iterable
+
+from ..constants import ORCHESTRA_FRESHNESS_TTL_META_KEY
+from ..manifest_reader import Projection
+
+_SOURCE_NAME_KEYS = ("package_name", "source_name", "name")
+_TTL_META: Projection = {"meta": {ORCHESTRA_FRESHNESS_TTL_META_KEY: True}}
+# The parts of the manifest needed to find the sources upstream of a selection
+# (and their freshness cache TTLs).
+SCOPE_PROJECTION: Projection = {
+    "parent_map": True,
+    "sources": {
+        "*": {
+            **{key: True for key in _SOURCE_NAME_KEYS},
+            **_TTL_META,
+            "config": _TTL_META,
+        }
+    },
+}
+
+
+# The resource types a dbt command executes, for commands that run only some of
+# the selection resolved over `RESOURCE_TYPES_TO_LS`.
+_COMMAND_RESOURCE_TYPES: dict[str, frozenset[str]] = {
+    "run": frozenset({"model"}),
+    "seed": frozenset({"seed"}),
+}
+
+
+def _source_selector(unique_id: str, source: dict | None) -> str:
+    if source and all(source.get(key) for key in _SOURCE_NAME_KEYS):
+        return "source:" + ".".join(source[key] for key in _SOURCE_NAME_KEYS)
+    return f"source:{unique_id.removeprefix('source.')}"
+
+
+def selected_source_id(selector: str) -> str:
+    """The `unique_id` of the source a `source_selectors` selector picks."""
+    return "source." + selector.removeprefix("source:")
+
+
+def upstream_source_ids(node_ids: Iterable[str], manifest: dict) -> set[str]:
+    """Every source that is an ancestor of `node_ids` in the manifest's `parent_map`."""
+    parent_map: dict[str, list[str]] = manifest.get("parent_map") or {}
+
+    seen: set[str] = set()
+    stack = list(node_ids)
+    source_ids: set[str] = set()
+    while stack:
+        node_id = stack.pop()
+        for parent_id in parent_map.get(node_id, []):
+            if parent_id in seen:
+                continue
+            seen.add(parent_id)
+            if parent_id.startswith("source."):
+                source_ids.add(parent_id)
+            else:
+                stack.append(parent_id)
+    return source_ids
+
+
+def command_node_ids(
+    command: str, node_ids: set[str] | None, manifest: dict
+) -> set[str] | None:
+    """
+    The nodes of `node_ids` (every node in the manifest when `None`) that
+    `command` executes, or `node_ids` unchanged for commands that execute all
+    of them.
+    """
+    resource_types = _COMMAND_RESOURCE_TYPES.get(command)
+    if resource_types is None:
+        return node_ids
+    if node_ids is None:
+        node_ids = set(manifest.get("parent_map") or {})
+    return {
+        node_id for node_id in node_ids if node_id.split(".", 1)[0] in resource_types
+    }
+
+
+def source_selectors(source_ids: Iterable[str], manifest: dict) -> list[str]:
+    """
+    A `source:` selector for each of `source_ids`, sorted so the freshness
+    invocation is stable.
+    """
+    sources: dict[str, dict] = manifest.get("sources") or {}
+    return sorted(
+        _source_selector(source_id, sources.get(source_id)) for source_id in source_ids
+    )
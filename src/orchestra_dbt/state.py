@@ -1,8 +1,9 @@
 from datetime import datetime
-from functools import lru_cache
 from typing import cast
 
-from .state_backends import resolved_state_backend
+from .checksum import DEFAULT_SEED_CHECKSUM_ALGORITHM
+from .run_context import get_run_context
+from .state_backends import state_backend_from_config
 from .state_errors import StateLoadError, StateSaveError
 from .logger import log_warn
 
@@ -22,60 +23,66 @@ from .models import (
     StateApiModel,
     StateItem,
 )
-from .utils import load_json
+from .run_results import RunResult, load_run_results
 
 
 def load_state() -> StateApiModel:
-    return resolved_state_backend().load()
+    return state_backend_from_config(get_run_context().state_backend_config).load()
 
 
 def save_state(state: StateApiModel) -> None:
-    resolved_state_backend().save(state)
+    state_backend_from_config(get_run_context().state_backend_config).save(state)
 
 
-@lru_cache
-def _load_run_results() -> dict:
-    try:
-        return load_json(path="target/run_results.json")
-    except FileNotFoundError:
-        return {}
-
-
-def get_last_updated_from_run_results(node_id: str) -> datetime | None:
-    try:
-        for r in _load_run_results().get("results", []):
-            if r["unique_id"] == node_id and r["status"] == "success":
-                return r["timing"][-1]["completed_at"]
-    except Exception as e:
-        log_warn(f"Failed to get last updated from run results for '{node_id}': {e}")
-    return None
+def get_last_updated_from_run_results(
+    node_id: str, run_results: dict[str, RunResult]
+) -> datetime | None:
+    result = run_results.get(node_id)
+    if result is None or result.status != "success":
+        return None
+    return result.completed_at
 
 
 def update_state(
-    state: StateApiModel, parsed_dag: ParsedDag, source_freshness: SourceFreshness
+    state: StateApiModel,
+    parsed_dag: ParsedDag,
+    source_freshness: SourceFreshness,
+    run_results: dict[str, RunResult] | None = None,
 ) -> None:
+    if run_results is None:
+        try:
+            run_results = load_run_results()
+        except ValueError as e:
+            log_warn(f"Failed to read run results: {e}")
+            run_results = {}
+
     for node_id, node in parsed_dag.nodes.items():
         if node.node_type == NodeType.SOURCE:
             continue
 
         materialisation_node: MaterialisationNode = cast(MaterialisationNode, node)
-        last_updated_from_run_results = get_last_updated_from_run_results(node_id)
+        last_updated_from_run_results = get_last_updated_from_run_results(
+            node_id, run_results
+        )
         if not last_updated_from_run_results:
             continue
 
-        sources_dict: dict[str, datetime] = {}
-        for edge in parsed_dag.edges:
-            if edge.to_ == node_id:
-                if edge.from_ in parsed_dag.nodes:
-                    parent_node = parsed_dag.nodes[edge.from_]
-                    if (
-                        parent_node.node_type == NodeType.SOURCE
-                        and edge.from_ in source_freshness.sources
-                    ):
-                        sources_dict[edge.from_] = source_freshness.sources[edge.from_]
+        sources_dict: dict[str, datetime] = {
+            source_id: source_freshness.sources[source_id]
+            for source_id in parsed_dag.source_parent_ids(node_id)
+            if source_id in source_freshness.sources
+        }
 
         state.state[materialisation_node.asset_external_id] = StateItem(
             checksum=materialisation_node.checksum,
+            # The default is left implicit, so state without seeds hashed by
+            # another algorithm keeps the format it has always had.
+            checksum_algorithm=(
+                None
+                if materialisation_node.checksum_algorithm
+                == DEFAULT_SEED_CHECKSUM_ALGORITHM
+                else materialisation_node.checksum_algorithm
+            ),
             last_updated=last_updated_from_run_results,
             sources=sources_dict,
         )
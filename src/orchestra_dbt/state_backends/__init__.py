@@ -1,8 +1,16 @@
-from .base import StateBackend
-from .factory import resolve_state_backend_config, resolved_state_backend
+from .base import DocumentStore, StateBackend
+from .factory import (
+    document_store_beside_state,
+    resolve_state_backend_config,
+    resolved_state_backend,
+    state_backend_from_config,
+)
 
 __all__ = [
+    "DocumentStore",
     "StateBackend",
+    "document_store_beside_state",
     "resolve_state_backend_config",
     "resolved_state_backend",
+    "state_backend_from_config",
 ]
@@ -1,7 +1,12 @@
 import json
 import os
 
-from azure.core.exceptions import ClientAuthenticationError, HttpResponseError, ResourceNotFoundError
+from azure.core.exceptions import (
+    AzureError,
+    ClientAuthenticationError,
+    HttpResponseError,
+    ResourceNotFoundError,
+)
 from azure.identity import DefaultAzureCredential
 from azure.storage.blob import BlobServiceClient, ContentSettings
 from pydantic import ValidationError
@@ -102,9 +107,7 @@ class AzureStateBackend:
         try:
             state = StateApiModel.model_validate(data)
         except (ValidationError, ValueError) as e:
-            raise StateLoadError(
-                f"State blob at {uri} failed validation: {e}"
-            ) from e
+            raise StateLoadError(f"State blob at {uri} failed validation: {e}") from e
 
         apply_integration_account_filter(state)
         log_state_loaded("azure", state)
@@ -146,3 +149,48 @@ class AzureStateBackend:
             raise StateSaveError(f"Failed to save state to {uri}: {e}") from e
 
         log_state_saved("azure")
+
+
+class AzureDocumentStore:
+    def __init__(self, account: str, container: str, key: str) -> None:
+        # Shares the state backend's client setup and its account check.
+        self._backend = AzureStateBackend(account, container, key)
+        self._container = container
+        self._key = key
+
+    def read(self) -> bytes | None:
+        uri = (
+            f"abfss://{self._container}@{self._backend._account}"
+            f".dfs.core.windows.net/{self._key}"
+        )
+        try:
+            client = self._backend._get_client()
+            blob_client = client.get_blob_client(
+                container=self._container, blob=self._key
+            )
+            return blob_client.download_blob().readall()
+        except ResourceNotFoundError:
+            return None
+        # `_get_client` raises ValueError for a mismatched connection string.
+        except (AzureError, ValueError, OSError) as e:
+            raise StateLoadError(f"Failed to read {uri}: {e}") from e
+
+    def write(self, payload: bytes) -> None:
+        uri = (
+            f"abfss://{self._container}@{self._backend._account}"
+            f".dfs.core.windows.net/{self._key}"
+        )
+        try:
+            client = self._backend._get_client()
+            blob_client = client.get_blob_client(
+                container=self._container, blob=self._key
+            )
+            blob_client.upload_blob(
+                payload,
+                overwrite=True,
+                content_settings=ContentSettings(
+                    content_type="application/json; charset=utf-8"
+                ),
+            )
+        except (AzureError, ValueError, OSError) as e:
+            raise StateSaveError(f"Failed to write {uri}: {e}") from e
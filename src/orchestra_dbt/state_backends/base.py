@@ -7,3 +7,17 @@ class StateBackend(Protocol):
     def load(self) -> StateApiModel: ...
 
     def save(self, state: StateApiModel) -> None: ...
+
+
+class DocumentStore(Protocol):
+    """
+    A single document kept next to the state, e.g. the source freshness cache.
+    Like the state backends, stores raise `StateLoadError` when a read fails
+    and `StateSaveError` when a write does.
+    """
+
+    def read(self) -> bytes | None:
+        """The stored bytes, or `None` if nothing has been written yet."""
+        ...
+
+    def write(self, payload: bytes) -> None: ...
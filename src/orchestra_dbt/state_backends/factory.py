@@ -1,3 +1,4 @@
+import posixpath
 from pathlib import Path
 
 from ..config import (
@@ -11,9 +12,9 @@ from ..state_types import (
     StateBackendKind,
     backend_config_from_state_location,
 )
-from .base import StateBackend
+from .base import DocumentStore, StateBackend
 from .http import HttpStateBackend
-from .local_file import LocalFileStateBackend
+from .local_file import LocalFileDocumentStore, LocalFileStateBackend
 
 
 def resolve_state_backend_config(cwd: Path | None = None) -> StateBackendConfig:
@@ -42,7 +43,10 @@ def resolve_state_backend_config(cwd: Path | None = None) -> StateBackendConfig:
 
 
 def resolved_state_backend(cwd: Path | None = None) -> StateBackend:
-    cfg = resolve_state_backend_config(cwd)
+    return state_backend_from_config(resolve_state_backend_config(cwd))
+
+
+def state_backend_from_config(cfg: StateBackendConfig) -> StateBackend:
     match cfg.kind:
         case StateBackendKind.HTTP:
             return HttpStateBackend()
@@ -71,8 +75,60 @@ def resolved_state_backend(cwd: Path | None = None) -> StateBackend:
         case StateBackendKind.AZURE:
             from .azure import AzureStateBackend
 
-            if cfg.azure_account is None or cfg.azure_container is None or cfg.azure_key is None:
+            if (
+                cfg.azure_account is None
+                or cfg.azure_container is None
+                or cfg.azure_key is None
+            ):
                 raise RuntimeError(
                     "State backend config is AZURE but azure_account, azure_container, or azure_key is missing"
                 )
-            return AzureStateBackend(cfg.azure_account, cfg.azure_container, cfg.azure_key)
+            return AzureStateBackend(
+                cfg.azure_account, cfg.azure_container, cfg.azure_key
+            )
+
+
+def document_store_beside_state(
+    cfg: StateBackendConfig, name: str
+) -> DocumentStore | None:
+    """
+    A store for the document `name` in the same directory (or bucket prefix)
+    as the state, or `None` for the Orchestra HTTP backend.
+    """
+    match cfg.kind:
+        case StateBackendKind.HTTP:
+            return None
+        case StateBackendKind.LOCAL_FILE:
+            if cfg.local_path is None:
+                return None
+            return LocalFileDocumentStore(cfg.local_path.parent / name)
+        case StateBackendKind.S3:
+            from .s3 import S3DocumentStore
+
+            if cfg.s3_bucket is None or cfg.s3_key is None:
+                return None
+            return S3DocumentStore(
+                cfg.s3_bucket, posixpath.join(posixpath.dirname(cfg.s3_key), name)
+            )
+        case StateBackendKind.GCS:
+            from .gcs import GCSDocumentStore
+
+            if cfg.gcs_bucket is None or cfg.gcs_key is None:
+                return None
+            return GCSDocumentStore(
+                cfg.gcs_bucket, posixpath.join(posixpath.dirname(cfg.gcs_key), name)
+            )
+        case StateBackendKind.AZURE:
+            from .azure import AzureDocumentStore
+
+            if (
+                cfg.azure_account is None
+                or cfg.azure_container is None
+                or cfg.azure_key is None
+            ):
+                return None
+            return AzureDocumentStore(
+                cfg.azure_account,
+                cfg.azure_container,
+                posixpath.join(posixpath.dirname(cfg.azure_key), name),
+            )
@@ -1,7 +1,12 @@
 import json
 
-from google.api_core.exceptions import Forbidden, NotFound, Unauthorized
-from google.auth.exceptions import DefaultCredentialsError
+from google.api_core.exceptions import (
+    Forbidden,
+    GoogleAPIError,
+    NotFound,
+    Unauthorized,
+)
+from google.auth.exceptions import DefaultCredentialsError, GoogleAuthError
 from google.cloud import storage
 from pydantic import ValidationError
 
@@ -98,7 +103,9 @@ class GCSStateBackend:
         payload = state.model_dump_json(exclude_none=True)
         try:
             blob = client.bucket(bucket).blob(key)
-            blob.upload_from_string(payload, content_type="application/json; charset=utf-8")
+            blob.upload_from_string(
+                payload, content_type="application/json; charset=utf-8"
+            )
         except (Forbidden, Unauthorized) as e:
             raise StateSaveError(
                 f"Permission denied writing gs://{bucket}/{key}. "
@@ -110,3 +117,29 @@ class GCSStateBackend:
             ) from e
 
         log_state_saved("gcs")
+
+
+class GCSDocumentStore:
+    def __init__(self, bucket: str, key: str) -> None:
+        self._bucket = bucket
+        self._key = key
+
+    def read(self) -> bytes | None:
+        uri = f"gs://{self._bucket}/{self._key}"
+        try:
+            blob = storage.Client().bucket(self._bucket).blob(self._key)
+            return blob.download_as_bytes()
+        except NotFound:
+            return None
+        except (GoogleAPIError, GoogleAuthError, OSError) as e:
+            raise StateLoadError(f"Failed to read {uri}: {e}") from e
+
+    def write(self, payload: bytes) -> None:
+        uri = f"gs://{self._bucket}/{self._key}"
+        try:
+            blob = storage.Client().bucket(self._bucket).blob(self._key)
+            blob.upload_from_string(
+                payload, content_type="application/json; charset=utf-8"
+            )
+        except (GoogleAPIError, GoogleAuthError, OSError) as e:
+            raise StateSaveError(f"Failed to write {uri}: {e}") from e
@@ -3,16 +3,17 @@ import json
 import httpx
 from pydantic import ValidationError
 
-from ..config import get_orchestra_api_key, load_orchestra_dbt_settings
+from ..config import get_orchestra_api_key
 from ..logger import log_error, log_warn
 from ..models import StateApiModel
+from ..run_context import get_run_context
 from ..state_filters import apply_integration_account_filter
 from .logging import log_state_loaded, log_state_saved
 
 
 class HttpStateBackend:
     def _base_api_url(self) -> str:
-        env_name = load_orchestra_dbt_settings().orchestra_env
+        env_name = get_run_context().settings.orchestra_env
         return f"https://{env_name}.getorchestra.io/api/engine/public"
 
     def _headers(self) -> dict[str, str]:
@@ -8,6 +8,7 @@ from pydantic import ValidationError
 from ..models import StateApiModel
 from ..state_errors import StateLoadError, StateSaveError
 from ..state_filters import apply_integration_account_filter
+from ..utils import write_bytes_atomically
 from .logging import log_state_loaded, log_state_saved
 
 
@@ -54,3 +55,23 @@ class LocalFileStateBackend:
                 pass
             raise StateSaveError(f"Failed to save state file ({path}): {e}") from e
         log_state_saved("local_file")
+
+
+class LocalFileDocumentStore:
+    def __init__(self, path: Path) -> None:
+        self._path = path
+
+    def read(self) -> bytes | None:
+        try:
+            return self._path.read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            raise StateLoadError(f"Failed to read {self._path}: {e}") from e
+
+    def write(self, payload: bytes) -> None:
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            write_bytes_atomically(self._path, payload)
+        except OSError as e:
+            raise StateSaveError(f"Failed to write {self._path}: {e}") from e
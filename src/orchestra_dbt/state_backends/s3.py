@@ -69,3 +69,37 @@ class S3StateBackend:
                 f"Failed to save state to s3://{bucket}/{key}: {e}"
             ) from e
         log_state_saved("s3")
+
+
+class S3DocumentStore:
+    def __init__(self, bucket: str, key: str) -> None:
+        self._bucket = bucket
+        self._key = key
+
+    def read(self) -> bytes | None:
+        uri = f"s3://{self._bucket}/{self._key}"
+        try:
+            response = boto3.client("s3").get_object(Bucket=self._bucket, Key=self._key)
+            return response["Body"].read()
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code", "") in (
+                "NoSuchKey",
+                "404",
+                "NotFound",
+            ):
+                return None
+            raise StateLoadError(f"Failed to read {uri}: {e}") from e
+        except (BotoCoreError, OSError) as e:
+            raise StateLoadError(f"Failed to read {uri}: {e}") from e
+
+    def write(self, payload: bytes) -> None:
+        uri = f"s3://{self._bucket}/{self._key}"
+        try:
+            boto3.client("s3").put_object(
+                Bucket=self._bucket,
+                Key=self._key,
+                Body=payload,
+                ContentType="application/json; charset=utf-8",
+            )
+        except (ClientError, BotoCoreError, OSError) as e:
+            raise StateSaveError(f"Failed to write {uri}: {e}") from e
@@ -1,4 +1,8 @@
 import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
 
 import yaml
 
@@ -18,6 +22,22 @@ def save_yaml(path: str, data: dict) -> None:
         yaml.safe_dump(data, f)
 
 
-def load_seed_bytes(path: str) -> bytes:
-    with open(path, "rb") as f:
-        return f.read()
+def write_bytes_atomically(path: Path, payload: bytes) -> None:
+    """
+    Replace `path` with `payload` through a temporary file in the same
+    directory, so readers never see a partially written file. An existing
+    file keeps its permissions, and a symlink keeps pointing at its target,
+    which is the file that gets replaced.
+    """
+    path = path.resolve()
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".orchestra_")
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(payload)
+        if path.exists():
+            shutil.copymode(path, tmp_path)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.isfile(tmp_path):
+            os.unlink(tmp_path)
+        raise
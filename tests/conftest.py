@@ -1,5 +1,7 @@
 import pytest
 
+from src.orchestra_dbt.run_context import invalidate_run_context
+
 
 @pytest.fixture(autouse=True)
 def mock_env_vars(monkeypatch):
@@ -7,7 +9,10 @@ def mock_env_vars(monkeypatch):
     monkeypatch.delenv("AZURE_STORAGE_CONNECTION_STRING", raising=False)
     monkeypatch.setenv("ORCHESTRA_API_KEY", "test-api-key")
     monkeypatch.setenv("ORCHESTRA_ENV", "dev")
+    # Settings are memoized per run; re-resolve them from each test's environment.
+    invalidate_run_context()
     yield
+    invalidate_run_context()
 
 
 @pytest.fixture
@@ -15,7 +15,17 @@ from src.orchestra_dbt.models import (
     SourceFreshness,
     StateApiModel,
 )
+from src.orchestra_dbt.run_context import RunContext
 from src.orchestra_dbt.sao import calculate_nodes_to_run
+from src.orchestra_dbt.state_types import StateBackendConfig, StateBackendKind
+
+
+def _run_context(settings: OrchestraDbtSettings) -> RunContext:
+    return RunContext(
+        cwd=Path.cwd(),
+        settings=settings,
+        state_backend_config=StateBackendConfig(kind=StateBackendKind.HTTP),
+    )
 
 
 def test_e2e(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -30,10 +40,12 @@ def test_e2e(monkeypatch: pytest.MonkeyPatch) -> None:
 
     monkeypatch.setattr(
         dag_module,
-        "load_orchestra_dbt_settings",
-        lambda: OrchestraDbtSettings(
-            integration_account_id="TO_BE_COMPLETED",
-            local_run=False,
+        "get_run_context",
+        lambda: _run_context(
+            OrchestraDbtSettings(
+                integration_account_id="TO_BE_COMPLETED",
+                local_run=False,
+            )
         ),
     )
 
@@ -336,6 +336,43 @@ class TestPropagateFreshnessConfig:
             is None
         )
 
+    def test_edge_endpoints_outside_the_dag_are_skipped(self):
+        # `model.ghost` (e.g. a disabled model) is only an edge endpoint.
+        dag = ParsedDag(
+            nodes={
+                "A": MaterialisationNode(
+                    asset_external_id="integration_account_id.model.a",
+                    freshness=Freshness.CLEAN,
+                    checksum="1",
+                    dbt_path="models/a.sql",
+                    file_path="models/a.sql",
+                    reason="test",
+                    sources={},
+                    freshness_config=FreshnessConfig(),
+                ),
+                "B": MaterialisationNode(
+                    asset_external_id="integration_account_id.model.b",
+                    freshness=Freshness.CLEAN,
+                    checksum="2",
+                    dbt_path="models/b.sql",
+                    file_path="models/b.sql",
+                    reason="test",
+                    sources={},
+                    freshness_config=FreshnessConfig(minutes_sla=60),
+                ),
+            },
+            edges=[
+                Edge(from_="model.ghost", to_="A"),
+                Edge(from_="A", to_="B"),
+            ],
+        )
+
+        propagate_freshness_config(dag)
+
+        assert (
+            cast(MaterialisationNode, dag.nodes["A"]).freshness_config.minutes_sla == 60
+        )
+
     def test_updates_on_preserved(self):
         """Test that updates_on field is not modified during propagation."""
         dag = ParsedDag(
@@ -1,6 +1,25 @@
-from unittest.mock import patch
+import hashlib
+import os
+from pathlib import Path
 
-from src.orchestra_dbt.checksum import calculate_checksum
+import pytest
+
+from src.orchestra_dbt import checksum as checksum_module
+from src.orchestra_dbt.checksum import (
+    SeedChecksumCache,
+    calculate_checksum,
+    calculate_seed_checksums,
+)
+
+_SEED_CONTENT = b"seed_id,seed_value\n1,alpha\n2,beta\n3,gamma"
+_SEED_SHA256 = "6d6b2c0c1b1207ba1b98ef592df4f2afd93736f602741903a61f7e3614433634"
+
+
+def _write_seed(path: Path, content: bytes = _SEED_CONTENT) -> str:
+    path.write_bytes(content)
+    # Old enough not to count as possibly still being written.
+    os.utime(path, ns=(1_700_000_000 * 10**9, 1_700_000_000 * 10**9))
+    return str(path)
 
 
 class TestCalculateChecksum:
@@ -28,34 +47,93 @@ class TestCalculateChecksum:
             in capsys.readouterr().out
         )
 
-    @patch("src.orchestra_dbt.checksum.load_seed_bytes")
-    @patch("src.orchestra_dbt.checksum.getsize")
-    def test_calculate_checksum_seed(self, mock_getsize, mock_load_seed_bytes):
-        mock_getsize.return_value = 1024
-        mock_load_seed_bytes.return_value = (
-            b"seed_id,seed_value\n1,alpha\n2,beta\n3,gamma"
-        )
+    def test_calculate_checksum_seed(self, tmp_path: Path):
         assert (
             calculate_checksum(
                 resource_type="seed",
                 node_checksum="123",
-                file_path="test.csv",
+                file_path=_write_seed(tmp_path / "test.csv"),
             )
-            == "6d6b2c0c1b1207ba1b98ef592df4f2afd93736f602741903a61f7e3614433634"
+            == _SEED_SHA256
         )
 
-    @patch("src.orchestra_dbt.checksum.getsize")
-    def test_calculate_checksum_seed_over_100mb_skipped(self, mock_getsize, capsys):
-        mock_getsize.return_value = (150 * 1024 * 1024) + 1
+    def test_calculate_checksum_seed_over_100mb(self, tmp_path: Path):
+        seed = tmp_path / "large.csv"
+        with seed.open("wb") as f:
+            f.truncate(150 * 1024 * 1024)
+
         assert (
             calculate_checksum(
-                resource_type="seed",
-                node_checksum="123",
-                file_path="large.csv",
+                resource_type="seed", node_checksum="123", file_path=str(seed)
             )
-            is None
+            == "12ba578486fc98e3d601b534901ce1e0cb2743f02de2adbba06a4ab860f85415"
         )
+
+
+class TestCalculateSeedChecksums:
+    def test_hashes_each_seed_once(self, tmp_path: Path):
+        seeds = [_write_seed(tmp_path / f"seed_{i}.csv", b"%d" % i) for i in range(8)]
+
+        checksums = calculate_seed_checksums([*seeds, seeds[0]], algorithm="blake2b")
+
+        assert checksums == {
+            seed: hashlib.blake2b(b"%d" % i).hexdigest() for i, seed in enumerate(seeds)
+        }
+
+    def test_missing_seed_has_no_checksum(self, tmp_path: Path):
+        assert calculate_seed_checksums([str(tmp_path / "missing.csv")]) == {
+            str(tmp_path / "missing.csv"): None
+        }
+
+
+class TestSeedChecksumCache:
+    def test_unchanged_seed_is_not_rehashed(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        seed = _write_seed(tmp_path / "seed.csv")
+        first = SeedChecksumCache(tmp_path / "cache")
+        assert first.digest(seed) == _SEED_SHA256
+        first.save()
+
+        def fail(_path):
+            raise AssertionError("seed should not be re-hashed")
+
+        monkeypatch.setattr(checksum_module, "_seed_digest", fail)
+
+        assert SeedChecksumCache(tmp_path / "cache").digest(seed) == _SEED_SHA256
+
+    def test_changed_seed_is_rehashed(self, tmp_path: Path):
+        seed = _write_seed(tmp_path / "seed.csv")
+        cache = SeedChecksumCache(tmp_path / "cache")
+        cache.digest(seed)
+        cache.save()
+
+        _write_seed(tmp_path / "seed.csv", _SEED_CONTENT + b"\n4,delta")
+
+        assert SeedChecksumCache(tmp_path / "cache").digest(seed) != _SEED_SHA256
+
+    def test_recently_modified_seed_is_not_remembered(self, tmp_path: Path):
+        seed = tmp_path / "seed.csv"
+        seed.write_bytes(_SEED_CONTENT)
+        cache = SeedChecksumCache(tmp_path / "cache")
+
+        assert cache.digest(str(seed)) == _SEED_SHA256
+        cache.save()
+
+        assert not (tmp_path / "cache").exists()
+
+    def test_digests_are_kept_per_algorithm(self, tmp_path: Path):
+        seed = _write_seed(tmp_path / "seed.csv")
+        cache = SeedChecksumCache(tmp_path / "cache")
+
         assert (
-            "Seed file large.csv (150.00MB) is over 100.00MB. Skipping checksum."
-            in capsys.readouterr().out
+            cache.digest(seed, "blake2b") == hashlib.blake2b(_SEED_CONTENT).hexdigest()
         )
+        assert cache.digest(seed) == _SEED_SHA256
+
+    def test_unreadable_cache_is_ignored(self, tmp_path: Path):
+        (tmp_path / "cache").mkdir()
+        (tmp_path / "cache" / "seed_checksums.json").write_text("{not json")
+        seed = _write_seed(tmp_path / "seed.csv")
+
+        assert SeedChecksumCache(tmp_path / "cache").digest(seed) == _SEED_SHA256
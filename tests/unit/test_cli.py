@@ -0,0 +1,284 @@
+from pathlib import Path
+from types import SimpleNamespace
+from typing import ClassVar
+from unittest.mock import MagicMock
+
+import pytest
+import yaml
+from click.testing import CliRunner
+
+import src.orchestra_dbt.cli as cli_module
+import src.orchestra_dbt.patcher as patcher_module
+from src.orchestra_dbt.config import OrchestraDbtSettings
+from src.orchestra_dbt.constants import ORCHESTRA_REUSED_NODE
+from src.orchestra_dbt.models import (
+    Freshness,
+    FreshnessConfig,
+    MaterialisationNode,
+    ParsedDag,
+    SourceFreshness,
+    StateApiModel,
+)
+from src.orchestra_dbt.prefetch import PrefetchedInputs
+from src.orchestra_dbt.run_context import RunContext
+from src.orchestra_dbt.state import StateLoadError
+from src.orchestra_dbt.state_types import StateBackendConfig, StateBackendKind
+
+
+def _node(node_id: str, file_path: str, freshness: Freshness) -> MaterialisationNode:
+    return MaterialisationNode(
+        asset_external_id=node_id,
+        checksum="checksum",
+        dbt_path=file_path,
+        file_path=file_path,
+        freshness_config=FreshnessConfig(),
+        freshness=freshness,
+        reason="Seed in same state as last run.",
+        sources={},
+    )
+
+
+@pytest.fixture
+def run_cli(monkeypatch: pytest.MonkeyPatch):
+    mocks = SimpleNamespace(
+        subprocess_run=MagicMock(return_value=SimpleNamespace(returncode=0)),
+        prefetch=MagicMock(
+            return_value=PrefetchedInputs(
+                source_freshness=SourceFreshness(sources={}),
+                node_ids_to_run=None,
+                state=StateApiModel(state={}),
+            )
+        ),
+        patch_seed_properties=MagicMock(return_value={}),
+        update_state=MagicMock(),
+    )
+    mocks.parsed_dag = parsed_dag = ParsedDag(
+        nodes={
+            "seed.p.reused": _node(
+                "seed.p.reused", "seeds/reused.csv", Freshness.CLEAN
+            ),
+            "seed.p.changed": _node(
+                "seed.p.changed", "seeds/changed.csv", Freshness.DIRTY
+            ),
+            "model.p.clean": _node(
+                "model.p.clean", "models/clean.sql", Freshness.CLEAN
+            ),
+        },
+        edges=[],
+    )
+    monkeypatch.setattr(cli_module.subprocess, "run", mocks.subprocess_run)
+    monkeypatch.setattr(cli_module, "prefetch_run_inputs", mocks.prefetch)
+    monkeypatch.setattr(cli_module, "construct_dag", lambda *_: parsed_dag)
+    monkeypatch.setattr(cli_module, "calculate_nodes_to_run", lambda _: None)
+    monkeypatch.setattr(
+        cli_module, "patch_seed_properties", mocks.patch_seed_properties
+    )
+    monkeypatch.setattr(cli_module, "update_state", mocks.update_state)
+    monkeypatch.setattr(cli_module, "save_state", MagicMock())
+
+    def run(args: list[str], settings: OrchestraDbtSettings):
+        context = RunContext(
+            cwd=Path.cwd(),
+            settings=settings,
+            state_backend_config=StateBackendConfig(
+                kind=StateBackendKind.LOCAL_FILE, local_path=Path("state.json")
+            ),
+        )
+        monkeypatch.setattr(cli_module, "get_run_context", lambda: context)
+        return CliRunner().invoke(cli_module.main, args), mocks
+
+    return run
+
+
+class TestSeedCommand:
+    def test_passes_through_without_seed_state_orchestration(self, run_cli):
+        result, mocks = run_cli(
+            ["dbt", "seed"], OrchestraDbtSettings(use_stateful=True)
+        )
+
+        assert result.exit_code == 0
+        mocks.prefetch.assert_not_called()
+        mocks.subprocess_run.assert_called_once_with(("dbt", "seed"))
+
+    def test_reloads_only_changed_seeds(self, run_cli):
+        result, mocks = run_cli(
+            ["dbt", "seed"],
+            OrchestraDbtSettings(
+                use_stateful=True, seed_state_orchestration=True, local_run=False
+            ),
+        )
+
+        assert result.exit_code == 0
+        (reused,), _ = mocks.patch_seed_properties.call_args
+        assert list(reused) == ["seed.p.reused"]
+        mocks.subprocess_run.assert_called_once_with(
+            ["dbt", "seed", "--exclude", f"tag:{ORCHESTRA_REUSED_NODE}"]
+        )
+        mocks.update_state.assert_called_once()
+
+    def test_reused_seed_tags_do_not_outlive_a_local_run(
+        self, run_cli, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        monkeypatch.chdir(tmp_path)
+        properties_file = tmp_path / "seeds" / "properties.yml"
+        properties_file.parent.mkdir()
+        properties_file.write_text("seeds:\n- name: changed\n", encoding="utf-8")
+        monkeypatch.setattr(
+            cli_module, "patch_seed_properties", patcher_module.patch_seed_properties
+        )
+        tagged_at_dbt_time: list[list[str]] = []
+
+        def run_dbt(cmd):
+            seeds = yaml.safe_load(properties_file.read_text(encoding="utf-8"))
+            tagged_at_dbt_time.append(
+                [
+                    seed["name"]
+                    for seed in seeds["seeds"]
+                    if ORCHESTRA_REUSED_NODE in seed.get("config", {}).get("tags", [])
+                ]
+            )
+            return SimpleNamespace(returncode=0)
+
+        monkeypatch.setattr(cli_module.subprocess, "run", run_dbt)
+        settings = OrchestraDbtSettings(
+            use_stateful=True, seed_state_orchestration=True, local_run=True
+        )
+        result, mocks = run_cli(["dbt", "seed"], settings)
+        assert result.exit_code == 0
+        assert properties_file.read_text(encoding="utf-8") == (
+            "seeds:\n- name: changed\n"
+        )
+
+        # The seed changed after the first run: the next run must load it.
+        mocks.parsed_dag.nodes["seed.p.reused"].freshness = Freshness.DIRTY
+        result, _ = run_cli(["dbt", "seed"], settings)
+        assert result.exit_code == 0
+        assert tagged_at_dbt_time == [["reused"], []]
+
+    def test_created_seed_properties_are_removed_after_a_local_run(
+        self, run_cli, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr(
+            cli_module, "patch_seed_properties", patcher_module.patch_seed_properties
+        )
+        result, _ = run_cli(
+            ["dbt", "seed"],
+            OrchestraDbtSettings(
+                use_stateful=True, seed_state_orchestration=True, local_run=True
+            ),
+        )
+        assert result.exit_code == 0
+        assert not (tmp_path / "seeds" / "properties.yml").exists()
+
+
+class TestNoopRuns:
+    @pytest.fixture
+    def all_reused(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        parsed_dag = ParsedDag(
+            nodes={
+                "model.p.clean": _node(
+                    "model.p.clean", "models/clean.sql", Freshness.CLEAN
+                ),
+            },
+            edges=[],
+        )
+        monkeypatch.setattr(cli_module, "construct_dag", lambda *_: parsed_dag)
+        write_reused_run_results = MagicMock()
+        monkeypatch.setattr(
+            cli_module, "write_reused_run_results", write_reused_run_results
+        )
+        return write_reused_run_results
+
+    def test_calls_dbt_by_default(self, run_cli, all_reused):
+        result, mocks = run_cli(
+            ["dbt", "build"],
+            OrchestraDbtSettings(use_stateful=True, local_run=False),
+        )
+
+        assert result.exit_code == 0
+        mocks.subprocess_run.assert_called_once()
+        all_reused.assert_not_called()
+
+    def test_skips_dbt_when_enabled(self, run_cli, all_reused):
+        result, mocks = run_cli(
+            ["dbt", "build"],
+            OrchestraDbtSettings(
+                use_stateful=True, local_run=False, skip_noop_runs=True
+            ),
+        )
+
+        assert result.exit_code == 0
+        mocks.subprocess_run.assert_not_called()
+        all_reused.assert_called_once()
+
+
+class TestSingleSession:
+    @pytest.fixture
+    def session(self, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        session = MagicMock()
+        monkeypatch.setattr(cli_module, "_open_session", lambda _: session)
+        return session
+
+    def test_closes_session_when_state_fails_to_load(
+        self, run_cli, session, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(
+            cli_module,
+            "prefetch_run_inputs",
+            MagicMock(
+                return_value=PrefetchedInputs(
+                    source_freshness=SourceFreshness(sources={}),
+                    node_ids_to_run=None,
+                    state=None,
+                    state_load_error=StateLoadError("bad state"),
+                )
+            ),
+        )
+
+        result, _ = run_cli(
+            ["dbt", "build"],
+            OrchestraDbtSettings(use_stateful=True, single_session=True),
+        )
+
+        assert result.exit_code == 1
+        session.run.assert_not_called()
+        session.close.assert_called()
+
+    def test_closes_session_when_dbt_core_is_missing(
+        self, run_cli, session, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.setattr(
+            cli_module, "prefetch_run_inputs", MagicMock(side_effect=ImportError)
+        )
+
+        result, _ = run_cli(
+            ["dbt", "build"],
+            OrchestraDbtSettings(use_stateful=True, single_session=True),
+        )
+
+        assert result.exit_code == 1
+        session.close.assert_called()
+
+
+class TestReusedNodeSelectors:
+    NODES: ClassVar[dict[str, MaterialisationNode]] = {
+        "model.p.clean": _node("model.p.clean", "models/clean.sql", Freshness.CLEAN)
+    }
+
+    def test_falls_back_to_patching_without_a_manifest(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        monkeypatch.chdir(tmp_path)
+
+        assert cli_module._reused_node_selectors(self.NODES) is None
+
+    def test_does_not_hide_bugs(self, monkeypatch: pytest.MonkeyPatch):
+        monkeypatch.setattr(
+            cli_module,
+            "load_reused_node_selectors",
+            MagicMock(side_effect=TypeError("bug")),
+        )
+
+        with pytest.raises(TypeError):
+            cli_module._reused_node_selectors(self.NODES)
@@ -41,6 +41,18 @@ def _clear_orchestra_settings_env(monkeypatch: pytest.MonkeyPatch) -> None:
         "ORCHESTRA_DBT_DEBUG",
         "ORCHESTRA_INTEGRATION_ACCOUNT_ID",
         "ORCHESTRA_SEED_STATE_ORCHESTRATION",
+        "ORCHESTRA_SINGLE_SESSION",
+        "ORCHESTRA_SKIP_NOOP_RUNS",
+        "ORCHESTRA_CACHE_DIR",
+        "ORCHESTRA_DAG_CACHE",
+        "ORCHESTRA_REUSE_MODE",
+        "ORCHESTRA_PRESERVE_PARTIAL_PARSE",
+        "ORCHESTRA_SEED_CHECKSUM_CACHE",
+        "ORCHESTRA_SEED_CHECKSUM_ALGORITHM",
+        "ORCHESTRA_SCOPE_SOURCE_FRESHNESS",
+        "ORCHESTRA_PLAN_SOURCE_FRESHNESS",
+        "ORCHESTRA_SOURCE_FRESHNESS_TTL_MINUTES",
+        "ORCHESTRA_SOURCE_FRESHNESS_CACHE",
     ):
         monkeypatch.delenv(key, raising=False)
 
@@ -157,6 +169,18 @@ def test_load_orchestra_dbt_settings_defaults(
     assert settings.debug is False
     assert settings.integration_account_id is None
     assert settings.seed_state_orchestration is False
+    assert settings.single_session is False
+    assert settings.skip_noop_runs is False
+    assert settings.cache_dir == ".orchestra/cache"
+    assert settings.dag_cache is True
+    assert settings.reuse_mode == "patch"
+    assert settings.preserve_partial_parse is True
+    assert settings.seed_checksum_cache is True
+    assert settings.seed_checksum_algorithm == "sha256"
+    assert settings.scope_source_freshness is True
+    assert settings.plan_source_freshness is False
+    assert settings.source_freshness_ttl_minutes is None
+    assert settings.source_freshness_cache == "local"
 
 
 def test_load_orchestra_dbt_settings_from_pyproject(
@@ -170,6 +194,18 @@ local_run = true
 debug = true
 integration_account_id = "acct-from-toml"
 seed_state_orchestration = true
+single_session = true
+skip_noop_runs = true
+cache_dir = "build/orchestra-cache"
+dag_cache = false
+reuse_mode = "selector"
+preserve_partial_parse = false
+seed_checksum_cache = false
+seed_checksum_algorithm = "blake2b"
+scope_source_freshness = false
+plan_source_freshness = true
+source_freshness_ttl_minutes = 15
+source_freshness_cache = "state"
 """,
         encoding="utf-8",
     )
@@ -183,6 +219,18 @@ seed_state_orchestration = true
     assert settings.debug is True
     assert settings.integration_account_id == "acct-from-toml"
     assert settings.seed_state_orchestration is True
+    assert settings.single_session is True
+    assert settings.skip_noop_runs is True
+    assert settings.cache_dir == "build/orchestra-cache"
+    assert settings.dag_cache is False
+    assert settings.reuse_mode == "selector"
+    assert settings.preserve_partial_parse is False
+    assert settings.seed_checksum_cache is False
+    assert settings.seed_checksum_algorithm == "blake2b"
+    assert settings.scope_source_freshness is False
+    assert settings.plan_source_freshness is True
+    assert settings.source_freshness_ttl_minutes == 15
+    assert settings.source_freshness_cache == "state"
     assert get_integration_account_id() == "acct-from-toml"
 
 
@@ -200,11 +248,35 @@ def test_load_orchestra_dbt_settings_env_overrides_pyproject(
     monkeypatch.setenv("ORCHESTRA_ENV", "dev")
     monkeypatch.setenv("ORCHESTRA_INTEGRATION_ACCOUNT_ID", "from-env")
     monkeypatch.setenv("ORCHESTRA_SEED_STATE_ORCHESTRATION", "true")
+    monkeypatch.setenv("ORCHESTRA_SINGLE_SESSION", "true")
+    monkeypatch.setenv("ORCHESTRA_SKIP_NOOP_RUNS", "true")
+    monkeypatch.setenv("ORCHESTRA_CACHE_DIR", "/tmp/orchestra-cache")
+    monkeypatch.setenv("ORCHESTRA_DAG_CACHE", "false")
+    monkeypatch.setenv("ORCHESTRA_REUSE_MODE", "Selector")
+    monkeypatch.setenv("ORCHESTRA_PRESERVE_PARTIAL_PARSE", "false")
+    monkeypatch.setenv("ORCHESTRA_SEED_CHECKSUM_CACHE", "false")
+    monkeypatch.setenv("ORCHESTRA_SEED_CHECKSUM_ALGORITHM", "BLAKE2B")
+    monkeypatch.setenv("ORCHESTRA_SCOPE_SOURCE_FRESHNESS", "false")
+    monkeypatch.setenv("ORCHESTRA_PLAN_SOURCE_FRESHNESS", "true")
+    monkeypatch.setenv("ORCHESTRA_SOURCE_FRESHNESS_TTL_MINUTES", "20")
+    monkeypatch.setenv("ORCHESTRA_SOURCE_FRESHNESS_CACHE", "State")
     settings = load_orchestra_dbt_settings()
     assert settings.use_stateful is False
     assert settings.orchestra_env == "dev"
     assert settings.integration_account_id == "from-env"
     assert settings.seed_state_orchestration is True
+    assert settings.single_session is True
+    assert settings.skip_noop_runs is True
+    assert settings.cache_dir == "/tmp/orchestra-cache"
+    assert settings.dag_cache is False
+    assert settings.reuse_mode == "selector"
+    assert settings.preserve_partial_parse is False
+    assert settings.seed_checksum_cache is False
+    assert settings.seed_checksum_algorithm == "blake2b"
+    assert settings.scope_source_freshness is False
+    assert settings.plan_source_freshness is True
+    assert settings.source_freshness_ttl_minutes == 20
+    assert settings.source_freshness_cache == "state"
 
 
 def test_load_orchestra_dbt_settings_invalid_orchestra_env_in_pyproject(
@@ -1,4 +1,7 @@
+import hashlib
 from datetime import datetime
+from pathlib import Path
+from typing import Any, ClassVar
 
 import pytest
 
@@ -16,6 +19,17 @@ from src.orchestra_dbt.models import (
     StateApiModel,
     StateItem,
 )
+from src.orchestra_dbt.run_context import RunContext
+from src.orchestra_dbt.sao import calculate_nodes_to_run
+from src.orchestra_dbt.state_types import StateBackendConfig, StateBackendKind
+
+
+def _run_context(settings: OrchestraDbtSettings) -> RunContext:
+    return RunContext(
+        cwd=Path.cwd(),
+        settings=settings,
+        state_backend_config=StateBackendConfig(kind=StateBackendKind.HTTP),
+    )
 
 
 class TestCalculateFreshnessOnNode:
@@ -31,6 +45,26 @@ class TestCalculateFreshnessOnNode:
             seed_state_orchestration=False,
         ) == (Freshness.DIRTY, "Snapshot is always dirty.")
 
+    def test_calculate_freshness_on_node_snapshot_reuse(self):
+        assert calculate_freshness_on_node(
+            asset_external_id="test.snapshot.a.b",
+            checksum="123",
+            state=StateApiModel(
+                state={
+                    "test.snapshot.a.b": StateItem(
+                        last_updated=datetime(2024, 1, 1, 12, 0, 0),
+                        checksum="123",
+                        sources={},
+                    ),
+                }
+            ),
+            resource_type="snapshot",
+            track_state=True,
+            from_external_package=False,
+            depends_on_nodes=[],
+            reuse_snapshot=True,
+        ) == (Freshness.CLEAN, "Snapshot in same state as last run.")
+
     def test_calculate_freshness_on_node_not_tracking_state(self):
         assert calculate_freshness_on_node(
             asset_external_id="test.seed.a.b",
@@ -172,13 +206,15 @@ class TestConstructDag:
     def test_construct_dag_with_sources(
         self, monkeypatch: pytest.MonkeyPatch, sample_manifest: dict
     ) -> None:
-        monkeypatch.setattr(dag_module, "load_json", lambda _: sample_manifest)
+        monkeypatch.setattr(dag_module, "load_manifest", lambda *_: sample_manifest)
         monkeypatch.setattr(
             dag_module,
-            "load_orchestra_dbt_settings",
-            lambda: OrchestraDbtSettings(
-                integration_account_id="integration_account_id",
-                local_run=False,
+            "get_run_context",
+            lambda: _run_context(
+                OrchestraDbtSettings(
+                    integration_account_id="integration_account_id",
+                    local_run=False,
+                )
             ),
         )
 
@@ -268,7 +304,7 @@ class TestConstructDag:
     def test_construct_dag_dirty_model(
         self, monkeypatch: pytest.MonkeyPatch, sample_manifest: dict
     ) -> None:
-        monkeypatch.setattr(dag_module, "load_json", lambda _: sample_manifest)
+        monkeypatch.setattr(dag_module, "load_manifest", lambda *_: sample_manifest)
 
         source_freshness = SourceFreshness(
             sources={
@@ -314,14 +350,20 @@ class TestConstructDag:
             },
             "child_map": {},
         }
-        monkeypatch.setattr(dag_module, "load_json", lambda _: manifest)
-        monkeypatch.setattr(dag_module, "calculate_checksum", lambda *a, **k: "stable")
+        monkeypatch.setattr(dag_module, "load_manifest", lambda *_: manifest)
         monkeypatch.setattr(
             dag_module,
-            "load_orchestra_dbt_settings",
-            lambda: OrchestraDbtSettings(
-                integration_account_id="acct",
-                seed_state_orchestration=False,
+            "calculate_seed_checksums",
+            lambda paths, **_: dict.fromkeys(paths, "stable"),
+        )
+        monkeypatch.setattr(
+            dag_module,
+            "get_run_context",
+            lambda: _run_context(
+                OrchestraDbtSettings(
+                    integration_account_id="acct",
+                    seed_state_orchestration=False,
+                )
             ),
         )
 
@@ -349,15 +391,21 @@ class TestConstructDag:
             },
             "child_map": {},
         }
-        monkeypatch.setattr(dag_module, "load_json", lambda _: manifest)
-        monkeypatch.setattr(dag_module, "calculate_checksum", lambda *a, **k: "stable")
+        monkeypatch.setattr(dag_module, "load_manifest", lambda *_: manifest)
         monkeypatch.setattr(
             dag_module,
-            "load_orchestra_dbt_settings",
-            lambda: OrchestraDbtSettings(
-                integration_account_id="acct",
-                seed_state_orchestration=True,
-                local_run=False,
+            "calculate_seed_checksums",
+            lambda paths, **_: dict.fromkeys(paths, "stable"),
+        )
+        monkeypatch.setattr(
+            dag_module,
+            "get_run_context",
+            lambda: _run_context(
+                OrchestraDbtSettings(
+                    integration_account_id="acct",
+                    seed_state_orchestration=True,
+                    local_run=False,
+                )
             ),
         )
         asset_id = "acct.my_seed"
@@ -402,14 +450,20 @@ class TestConstructDag:
                 "source.test_db.raw.events": ["model.test_project.my_model"],
             },
         }
-        monkeypatch.setattr(dag_module, "load_json", lambda _: manifest)
-        monkeypatch.setattr(dag_module, "calculate_checksum", lambda *a, **k: "stable")
+        monkeypatch.setattr(dag_module, "load_manifest", lambda *_: manifest)
+        monkeypatch.setattr(
+            dag_module,
+            "calculate_seed_checksums",
+            lambda paths, **_: dict.fromkeys(paths, "stable"),
+        )
         monkeypatch.setattr(
             dag_module,
-            "load_orchestra_dbt_settings",
-            lambda: OrchestraDbtSettings(
-                integration_account_id="acct",
-                local_run=False,
+            "get_run_context",
+            lambda: _run_context(
+                OrchestraDbtSettings(
+                    integration_account_id="acct",
+                    local_run=False,
+                )
             ),
         )
 
@@ -418,3 +472,153 @@ class TestConstructDag:
         edge_froms = [e.from_ for e in dag.edges]
         assert "source.test_db.raw.events" in edge_froms
         assert "function.test_project.is_positive_int" not in edge_froms
+
+    @pytest.mark.parametrize(
+        ("meta", "source_updated", "expected"),
+        [
+            ({}, datetime(2024, 1, 1, 12, 0, 0), Freshness.DIRTY),
+            (
+                {"orchestra_reuse": True},
+                datetime(2024, 1, 1, 12, 0, 0),
+                Freshness.CLEAN,
+            ),
+            (
+                {"orchestra_reuse": True},
+                datetime(2024, 1, 3, 12, 0, 0),
+                Freshness.DIRTY,
+            ),
+            (
+                {"orchestra_reuse": "yes"},
+                datetime(2024, 1, 1, 12, 0, 0),
+                Freshness.DIRTY,
+            ),
+        ],
+    )
+    def test_construct_dag_snapshot_reuse(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        meta: dict,
+        source_updated: datetime,
+        expected: Freshness,
+    ) -> None:
+        manifest = {
+            "metadata": {"project_name": "test_project"},
+            "nodes": {
+                "snapshot.test_project.orders_snapshot": {
+                    "resource_type": "snapshot",
+                    "checksum": {"checksum": "abc"},
+                    "config": {"meta": meta},
+                    "package_name": "test_project",
+                    "original_file_path": "snapshots/orders_snapshot.sql",
+                    "relation_name": "orders_snapshot",
+                    "depends_on": {"nodes": ["source.test_db.raw.orders"]},
+                },
+            },
+            "child_map": {
+                "source.test_db.raw.orders": ["snapshot.test_project.orders_snapshot"],
+            },
+        }
+        monkeypatch.setattr(dag_module, "load_manifest", lambda *_: manifest)
+        monkeypatch.setattr(
+            dag_module,
+            "get_run_context",
+            lambda: _run_context(OrchestraDbtSettings(local_run=True)),
+        )
+        state = StateApiModel(
+            state={
+                "snapshot.test_project.orders_snapshot": StateItem(
+                    last_updated=datetime(2024, 1, 2, 12, 0, 0),
+                    checksum="abc",
+                    sources={
+                        "source.test_db.raw.orders": datetime(2024, 1, 1, 12, 0, 0)
+                    },
+                )
+            }
+        )
+
+        dag = construct_dag(
+            SourceFreshness(sources={"source.test_db.raw.orders": source_updated}),
+            state,
+        )
+        calculate_nodes_to_run(dag)
+
+        node = dag.nodes["snapshot.test_project.orders_snapshot"]
+        assert isinstance(node, MaterialisationNode)
+        assert node.freshness == expected
+
+
+class TestSeedChecksumAlgorithm:
+    MANIFEST: ClassVar[dict[str, Any]] = {
+        "metadata": {"project_name": "test_project"},
+        "nodes": {
+            "seed.test_project.my_seed": {
+                "resource_type": "seed",
+                "checksum": {"checksum": "abc"},
+                "config": {},
+                "package_name": "test_project",
+                "original_file_path": "seeds/my_seed.csv",
+                "relation_name": "my_seed",
+                "depends_on": {"nodes": []},
+            },
+        },
+        "child_map": {},
+    }
+
+    @pytest.fixture
+    def seed_content(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> bytes:
+        monkeypatch.chdir(tmp_path)
+        content = b"id,name\n1,alpha\n"
+        (tmp_path / "seeds").mkdir()
+        (tmp_path / "seeds" / "my_seed.csv").write_bytes(content)
+        monkeypatch.setattr(dag_module, "load_manifest", lambda *_: self.MANIFEST)
+        monkeypatch.setattr(
+            dag_module,
+            "get_run_context",
+            lambda: _run_context(
+                OrchestraDbtSettings(
+                    integration_account_id="acct",
+                    seed_state_orchestration=True,
+                    seed_checksum_algorithm="blake2b",
+                    seed_checksum_cache=False,
+                    local_run=False,
+                )
+            ),
+        )
+        return content
+
+    @staticmethod
+    def _state(checksum: str) -> StateApiModel:
+        return StateApiModel(
+            state={
+                "acct.my_seed": StateItem(
+                    last_updated=datetime(2024, 1, 1, 12, 0, 0),
+                    checksum=checksum,
+                    sources={},
+                )
+            }
+        )
+
+    def test_switching_algorithm_compares_with_the_previous_one(
+        self, seed_content: bytes
+    ):
+        dag = construct_dag(
+            SourceFreshness(sources={}),
+            self._state(hashlib.sha256(seed_content).hexdigest()),
+        )
+
+        node = dag.nodes["seed.test_project.my_seed"]
+        assert isinstance(node, MaterialisationNode)
+        assert node.freshness == Freshness.CLEAN
+        assert node.checksum == hashlib.blake2b(seed_content).hexdigest()
+        assert node.checksum_algorithm == "blake2b"
+
+    def test_changed_seed_is_dirty_after_switching_algorithm(self, seed_content: bytes):
+        dag = construct_dag(
+            SourceFreshness(sources={}),
+            self._state(hashlib.sha256(seed_content + b"2,beta\n").hexdigest()),
+        )
+
+        node = dag.nodes["seed.test_project.my_seed"]
+        assert isinstance(node, MaterialisationNode)
+        assert node.freshness == Freshness.DIRTY
+        assert node.reason == "Checksum changed since last run."
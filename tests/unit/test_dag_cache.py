@@ -0,0 +1,190 @@
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.orchestra_dbt import dag as dag_module
+from src.orchestra_dbt import dag_cache as dag_cache_module
+from src.orchestra_dbt.dag import construct_dag
+from src.orchestra_dbt.dag_cache import DagCache
+from src.orchestra_dbt.models import (
+    Freshness,
+    FreshnessConfig,
+    ManifestDag,
+    ManifestNode,
+    MaterialisationNode,
+    SourceFreshness,
+    StateApiModel,
+    StateItem,
+)
+
+
+def _manifest(checksum: str = "abc", generated_at: str = "2026-01-01") -> dict:
+    return {
+        "metadata": {
+            "project_name": "jaffle",
+            "generated_at": generated_at,
+            "invocation_id": f"id-{generated_at}",
+        },
+        "nodes": {
+            "model.jaffle.orders": {
+                "resource_type": "model",
+                "checksum": {"name": "sha256", "checksum": checksum},
+                "package_name": "jaffle",
+                "original_file_path": "models/orders.sql",
+                "depends_on": {"nodes": ["source.jaffle.raw.orders"]},
+                "config": {
+                    "freshness": {"build_after": {"count": 2, "period": "hour"}}
+                },
+                "created_at": 1700000000.123 if generated_at == "2026-01-01" else 17.5,
+            },
+        },
+        "child_map": {"source.jaffle.raw.orders": ["model.jaffle.orders"]},
+    }
+
+
+def _write_manifest(path: Path, manifest: dict) -> Path:
+    path.write_text(json.dumps(manifest), encoding="utf-8")
+    return path
+
+
+def _manifest_dag(node_checksum: str = "abc") -> ManifestDag:
+    return ManifestDag(
+        source_ids=["source.jaffle.raw.orders"],
+        nodes=[
+            ManifestNode(
+                node_id="model.jaffle.orders",
+                resource_type="model",
+                relation_name=None,
+                node_checksum=node_checksum,
+                dbt_path="models/orders.sql",
+                file_path="models/orders.sql",
+                from_external_package=False,
+                depends_on_nodes=["source.jaffle.raw.orders"],
+                freshness_config=FreshnessConfig(minutes_sla=120, updates_on="all"),
+            )
+        ],
+    )
+
+
+class TestDagCache:
+    def test_round_trips_an_entry(self, tmp_path: Path):
+        cache = DagCache(tmp_path)
+
+        cache.store("fp", _manifest_dag())
+
+        assert cache.load("fp") == _manifest_dag()
+        assert cache.load("other") is None
+
+    def test_fingerprint_ignores_fields_dbt_rewrites_on_every_parse(
+        self, tmp_path: Path
+    ):
+        cache = DagCache(tmp_path / "cache")
+        first = cache.fingerprint(_write_manifest(tmp_path / "a.json", _manifest()))
+        reparsed = cache.fingerprint(
+            _write_manifest(tmp_path / "b.json", _manifest(generated_at="2026-02-02"))
+        )
+        changed = cache.fingerprint(
+            _write_manifest(tmp_path / "c.json", _manifest(checksum="def"))
+        )
+
+        assert first == reparsed
+        assert first != changed
+
+    def test_fingerprint_skips_hashing_an_untouched_manifest(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        cache = DagCache(tmp_path / "cache")
+        manifest_path = _write_manifest(tmp_path / "manifest.json", _manifest())
+        fingerprint = cache.fingerprint(manifest_path)
+
+        def fail(_path):
+            raise AssertionError("manifest should not be re-hashed")
+
+        monkeypatch.setattr(dag_cache_module, "_content_digest", fail)
+
+        assert cache.fingerprint(manifest_path) == fingerprint
+
+    def test_unreadable_entry_is_a_miss(self, tmp_path: Path):
+        cache = DagCache(tmp_path)
+        cache.store("fp", _manifest_dag())
+        entry = next(tmp_path.glob("fp.*"))
+        entry.write_bytes(entry.read_bytes()[:40])
+
+        assert cache.load("fp") is None
+
+    def test_evicts_least_recently_used_entries(self, tmp_path: Path):
+        cache = DagCache(tmp_path, max_entries=2)
+        cache.store("a", _manifest_dag("a"))
+        cache.store("b", _manifest_dag("b"))
+        for age, name in enumerate(("a.dag", "b.dag"), start=1):
+            os.utime(tmp_path / name, ns=(age * 10**9, age * 10**9))
+
+        assert cache.load("a") is not None  # now the most recently used
+        cache.store("c", _manifest_dag("c"))
+
+        assert cache.load("b") is None
+        assert cache.load("a") is not None
+        assert cache.load("c") is not None
+
+
+class TestConstructDagWithCache:
+    def test_reuses_cached_dag_and_overlays_state(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        manifest_path = _write_manifest(tmp_path / "manifest.json", _manifest())
+        first = construct_dag(
+            SourceFreshness(sources={}),
+            StateApiModel(state={}),
+            manifest_override=str(manifest_path),
+        )
+
+        def fail(*_):
+            raise AssertionError("manifest should be served from the cache")
+
+        monkeypatch.setattr(dag_module, "load_manifest", fail)
+        source_updated = datetime(2026, 1, 2, 9, 0, 0)
+        second = construct_dag(
+            SourceFreshness(sources={"source.jaffle.raw.orders": source_updated}),
+            StateApiModel(
+                state={
+                    "model.jaffle.orders": StateItem(
+                        last_updated=datetime(2026, 1, 1, 12, 0, 0),
+                        checksum="abc",
+                        sources={},
+                    )
+                }
+            ),
+            manifest_override=str(manifest_path),
+        )
+
+        assert list(tmp_path.glob(".orchestra/cache/dag/*.dag"))
+        assert first.edges == second.edges
+        first_model = first.nodes["model.jaffle.orders"]
+        assert isinstance(first_model, MaterialisationNode)
+        assert first_model.freshness == Freshness.DIRTY
+        model = second.nodes["model.jaffle.orders"]
+        assert isinstance(model, MaterialisationNode)
+        assert model.freshness == Freshness.CLEAN
+        assert model.freshness_config == FreshnessConfig(
+            minutes_sla=120, updates_on="any"
+        )
+        assert second.nodes["source.jaffle.raw.orders"].last_updated == source_updated
+
+    def test_cache_can_be_disabled(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("ORCHESTRA_DAG_CACHE", "false")
+        manifest_path = _write_manifest(tmp_path / "manifest.json", _manifest())
+
+        construct_dag(
+            SourceFreshness(sources={}),
+            StateApiModel(state={}),
+            manifest_override=str(manifest_path),
+        )
+
+        assert not (tmp_path / ".orchestra").exists()
@@ -0,0 +1,192 @@
+from src.orchestra_dbt.graph import DagGraph
+from src.orchestra_dbt.models import (
+    Edge,
+    Freshness,
+    FreshnessConfig,
+    MaterialisationNode,
+    ParsedDag,
+    SourceNode,
+)
+
+
+def _diamond_dag() -> ParsedDag:
+    return ParsedDag(
+        nodes={
+            "model.a": MaterialisationNode(
+                asset_external_id="model.a",
+                freshness=Freshness.CLEAN,
+                checksum="1",
+                dbt_path="models/model_a.sql",
+                file_path="models/model_a.sql",
+                reason="Node not seen before",
+                sources={},
+                freshness_config=FreshnessConfig(),
+            ),
+            "model.b": MaterialisationNode(
+                asset_external_id="model.b",
+                freshness=Freshness.CLEAN,
+                checksum="2",
+                dbt_path="models/model_b.sql",
+                file_path="models/model_b.sql",
+                reason="Node not seen before",
+                sources={},
+                freshness_config=FreshnessConfig(),
+            ),
+            "model.c": MaterialisationNode(
+                asset_external_id="model.c",
+                freshness=Freshness.CLEAN,
+                checksum="3",
+                dbt_path="models/model_c.sql",
+                file_path="models/model_c.sql",
+                reason="Node not seen before",
+                sources={},
+                freshness_config=FreshnessConfig(),
+            ),
+            "model.d": MaterialisationNode(
+                asset_external_id="model.d",
+                freshness=Freshness.CLEAN,
+                checksum="4",
+                dbt_path="models/model_d.sql",
+                file_path="models/model_d.sql",
+                reason="Node not seen before",
+                sources={},
+                freshness_config=FreshnessConfig(),
+            ),
+        },
+        edges=[
+            Edge(from_="model.a", to_="model.b"),
+            Edge(from_="model.a", to_="model.c"),
+            Edge(from_="model.b", to_="model.c"),
+            Edge(from_="model.b", to_="model.d"),
+        ],
+    )
+
+
+class TestDagGraph:
+    def test_adjacency_matches_edges(self):
+        graph = _diamond_dag().graph
+
+        assert {
+            node_id: graph.child_ids(i)
+            for i, node_id in enumerate(graph.ids)
+            if graph.child_ids(i)
+        } == {
+            "model.a": ["model.b", "model.c"],
+            "model.b": ["model.c", "model.d"],
+        }
+        assert {
+            node_id: graph.parent_ids(i)
+            for i, node_id in enumerate(graph.ids)
+            if graph.parent_ids(i)
+        } == {
+            "model.b": ["model.a"],
+            "model.c": ["model.a", "model.b"],
+            "model.d": ["model.b"],
+        }
+        assert dict(zip(graph.ids, graph.in_degrees())) == {
+            "model.a": 0,
+            "model.b": 1,
+            "model.c": 2,
+            "model.d": 1,
+        }
+        assert dict(zip(graph.ids, graph.out_degrees())) == {
+            "model.a": 2,
+            "model.b": 2,
+            "model.c": 0,
+            "model.d": 0,
+        }
+
+    def test_parents_and_children_are_symmetric(self):
+        graph = _diamond_dag().graph
+
+        for index in range(len(graph.ids)):
+            for child in graph.children(index):
+                assert index in graph.parents(child)
+            for parent in graph.parents(index):
+                assert index in graph.children(parent)
+        assert sum(graph.in_degrees()) == sum(graph.out_degrees()) == 4
+
+    def test_unknown_ids(self):
+        graph = DagGraph(["model.a"], [("model.external", "model.a")])
+
+        assert graph.index_of("model.missing") is None
+        # Edge endpoints that are not DAG nodes are still indexed, after them.
+        external = graph.index_of("model.external")
+        assert external == 1 and graph.node_count == 1
+        assert graph.child_ids(external) == ["model.a"]
+        assert graph.parent_ids(external) == []
+        assert graph.is_source[external] == 0
+
+    def test_graph_is_built_once(self):
+        dag = _diamond_dag()
+
+        assert dag.graph is dag.graph
+
+    def test_dag_nodes_come_first_in_their_order(self):
+        graph = DagGraph(
+            ["model.b", "model.a"],
+            [("source.s.t", "model.a"), ("model.a", "model.b")],
+        )
+
+        assert graph.node_count == 2
+        assert graph.ids == ["model.b", "model.a", "source.s.t"]
+        assert graph.index_of("source.s.t") == 2
+        assert graph.index_of("model.missing") is None
+        assert graph.parent_ids(1) == ["source.s.t"]
+        assert list(graph.children(2)) == [1]
+
+    def test_empty_graph(self):
+        graph = DagGraph([], [])
+
+        assert graph.ids == []
+        assert list(graph.in_degrees()) == []
+
+    def test_topological_order_puts_parents_first(self):
+        graph = DagGraph(
+            ["model.d", "model.c", "model.b", "model.a"],
+            [
+                ("model.a", "model.b"),
+                ("model.a", "model.c"),
+                ("model.b", "model.c"),
+                ("model.b", "model.d"),
+            ],
+        )
+
+        order = [graph.ids[i] for i in graph.topological_order()]
+
+        assert order == ["model.a", "model.b", "model.c", "model.d"]
+        assert graph.topological_order() is graph.topological_order()
+
+    def test_topological_order_leaves_out_cycles(self):
+        graph = DagGraph(
+            ["model.a", "model.b", "model.c"],
+            [("model.a", "model.b"), ("model.b", "model.c"), ("model.c", "model.b")],
+        )
+
+        assert [graph.ids[i] for i in graph.topological_order()] == ["model.a"]
+
+
+class TestIsSource:
+    def test_flags_only_dag_sources(self):
+        dag = _diamond_dag()
+        dag.nodes["source.s.t"] = SourceNode()
+        dag.edges.append(Edge(from_="source.s.t", to_="model.a"))
+        graph = dag.graph
+
+        assert [graph.ids[i] for i, flag in enumerate(graph.is_source) if flag] == [
+            "source.s.t"
+        ]
+        index = graph.index_of("model.a")
+        assert index is not None
+        assert graph.source_parent_ids(index) == ["source.s.t"]
+
+
+class TestSourceParentIds:
+    def test_returns_only_source_parents(self):
+        dag = _diamond_dag()
+        dag.nodes["source.s.t"] = SourceNode()
+        dag.edges.append(Edge(from_="source.s.t", to_="model.c"))
+
+        assert dag.source_parent_ids("model.c") == ["source.s.t"]
+        assert dag.source_parent_ids("model.b") == []
+        assert dag.source_parent_ids("model.missing") == []
@@ -1,4 +1,4 @@
-from src.orchestra_dbt.ls import get_args_for_ls
+from src.orchestra_dbt.ls import get_args_for_ls, get_node_ids_from_manifest
 
 
 class TestGetArgsForLs:
@@ -12,7 +12,9 @@ class TestGetArgsForLs:
             "--resource-type",
             "seed",
             "--output",
-            "path",
+            "json",
+            "--output-keys",
+            "unique_id",
             "-q",
         ]
 
@@ -28,7 +30,9 @@ class TestGetArgsForLs:
             "--var",
             "foo=bar",
             "--output",
-            "path",
+            "json",
+            "--output-keys",
+            "unique_id",
             "-q",
         ]
 
@@ -54,6 +58,20 @@ class TestGetArgsForLs:
             "-t",
             "sao-test",
             "--output",
-            "path",
+            "json",
+            "--output-keys",
+            "unique_id",
             "-q",
         ]
+
+
+class TestGetNodeIdsFromManifest:
+    def test_missing_manifest_falls_back(self, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        assert get_node_ids_from_manifest(("dbt", "build")) is None
+
+    def test_invalid_manifest_falls_back(self, monkeypatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "target").mkdir()
+        (tmp_path / "target" / "manifest.json").write_text("[]")
+        assert get_node_ids_from_manifest(("dbt", "build")) is None
@@ -0,0 +1,150 @@
+import io
+import json
+
+import pytest
+
+from src.orchestra_dbt.manifest_reader import (
+    _JsonStream,
+    iter_projected_array,
+    load_manifest,
+)
+
+MANIFEST = {
+    "metadata": {"project_name": "jaffle", "generated_at": "2026-01-01T00:00:00Z"},
+    "nodes": {
+        "model.jaffle.orders": {
+            "resource_type": "model",
+            "checksum": {"name": "sha256", "checksum": "abc"},
+            "compiled_code": "select * from {{ ref('stg_orders') }} -- é\"}",
+            "depends_on": {"nodes": ["model.jaffle.stg_orders"], "macros": []},
+            "config": {"freshness": None, "materialized": "table", "sql_header": None},
+            "columns": {"id": {"name": "id", "description": "x" * 200}},
+            "relation_name": '"db"."main"."orders"',
+        },
+        "seed.jaffle.raw–orders": {
+            "resource_type": "seed",
+            "checksum": {"name": "sha256", "checksum": "def"},
+            "config": {"freshness": {"build_after": {"count": 1, "period": "hour"}}},
+            "depends_on": {"nodes": []},
+            "relation_name": None,
+        },
+    },
+    "macros": {"macro.dbt.x": {"macro_sql": "{% macro x() %}{% endmacro %}"}},
+    "child_map": {"model.jaffle.orders": [], "source.jaffle.raw.orders": []},
+    "empty": {},
+    "number": 12345,
+}
+
+PROJECTION = {
+    "metadata": {"project_name": True},
+    "child_map": True,
+    "nodes": {
+        "*": {
+            "resource_type": True,
+            "checksum": True,
+            "depends_on": {"nodes": True},
+            "config": {"freshness": True},
+            "relation_name": True,
+        }
+    },
+}
+
+EXPECTED = {
+    "metadata": {"project_name": "jaffle"},
+    "child_map": MANIFEST["child_map"],
+    "nodes": {
+        "model.jaffle.orders": {
+            "resource_type": "model",
+            "checksum": {"name": "sha256", "checksum": "abc"},
+            "depends_on": {"nodes": ["model.jaffle.stg_orders"]},
+            "config": {"freshness": None},
+            "relation_name": '"db"."main"."orders"',
+        },
+        "seed.jaffle.raw–orders": {
+            "resource_type": "seed",
+            "checksum": {"name": "sha256", "checksum": "def"},
+            "depends_on": {"nodes": []},
+            "config": {"freshness": {"build_after": {"count": 1, "period": "hour"}}},
+            "relation_name": None,
+        },
+    },
+}
+
+
+class TestLoadManifest:
+    def test_keeps_only_projected_fields(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps(MANIFEST, indent=2), encoding="utf-8")
+
+        assert load_manifest(str(path), PROJECTION) == EXPECTED
+
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64])
+    def test_values_split_across_chunks(self, chunk_size):
+        stream = _JsonStream(io.StringIO(json.dumps(MANIFEST)), chunk_size=chunk_size)
+
+        projection = {**PROJECTION, "number": True, "empty": True}
+        assert stream.read_projected(projection, stream_depth=2) == {
+            **EXPECTED,
+            "number": 12345,
+            "empty": {},
+        }
+
+    @pytest.mark.parametrize("chunk_size", range(1, 17))
+    def test_numbers_split_across_chunks(self, chunk_size):
+        # Written out, so exponents survive (`json.dumps` would normalise them).
+        document = (
+            '{"a": 1.5, "b": 15e3, "c": -2.25E-7, "d": [0.125, 1e+10, 42],'
+            ' "e": {"elapsed_time": 3.14159}}'
+        )
+
+        for stream_depth in (0, 2):
+            stream = _JsonStream(io.StringIO(document), chunk_size=chunk_size)
+            assert stream.read_projected(
+                {"*": True}, stream_depth=stream_depth
+            ) == json.loads(document)
+
+    def test_truncated_document_raises(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text(json.dumps(MANIFEST)[:-40], encoding="utf-8")
+
+        with pytest.raises(ValueError):
+            load_manifest(str(path), PROJECTION)
+
+    def test_non_object_document_raises(self, tmp_path):
+        path = tmp_path / "manifest.json"
+        path.write_text("[]", encoding="utf-8")
+
+        with pytest.raises(ValueError, match="Expected a JSON object"):
+            load_manifest(str(path), PROJECTION)
+
+
+class TestIterProjectedArray:
+    def test_yields_projected_elements_of_the_array(self, tmp_path):
+        path = tmp_path / "run_results.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "metadata": {"x": [1, 2]},
+                    "results": [
+                        {"unique_id": "a", "compiled_code": "select 1"},
+                        {"unique_id": "b", "compiled_code": None},
+                    ],
+                    "args": {},
+                }
+            ),
+            encoding="utf-8",
+        )
+
+        assert list(
+            iter_projected_array(str(path), "results", {"unique_id": True})
+        ) == [
+            {"unique_id": "a"},
+            {"unique_id": "b"},
+        ]
+
+    def test_empty_or_missing_array(self, tmp_path):
+        path = tmp_path / "run_results.json"
+        path.write_text('{"results": []}', encoding="utf-8")
+
+        assert list(iter_projected_array(str(path), "results", True)) == []
+        assert list(iter_projected_array(str(path), "other", True)) == []
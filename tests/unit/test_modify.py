@@ -5,10 +5,10 @@ import pytest
 from src.orchestra_dbt.constants import ORCHESTRA_REUSED_NODE
 from src.orchestra_dbt.modify import (
     _build_generated_selector_definition,
-    _split_selection_args,
     modify_dbt_command,
     restore_selectors_file,
     snapshot_selectors_file,
+    split_selection_args,
     update_selectors_yaml,
 )
 
@@ -335,7 +335,7 @@ class TestModifyDbtCommand:
         ) as mock_update:
             result = modify_dbt_command(cmd)
             assert result == cmd
-        mock_update.assert_called_once_with("test_selector")
+        mock_update.assert_called_once_with("test_selector", None)
 
     @pytest.mark.parametrize("subcommand", ["build", "test"])
     def test_modify_dbt_command_with_selector_does_not_generate_selector(
@@ -351,9 +351,64 @@ class TestModifyDbtCommand:
         assert result == cmd
         assert "--exclude" not in result
         assert "--selector" in result
-        mock_update.assert_called_once_with("test_selector")
+        mock_update.assert_called_once_with("test_selector", None)
         mock_save_yaml.assert_not_called()
 
+    def test_reused_selectors_replace_the_tag_exclusion(self):
+        result = modify_dbt_command(
+            ["dbt", "run"], reused_selectors=["fqn:jaffle.orders"]
+        )
+        assert result == ["dbt", "run", "--exclude", "fqn:jaffle.orders"]
+
+    def test_no_exclusion_when_no_reused_selectors(self):
+        assert modify_dbt_command(["dbt", "run"], reused_selectors=[]) == [
+            "dbt",
+            "run",
+        ]
+
+    def test_reused_selectors_are_cautious_criteria_in_generated_selector(self):
+        with patch("src.orchestra_dbt.modify.load_yaml", side_effect=FileNotFoundError):
+            with patch("src.orchestra_dbt.modify.save_yaml") as mock_save:
+                modify_dbt_command(
+                    ["dbt", "build", "--select", "a+"],
+                    reused_selectors=[
+                        "fqn:jaffle.orders",
+                        "fqn:jaffle.customers,file:customers.sql,resource_type:model",
+                    ],
+                )
+
+        saved_selector = mock_save.call_args[0][1]["selectors"][-1]
+        cautious = {"indirect_selection": "cautious"}
+        assert saved_selector["definition"] == {
+            "union": [
+                "a+",
+                {
+                    "exclude": [
+                        {"method": "fqn", "value": "jaffle.orders", **cautious},
+                        {
+                            "intersection": [
+                                {
+                                    "method": "fqn",
+                                    "value": "jaffle.customers",
+                                    **cautious,
+                                },
+                                {
+                                    "method": "file",
+                                    "value": "customers.sql",
+                                    **cautious,
+                                },
+                                {
+                                    "method": "resource_type",
+                                    "value": "model",
+                                    **cautious,
+                                },
+                            ]
+                        },
+                    ]
+                },
+            ]
+        }
+
     def test_modify_dbt_command_with_selector_no_tag(self):
         with patch("src.orchestra_dbt.modify.log_error") as mock_log_error:
             modify_dbt_command(["dbt", "run", "--selector"])
@@ -364,13 +419,13 @@ class TestModifyDbtCommand:
 
 class TestSplitSelectionArgs:
     def test_no_selection_args(self):
-        passthrough, includes, excludes = _split_selection_args(["--threads", "4"])
+        passthrough, includes, excludes = split_selection_args(["--threads", "4"])
         assert passthrough == ["--threads", "4"]
         assert includes == []
         assert excludes == []
 
     def test_select_consumes_values_up_to_next_flag(self):
-        passthrough, includes, excludes = _split_selection_args(
+        passthrough, includes, excludes = split_selection_args(
             ["--select", "a", "b", "--exclude", "c", "--threads", "4"]
         )
         assert includes == ["a", "b"]
@@ -378,7 +433,7 @@ class TestSplitSelectionArgs:
         assert passthrough == ["--threads", "4"]
 
     def test_equals_form(self):
-        passthrough, includes, excludes = _split_selection_args(
+        passthrough, includes, excludes = split_selection_args(
             ["--select=my_model+", "--exclude=other"]
         )
         assert includes == ["my_model+"]
@@ -386,17 +441,17 @@ class TestSplitSelectionArgs:
         assert passthrough == []
 
     def test_select_aliases(self):
-        _, includes, _ = _split_selection_args(["-s", "a", "-m", "b", "--models", "c"])
+        _, includes, _ = split_selection_args(["-s", "a", "-m", "b", "--models", "c"])
         assert includes == ["a", "b", "c"]
 
     def test_whitespace_separated_values_in_one_token_are_split(self):
-        _, includes, _ = _split_selection_args(["--select", "model_a+ model_b"])
+        _, includes, _ = split_selection_args(["--select", "model_a+ model_b"])
         assert includes == ["model_a+", "model_b"]
-        _, includes_eq, _ = _split_selection_args(["--select=model_a model_b"])
+        _, includes_eq, _ = split_selection_args(["--select=model_a model_b"])
         assert includes_eq == ["model_a", "model_b"]
 
     def test_exclude_resource_types_is_not_treated_as_exclude(self):
-        passthrough, includes, excludes = _split_selection_args(
+        passthrough, includes, excludes = split_selection_args(
             ["--exclude-resource-types", "test"]
         )
         assert excludes == []
@@ -444,7 +499,9 @@ class TestSelectorsFileSnapshot:
         # End-to-end: a user selectors.yml is mutated by a generated selector,
         # then fully restored to its pre-run bytes.
         monkeypatch.chdir(tmp_path)
-        original = "selectors:\n  - name: nightly\n    definition:\n      tag: nightly\n"
+        original = (
+            "selectors:\n  - name: nightly\n    definition:\n      tag: nightly\n"
+        )
         f = tmp_path / "selectors.yml"
         f.write_text(original)
 
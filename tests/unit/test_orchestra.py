@@ -1,51 +1,58 @@
 from unittest.mock import patch
 
 from src.orchestra_dbt.orchestra import is_warn
+from src.orchestra_dbt.run_results import RunResult
+
+
+def _result(status: str) -> RunResult:
+    return RunResult(status=status, completed_at=None, execution_time=None)
 
 
 class TestIsWarn:
     def test_file_not_found(self, capsys):
         with (
-            patch("src.orchestra_dbt.orchestra.load_json") as mock_load_json,
+            patch("src.orchestra_dbt.orchestra.load_run_results") as mock_load,
         ):
-            mock_load_json.side_effect = FileNotFoundError("File not found")
+            mock_load.side_effect = FileNotFoundError("File not found")
             is_warn()
             assert capsys.readouterr().out.strip() == "SUCCEEDED"
 
     def test_file_malformed(self, capsys):
         with (
-            patch("src.orchestra_dbt.orchestra.load_json") as mock_load_json,
+            patch("src.orchestra_dbt.orchestra.load_run_results") as mock_load,
         ):
-            mock_load_json.side_effect = ValueError("Invalid JSON")
+            mock_load.side_effect = ValueError("Invalid JSON")
             is_warn()
             assert capsys.readouterr().out.strip() == "SUCCEEDED"
 
     def test_no_results_empty_array(self, capsys):
-        with patch("src.orchestra_dbt.orchestra.load_json") as mock_load_json:
-            mock_load_json.return_value = {"results": []}
+        with patch("src.orchestra_dbt.orchestra.load_run_results") as mock_load:
+            mock_load.return_value = {}
             is_warn()
             assert capsys.readouterr().out.strip() == "SUCCEEDED"
 
     def test_one_warning(self, capsys):
-        with patch("src.orchestra_dbt.orchestra.load_json") as mock_load_json:
-            mock_load_json.return_value = {
-                "results": [
-                    {"status": "success"},
-                    {"status": "warn"},
-                    {"status": "success"},
-                ]
+        with patch("src.orchestra_dbt.orchestra.load_run_results") as mock_load:
+            mock_load.return_value = {
+                "model.a": _result("success"),
+                "test.b": _result("warn"),
+                "model.c": _result("success"),
             }
             is_warn()
             assert capsys.readouterr().out.strip() == "WARNING"
 
     def test_no_warnings(self, capsys):
-        with patch("src.orchestra_dbt.orchestra.load_json") as mock_load_json:
-            mock_load_json.return_value = {
-                "results": [
-                    {"status": "success"},
-                    {"status": "success"},
-                    {"status": "error"},
-                ]
+        with patch("src.orchestra_dbt.orchestra.load_run_results") as mock_load:
+            mock_load.return_value = {
+                "model.a": _result("success"),
+                "model.b": _result("success"),
+                "model.c": _result("error"),
             }
             is_warn()
             assert capsys.readouterr().out.strip() == "SUCCEEDED"
+
+    def test_uses_given_run_results(self, capsys):
+        with patch("src.orchestra_dbt.orchestra.load_run_results") as mock_load:
+            is_warn({"test.b": _result("warn")})
+            mock_load.assert_not_called()
+            assert capsys.readouterr().out.strip() == "WARNING"
@@ -1,4 +1,6 @@
+import os
 from datetime import datetime
+from typing import Any, ClassVar
 
 import pytest
 import yaml
@@ -8,7 +10,10 @@ from src.orchestra_dbt.constants import ORCHESTRA_REUSED_NODE
 from src.orchestra_dbt.patcher import (
     patch_file,
     patch_seed_properties,
-    revert_patch_file,
+    patch_sql_files,
+    restore_partial_parse,
+    revert_patching,
+    snapshot_partial_parse,
 )
 
 
@@ -72,33 +77,179 @@ WHERE active = true
         result = sql_file.read_text(encoding="utf-8")
         assert "'orchestra_freshness': 0" in result
 
-    @pytest.mark.parametrize(
-        "freshness, last_updated",
-        [
-            (None, None),
-            (1, None),
-            (None, datetime(2025, 3, 4, 12, 30)),
-            (240, datetime(2025, 3, 4, 12, 30)),
-        ],
-    )
-    def test_revert_patch_file(
-        self, tmp_path, freshness: int | None, last_updated: datetime | None
-    ):
-        sql_file = tmp_path / "test_model.sql"
-        original_content = "\n\tTEST_CONTENT\n"
+    def test_patch_file_inside_snapshot_block(self, tmp_path):
+        sql_file = tmp_path / "orders_snapshot.sql"
+        original_content = (
+            "{% snapshot orders_snapshot %}\n"
+            "{{ config(strategy='check', check_cols='all') }}\n"
+            "select * from {{ source('raw', 'orders') }}\n"
+            "{% endsnapshot %}\n"
+        )
         sql_file.write_text(original_content, encoding="utf-8")
-        patch_file(
+
+        original = patch_file(
             file_path=sql_file,
-            reason="Test reason",
-            freshness=freshness,
-            last_updated=last_updated,
+            reason="Snapshot in same state as last run.",
+            freshness=None,
+            last_updated=None,
         )
-        revert_patch_file(file_path=sql_file)
+
+        result = sql_file.read_text(encoding="utf-8")
+        assert result.startswith(
+            f'{{% snapshot orders_snapshot %}}{{{{ config(tags=["{ORCHESTRA_REUSED_NODE}"]'
+        )
+        revert_patching({sql_file: original})
         assert sql_file.read_text(encoding="utf-8") == original_content
 
 
+class TestPatchSqlFiles:
+    @staticmethod
+    def _node(file_path: str) -> MaterialisationNode:
+        return MaterialisationNode(
+            asset_external_id=file_path,
+            checksum="checksum",
+            dbt_path=file_path,
+            file_path=file_path,
+            freshness_config=FreshnessConfig(),
+            freshness=Freshness.CLEAN,
+            sources={},
+            reason="Model in same state as last run.",
+        )
+
+    def test_patches_and_reverts_only_reused_files(
+        self, tmp_path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "models").mkdir()
+        (tmp_path / "dbt_packages" / "pkg" / "models").mkdir(parents=True)
+        reused = tmp_path / "models" / "reused.sql"
+        external = tmp_path / "dbt_packages" / "pkg" / "models" / "external.sql"
+        untouched = tmp_path / "models" / "untouched.sql"
+        for file in (reused, external, untouched):
+            file.write_text("select 1\n", encoding="utf-8")
+        nodes = {
+            "model.p.reused": self._node("models/reused.sql"),
+            "model.pkg.external": self._node("dbt_packages/pkg/models/external.sql"),
+            "model.p.missing": self._node("models/missing.sql"),
+            "seed.p.seed": self._node("seeds/seed.csv"),
+        }
+
+        snapshot = patch_sql_files(nodes)
+
+        # SQL files are only patched, never created.
+        assert None not in snapshot.values()
+        assert {
+            file: patched.content
+            for file, patched in snapshot.items()
+            if patched is not None
+        } == {
+            reused: b"select 1\n",
+            external: b"select 1\n",
+        }
+        assert ORCHESTRA_REUSED_NODE in reused.read_text(encoding="utf-8")
+        assert ORCHESTRA_REUSED_NODE in external.read_text(encoding="utf-8")
+        assert untouched.read_text(encoding="utf-8") == "select 1\n"
+        assert not (tmp_path / "models" / "missing.sql").exists()
+
+        revert_patching(snapshot)
+
+        assert reused.read_text(encoding="utf-8") == "select 1\n"
+        assert external.read_text(encoding="utf-8") == "select 1\n"
+
+    def test_revert_restores_original_timestamps(
+        self, tmp_path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "models").mkdir()
+        model = tmp_path / "models" / "model.sql"
+        model.write_text("select 1\n", encoding="utf-8")
+        os.utime(model, ns=(1_600_000_000_000_000_000, 1_700_000_000_123_456_789))
+
+        snapshot = patch_sql_files({"model.p.model": self._node("models/model.sql")})
+        assert model.stat().st_mtime_ns != 1_700_000_000_123_456_789
+        revert_patching(snapshot)
+
+        assert model.stat().st_mtime_ns == 1_700_000_000_123_456_789
+        assert model.stat().st_atime_ns == 1_600_000_000_000_000_000
+
+    def test_revert_restores_original_bytes_and_permissions(
+        self, tmp_path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "models").mkdir()
+        original = b"-- caf\xc3\xa9\r\nselect 1\r\n"
+        files = [tmp_path / "models" / f"model_{i}.sql" for i in range(20)]
+        for file in files:
+            file.write_bytes(original)
+            file.chmod(0o640)
+
+        snapshot = patch_sql_files(
+            {
+                f"model.p.model_{i}": self._node(f"models/model_{i}.sql")
+                for i in range(20)
+            }
+        )
+        for file in files:
+            assert file.read_bytes().endswith(b"\n\n" + original)
+            assert file.stat().st_mode & 0o777 == 0o640
+        revert_patching(snapshot)
+
+        for file in files:
+            assert file.read_bytes() == original
+            assert file.stat().st_mode & 0o777 == 0o640
+        assert sorted(path.name for path in (tmp_path / "models").iterdir()) == sorted(
+            file.name for file in files
+        )
+
+    def test_patch_and_revert_keep_symlinked_models(
+        self, tmp_path, monkeypatch: pytest.MonkeyPatch
+    ):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "models").mkdir()
+        (tmp_path / "shared").mkdir()
+        target = tmp_path / "shared" / "model.sql"
+        target.write_text("select 1\n", encoding="utf-8")
+        link = tmp_path / "models" / "model.sql"
+        link.symlink_to(target)
+
+        snapshot = patch_sql_files({"model.p.model": self._node("models/model.sql")})
+        assert link.is_symlink()
+        assert ORCHESTRA_REUSED_NODE in target.read_text(encoding="utf-8")
+        revert_patching(snapshot)
+
+        assert link.is_symlink() and link.resolve() == target.resolve()
+        assert target.read_text(encoding="utf-8") == "select 1\n"
+        assert sorted(path.name for path in (tmp_path / "models").iterdir()) == [
+            "model.sql"
+        ]
+
+
+class TestPartialParseSnapshot:
+    def test_restores_the_state_saved_before_the_patched_run(self, tmp_path):
+        partial_parse = tmp_path / "target" / "partial_parse.msgpack"
+        partial_parse.parent.mkdir()
+        partial_parse.write_bytes(b"before")
+
+        snapshot = snapshot_partial_parse(str(partial_parse))
+        partial_parse.write_bytes(b"patched")
+        restore_partial_parse(snapshot, str(partial_parse))
+
+        assert partial_parse.read_bytes() == b"before"
+
+    def test_keeps_the_run_state_when_there_was_none(self, tmp_path):
+        partial_parse = tmp_path / "target" / "partial_parse.msgpack"
+
+        snapshot = snapshot_partial_parse(str(partial_parse))
+        partial_parse.parent.mkdir()
+        partial_parse.write_bytes(b"patched")
+        restore_partial_parse(snapshot, str(partial_parse))
+
+        assert snapshot is None
+        assert partial_parse.read_bytes() == b"patched"
+
+
 class TestPatchSeedProperties:
-    SEEDS_TO_REUSE = {
+    SEEDS_TO_REUSE: ClassVar[dict[str, MaterialisationNode]] = {
         "seed_1": MaterialisationNode(
             asset_external_id="integration_account_id.seed_1",
             checksum="checksum_1",
@@ -123,7 +274,7 @@ class TestPatchSeedProperties:
         ),
     }
 
-    EXISTING_SEED_PROPERTIES = {
+    EXISTING_SEED_PROPERTIES: ClassVar[dict[str, Any]] = {
         "seeds": [
             {
                 "name": "seed_1",
@@ -0,0 +1,395 @@
+import threading
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from src.orchestra_dbt.models import SourceFreshness, StateApiModel
+from src.orchestra_dbt.prefetch import (
+    _collect_dbt_inputs,
+    _collect_dbt_inputs_in_worker,
+    prefetch_run_inputs,
+)
+from src.orchestra_dbt.state import StateLoadError
+
+SOURCE_FRESHNESS = SourceFreshness(sources={"source.p.s.t": datetime(2026, 1, 1)})
+SCOPE_MANIFEST = {
+    "parent_map": {"model.p.a": ["source.p.s.t"], "seed.p.s": []},
+    "sources": {"source.p.s.t": {"package_name": "p", "source_name": "s", "name": "t"}},
+}
+
+
+class TestCollectDbtInputs:
+    def test_resolves_selection_after_freshness(self, monkeypatch):
+        monkeypatch.setenv("ORCHESTRA_SCOPE_SOURCE_FRESHNESS", "false")
+        session = MagicMock()
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.get_source_freshness",
+                return_value=SOURCE_FRESHNESS,
+            ) as mock_freshness,
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_to_run",
+                return_value={"model.p.a"},
+            ) as mock_selection,
+        ):
+            result = _collect_dbt_inputs(("dbt", "build", "--target", "prod"), session)
+
+        assert result == (SOURCE_FRESHNESS, {"model.p.a"})
+        mock_freshness.assert_called_once_with(
+            target="prod", session=session, select=None, exclude=[]
+        )
+        mock_selection.assert_called_once_with(("--target", "prod"), session=session)
+
+    def test_skips_selection_without_freshness(self):
+        with (
+            patch("src.orchestra_dbt.prefetch.get_source_freshness", return_value=None),
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_from_manifest",
+                return_value=None,
+            ),
+            patch("src.orchestra_dbt.prefetch.get_node_ids_to_run") as mock_selection,
+        ):
+            assert _collect_dbt_inputs(("dbt", "build")) == (None, None)
+        mock_selection.assert_not_called()
+
+    def test_session_scopes_freshness_to_upstream_sources(self):
+        session = MagicMock()
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_to_run",
+                return_value={"model.p.a"},
+            ) as mock_selection,
+            patch(
+                "src.orchestra_dbt.prefetch.load_manifest", return_value=SCOPE_MANIFEST
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.get_source_freshness",
+                return_value=SOURCE_FRESHNESS,
+            ) as mock_freshness,
+        ):
+            result = _collect_dbt_inputs(("dbt", "build", "-s", "a"), session)
+
+        assert result == (SOURCE_FRESHNESS, {"model.p.a"})
+        mock_selection.assert_called_once_with(("-s", "a"), session=session)
+        mock_freshness.assert_called_once_with(
+            target=None, session=session, select=["source:p.s.t"], exclude=[]
+        )
+
+    def test_scopes_from_previous_manifest_then_reselects(self):
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_from_manifest",
+                return_value={"model.p.a"},
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.load_manifest", return_value=SCOPE_MANIFEST
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.get_source_freshness",
+                return_value=SOURCE_FRESHNESS,
+            ) as mock_freshness,
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_to_run",
+                return_value={"model.p.a", "model.p.b"},
+            ),
+            patch("src.orchestra_dbt.prefetch._parse_project") as mock_parse,
+        ):
+            result = _collect_dbt_inputs(("dbt", "build"))
+
+        assert result == (SOURCE_FRESHNESS, {"model.p.a", "model.p.b"})
+        mock_freshness.assert_called_once_with(
+            target=None, session=None, select=["source:p.s.t"], exclude=[]
+        )
+        mock_parse.assert_not_called()
+
+    def test_seed_command_skips_sources_upstream_of_models(self):
+        session = MagicMock()
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_to_run",
+                return_value={"model.p.a", "seed.p.s"},
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.load_manifest", return_value=SCOPE_MANIFEST
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.get_source_freshness",
+                return_value=SourceFreshness(sources={}),
+            ) as mock_freshness,
+        ):
+            _collect_dbt_inputs(("dbt", "seed"), session)
+
+        mock_freshness.assert_called_once_with(
+            target=None, session=session, select=[], exclude=[]
+        )
+
+    def test_parses_when_no_upstream_sources(self):
+        empty = SourceFreshness(sources={})
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_from_manifest",
+                return_value={"seed.p.s"},
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.load_manifest", return_value=SCOPE_MANIFEST
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.get_source_freshness", return_value=empty
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch._parse_project", return_value=True
+            ) as mock_parse,
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_to_run",
+                return_value={"seed.p.s"},
+            ),
+        ):
+            result = _collect_dbt_inputs(("dbt", "seed", "--target", "prod"))
+
+        assert result == (empty, {"seed.p.s"})
+        mock_parse.assert_called_once_with(("--target", "prod"))
+
+    def test_skipped_sources_are_not_queried_and_carried(self):
+        carried = datetime(2025, 12, 1)
+        session = MagicMock()
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_to_run",
+                return_value={"model.p.a"},
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.load_manifest", return_value=SCOPE_MANIFEST
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.get_source_freshness",
+                return_value=SourceFreshness(sources={}),
+            ) as mock_freshness,
+        ):
+            source_freshness, _ = _collect_dbt_inputs(
+                ("dbt", "build"), session, {"source.p.s.t": carried}
+            )
+
+        mock_freshness.assert_called_once_with(
+            target=None, session=session, select=[], exclude=[]
+        )
+        assert source_freshness == SourceFreshness(sources={"source.p.s.t": carried})
+
+    def test_cached_sources_are_not_queried(self):
+        cached = datetime(2026, 2, 1)
+        queried = SourceFreshness(sources={})
+        cache = MagicMock()
+        cache.fresh_sources.return_value = {"source.p.s.t": cached}
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_to_run",
+                return_value={"model.p.a"},
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.load_manifest", return_value=SCOPE_MANIFEST
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.open_source_freshness_cache",
+                return_value=cache,
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.get_source_freshness",
+                return_value=queried,
+            ) as mock_freshness,
+        ):
+            source_freshness, _ = _collect_dbt_inputs(("dbt", "build"), MagicMock())
+
+        assert mock_freshness.call_args.kwargs["select"] == []
+        cache.update.assert_called_once_with(queried)
+        assert source_freshness == SourceFreshness(sources={"source.p.s.t": cached})
+
+    def test_skipped_sources_are_excluded_when_unscoped(self, monkeypatch):
+        monkeypatch.setenv("ORCHESTRA_SCOPE_SOURCE_FRESHNESS", "false")
+        carried = datetime(2025, 12, 1)
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.load_manifest", return_value=SCOPE_MANIFEST
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.get_source_freshness",
+                return_value=SourceFreshness(sources={}),
+            ) as mock_freshness,
+            patch(
+                "src.orchestra_dbt.prefetch.get_node_ids_to_run",
+                return_value={"model.p.a"},
+            ),
+        ):
+            source_freshness, _ = _collect_dbt_inputs(
+                ("dbt", "build"), None, {"source.p.s.t": carried}
+            )
+
+        mock_freshness.assert_called_once_with(
+            target=None, session=None, select=None, exclude=["source:p.s.t"]
+        )
+        assert source_freshness == SourceFreshness(sources={"source.p.s.t": carried})
+
+
+class TestPrefetchRunInputs:
+    def test_with_session_runs_dbt_in_process(self):
+        state = StateApiModel(state={})
+        with (
+            patch("src.orchestra_dbt.prefetch.load_state", return_value=state),
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs",
+                return_value=(SOURCE_FRESHNESS, {"model.p.a"}),
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs_in_worker"
+            ) as mock_worker,
+        ):
+            prefetched = prefetch_run_inputs(("dbt", "build"), session=MagicMock())
+
+        mock_worker.assert_not_called()
+        assert prefetched.source_freshness == SOURCE_FRESHNESS
+        assert prefetched.node_ids_to_run == {"model.p.a"}
+        assert prefetched.state is state
+        assert prefetched.state_load_error is None
+
+    def test_without_session_uses_worker(self):
+        state = StateApiModel(state={})
+        with (
+            patch("src.orchestra_dbt.prefetch.load_state", return_value=state),
+            patch(
+                "src.orchestra_dbt.prefetch.construct_dag",
+                side_effect=FileNotFoundError("target/manifest.json"),
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs_in_worker",
+                return_value=((SOURCE_FRESHNESS, None), 1.0),
+            ) as mock_worker,
+        ):
+            prefetched = prefetch_run_inputs(("dbt", "build"))
+
+        mock_worker.assert_called_once_with(("dbt", "build"), {})
+        assert prefetched.node_ids_to_run is None
+        assert prefetched.state is state
+
+    def test_passes_planned_sources_to_dbt(self, monkeypatch):
+        monkeypatch.setenv("ORCHESTRA_PLAN_SOURCE_FRESHNESS", "true")
+        state = StateApiModel(state={})
+        planned = {"source.p.s.t": datetime(2026, 1, 1)}
+        session = MagicMock()
+        with (
+            patch("src.orchestra_dbt.prefetch.load_state", return_value=state),
+            patch("src.orchestra_dbt.prefetch.construct_dag") as mock_construct_dag,
+            patch("src.orchestra_dbt.prefetch.propagate_freshness_config"),
+            patch(
+                "src.orchestra_dbt.prefetch.plan_source_freshness",
+                return_value=planned,
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs",
+                return_value=(SOURCE_FRESHNESS, None),
+            ) as mock_collect,
+        ):
+            prefetch_run_inputs(("dbt", "build"), session=session)
+
+        mock_construct_dag.assert_called_once_with(SourceFreshness(sources={}), state)
+        mock_collect.assert_called_once_with(("dbt", "build"), session, planned)
+
+    def test_does_not_plan_without_a_manifest(self, monkeypatch):
+        monkeypatch.setenv("ORCHESTRA_PLAN_SOURCE_FRESHNESS", "true")
+        session = MagicMock()
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.load_state",
+                return_value=StateApiModel(state={}),
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch.construct_dag",
+                side_effect=FileNotFoundError("target/manifest.json"),
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs",
+                return_value=(SOURCE_FRESHNESS, None),
+            ) as mock_collect,
+        ):
+            prefetch_run_inputs(("dbt", "build"), session=session)
+
+        mock_collect.assert_called_once_with(("dbt", "build"), session, {})
+
+    def test_does_not_plan_full_refresh(self, monkeypatch):
+        monkeypatch.setenv("ORCHESTRA_PLAN_SOURCE_FRESHNESS", "true")
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.load_state",
+                return_value=StateApiModel(state={}),
+            ),
+            patch("src.orchestra_dbt.prefetch.construct_dag") as mock_construct_dag,
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs_in_worker",
+                return_value=((SOURCE_FRESHNESS, None), 1.0),
+            ) as mock_worker,
+        ):
+            prefetch_run_inputs(("dbt", "build", "--full-refresh"))
+
+        mock_construct_dag.assert_not_called()
+        mock_worker.assert_called_once_with(("dbt", "build", "--full-refresh"), {})
+
+    def test_state_load_overlaps_with_dbt(self):
+        # Each side waits for the other to start: run one after the other,
+        # they would time out.
+        state_started, dbt_started = threading.Event(), threading.Event()
+        state = StateApiModel(state={})
+
+        def load_state():
+            state_started.set()
+            assert dbt_started.wait(timeout=5)
+            return state
+
+        def collect_dbt_inputs(*_):
+            dbt_started.set()
+            assert state_started.wait(timeout=5)
+            return (SOURCE_FRESHNESS, None), 1.0
+
+        with (
+            patch("src.orchestra_dbt.prefetch.load_state", side_effect=load_state),
+            patch("src.orchestra_dbt.prefetch.construct_dag") as mock_construct_dag,
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs_in_worker",
+                side_effect=collect_dbt_inputs,
+            ),
+        ):
+            prefetched = prefetch_run_inputs(("dbt", "build"))
+
+        mock_construct_dag.assert_not_called()
+        assert prefetched.state is state
+        assert prefetched.source_freshness == SOURCE_FRESHNESS
+
+    def test_captures_state_load_error(self):
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.load_state",
+                side_effect=StateLoadError("unreachable"),
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs_in_worker",
+                return_value=((None, None), 0.5),
+            ),
+        ):
+            prefetched = prefetch_run_inputs(("dbt", "build"))
+
+        assert prefetched.state is None
+        assert str(prefetched.state_load_error) == "unreachable"
+
+    def test_worker_falls_back_in_process_when_pool_breaks(self):
+        executor = MagicMock()
+        executor.__enter__.return_value = executor
+        executor.submit.return_value.result.side_effect = BrokenProcessPool("gone")
+        with (
+            patch(
+                "src.orchestra_dbt.prefetch.ProcessPoolExecutor", return_value=executor
+            ),
+            patch(
+                "src.orchestra_dbt.prefetch._collect_dbt_inputs",
+                return_value=(SOURCE_FRESHNESS, None),
+            ) as mock_collect,
+        ):
+            (result, _) = _collect_dbt_inputs_in_worker(("dbt", "build"))
+
+        assert result == (SOURCE_FRESHNESS, None)
+        mock_collect.assert_called_once_with(("dbt", "build"), None, None)
@@ -0,0 +1,192 @@
+import json
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from src.orchestra_dbt.reused_selectors import (
+    load_reused_node_selectors,
+    reused_node_selectors,
+)
+from src.orchestra_dbt.selection import ManifestSelector
+
+
+def _node(fqn: list[str], resource_type: str, original_file_path: str) -> dict:
+    return {
+        "fqn": fqn,
+        "resource_type": resource_type,
+        "original_file_path": original_file_path,
+    }
+
+
+_MANIFEST = {
+    "nodes": {
+        "model.jaffle.orders": _node(
+            ["jaffle", "orders"], "model", "models/orders.sql"
+        ),
+        "model.jaffle.orders_daily": _node(
+            ["jaffle", "orders", "orders_daily"],
+            "model",
+            "models/orders/orders_daily.sql",
+        ),
+        "model.jaffle.customers": _node(
+            ["jaffle", "staging", "customers"], "model", "models/staging/customers.sql"
+        ),
+        "seed.jaffle.countries": _node(
+            ["jaffle", "countries"], "seed", "seeds/countries.csv"
+        ),
+    },
+    "snapshots": {},
+}
+
+
+class TestReusedNodeSelectors:
+    def test_selects_unambiguous_nodes_by_fqn(self):
+        assert reused_node_selectors(
+            ["model.jaffle.customers", "seed.jaffle.countries"], _MANIFEST
+        ) == ["fqn:jaffle.staging.customers", "fqn:jaffle.countries"]
+
+    def test_narrows_an_fqn_shared_with_a_folder(self):
+        assert reused_node_selectors(
+            ["model.jaffle.orders", "model.jaffle.orders_daily"], _MANIFEST
+        ) == [
+            "fqn:jaffle.orders,file:orders.sql,resource_type:model",
+            "fqn:jaffle.orders.orders_daily",
+        ]
+
+    def test_narrows_an_fqn_matched_without_its_package(self):
+        # `fqn:jaffle.orders` also matches `other.jaffle.orders.*`, since dbt
+        # matches fqns with and without their package.
+        manifest = {
+            "nodes": {
+                **_MANIFEST["nodes"],
+                "model.other.orders_v2": _node(
+                    ["other", "jaffle", "orders", "v2"], "model", "models/v2.sql"
+                ),
+            }
+        }
+        assert reused_node_selectors(["model.jaffle.customers"], manifest) == [
+            "fqn:jaffle.staging.customers"
+        ]
+        assert reused_node_selectors(["model.jaffle.orders_daily"], manifest) == [
+            "fqn:jaffle.orders.orders_daily"
+        ]
+        assert reused_node_selectors(["model.jaffle.orders"], manifest) == [
+            "fqn:jaffle.orders,file:orders.sql,resource_type:model"
+        ]
+
+    def test_skips_nodes_missing_from_the_manifest(self):
+        assert reused_node_selectors(["model.jaffle.gone"], _MANIFEST) == []
+
+
+def _member(
+    unique_id: str, original_file_path: str, tags: list[str] | None = None
+) -> dict:
+    resource_type, package, name = unique_id.split(".")
+    directories = Path(original_file_path).parent.parts[1:]
+    return {
+        "fqn": [package, *directories, name],
+        "resource_type": resource_type,
+        "original_file_path": original_file_path,
+        "package_name": package,
+        "tags": tags or [],
+    }
+
+
+def _large_manifest() -> dict:
+    nodes = {
+        f"model.shop.stg_{i}": _member(
+            f"model.shop.stg_{i}", f"models/staging/stg_{i}.sql"
+        )
+        for i in range(20)
+    }
+    nodes |= {
+        f"model.shop.mart_{i}": _member(
+            f"model.shop.mart_{i}",
+            f"models/marts/mart_{i}.sql",
+            ["finance"] if i < 5 else ["hourly"] if i < 8 else [],
+        )
+        for i in range(10)
+    }
+    nodes |= {
+        f"model.utils.util_{i}": _member(
+            f"model.utils.util_{i}", f"models/util_{i}.sql"
+        )
+        for i in range(5)
+    }
+    nodes |= {
+        f"seed.shop.seed_{i}": _member(f"seed.shop.seed_{i}", f"seeds/seed_{i}.csv")
+        for i in range(3)
+    }
+    nodes["test.shop.not_null_mart_6"] = _member(
+        "test.shop.not_null_mart_6", "models/marts/schema.yml", ["hourly"]
+    )
+    return {
+        "metadata": {"project_name": "shop"},
+        "nodes": nodes,
+        "sources": {"source.shop.raw.orders": {"tags": ["finance"]}},
+    }
+
+
+class TestCompactReusedNodeSelectors:
+    REUSED: ClassVar[list[str]] = [
+        *(f"model.shop.stg_{i}" for i in range(20)),
+        *(f"model.shop.mart_{i}" for i in range(8)),
+        *(f"model.utils.util_{i}" for i in range(5)),
+        "seed.shop.seed_0",
+    ]
+
+    def test_collapses_packages_directories_and_tags(self):
+        selectors = reused_node_selectors(self.REUSED, _large_manifest())
+
+        assert selectors == [
+            "package:utils,resource_type:model",
+            "path:models/staging,resource_type:model",
+            "fqn:shop.marts.mart_0",
+            "fqn:shop.marts.mart_1",
+            "fqn:shop.marts.mart_2",
+            "fqn:shop.marts.mart_3",
+            "fqn:shop.marts.mart_4",
+            "fqn:shop.marts.mart_5",
+            "fqn:shop.marts.mart_6",
+            "fqn:shop.marts.mart_7",
+            "fqn:shop.seed_0",
+        ]
+
+    def test_collapses_tags_carried_only_by_reused_nodes(self):
+        manifest = _large_manifest()
+        del manifest["sources"]
+        del manifest["nodes"]["test.shop.not_null_mart_6"]
+
+        selectors = reused_node_selectors(self.REUSED, manifest)
+
+        # `finance` was also on a source and `hourly` on a test, neither reused.
+        assert "tag:finance" in selectors
+        assert "tag:hourly" in selectors
+        assert not any(selector.startswith("fqn:shop.marts") for selector in selectors)
+
+    @pytest.mark.parametrize("drop_guards", [False, True])
+    def test_selects_exactly_the_reused_nodes(self, tmp_path: Path, drop_guards):
+        manifest = _large_manifest()
+        if drop_guards:
+            del manifest["sources"]
+            del manifest["nodes"]["test.shop.not_null_mart_6"]
+        for directory in ("models/staging", "models/marts", "seeds"):
+            (tmp_path / directory).mkdir(parents=True)
+
+        selectors = reused_node_selectors(self.REUSED, manifest)
+        selected = ManifestSelector(manifest, project_root=tmp_path).select(
+            selectors, []
+        )
+
+        assert selected == set(self.REUSED)
+        assert len(selectors) < len(self.REUSED) / 2
+
+
+def test_load_reused_node_selectors_reads_the_manifest(tmp_path: Path):
+    manifest_path = tmp_path / "manifest.json"
+    manifest_path.write_text(json.dumps(_MANIFEST), encoding="utf-8")
+
+    assert load_reused_node_selectors(
+        ["model.jaffle.customers"], str(manifest_path)
+    ) == ["fqn:jaffle.staging.customers"]
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import pytest
+
+from src.orchestra_dbt.run_context import get_run_context, invalidate_run_context
+from src.orchestra_dbt.state_types import StateBackendKind
+
+
+class TestRunContext:
+    def test_is_resolved_once(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path):
+        monkeypatch.chdir(tmp_path)
+        context = get_run_context()
+
+        monkeypatch.setenv("ORCHESTRA_DBT_DEBUG", "true")
+
+        assert get_run_context() is context
+        assert context.settings.debug is False
+
+    def test_invalidate_re_reads_settings(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("ORCHESTRA_API_KEY")
+        assert get_run_context().state_backend_config.kind == StateBackendKind.HTTP
+
+        monkeypatch.setenv("ORCHESTRA_STATE_FILE", str(tmp_path / "state.json"))
+        invalidate_run_context()
+
+        context = get_run_context()
+        assert context.state_backend_config.kind == StateBackendKind.LOCAL_FILE
+        assert context.state_backend_config.local_path == tmp_path / "state.json"
+
+    def test_changing_directory_re_resolves(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ):
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        (tmp_path / "b" / "pyproject.toml").write_text(
+            "[tool.orchestra_dbt]\nuse_stateful = true\n", encoding="utf-8"
+        )
+        monkeypatch.chdir(tmp_path / "a")
+        assert get_run_context().settings.use_stateful is False
+
+        monkeypatch.chdir(tmp_path / "b")
+
+        assert get_run_context().settings.use_stateful is True
@@ -0,0 +1,108 @@
+import json
+from datetime import UTC, datetime
+
+import pytest
+
+from src.orchestra_dbt.models import Freshness, FreshnessConfig, MaterialisationNode
+from src.orchestra_dbt.run_results import (
+    RunResult,
+    load_run_results,
+    write_reused_run_results,
+)
+
+
+def _reused_node(node_id: str) -> MaterialisationNode:
+    return MaterialisationNode(
+        asset_external_id=node_id,
+        checksum="abc",
+        dbt_path=f"models/{node_id}.sql",
+        file_path=f"models/{node_id}.sql",
+        freshness_config=FreshnessConfig(),
+        freshness=Freshness.CLEAN,
+        reason="Model in same state as last run.",
+        sources={},
+        last_updated=datetime(2026, 1, 1, 12, 0, 0),
+    )
+
+
+class TestWriteReusedRunResults:
+    def test_reports_every_reused_node_as_skipped(self, tmp_path):
+        path = tmp_path / "target" / "run_results.json"
+
+        write_reused_run_results(
+            {
+                "model.p.a": _reused_node("model.p.a"),
+                "model.p.b": _reused_node("model.p.b"),
+            },
+            ("dbt", "build", "--select", "a+"),
+            path=str(path),
+        )
+
+        run_results = json.loads(path.read_text())
+        assert run_results["metadata"]["dbt_schema_version"].endswith(
+            "run-results/v6.json"
+        )
+        assert run_results["args"] == {
+            "which": "build",
+            "invocation_command": "dbt build --select a+",
+        }
+        assert [(r["unique_id"], r["status"]) for r in run_results["results"]] == [
+            ("model.p.a", "skipped"),
+            ("model.p.b", "skipped"),
+        ]
+        assert run_results["results"][0]["message"] == (
+            "Reused by orchestra: Model in same state as last run."
+        )
+
+
+class TestLoadRunResults:
+    def test_indexes_results_by_unique_id(self, tmp_path):
+        path = tmp_path / "run_results.json"
+        path.write_text(
+            json.dumps(
+                {
+                    "metadata": {"dbt_schema_version": "v6"},
+                    "results": [
+                        {
+                            "unique_id": "model.p.a",
+                            "status": "success",
+                            "timing": [
+                                {
+                                    "name": "compile",
+                                    "completed_at": "2026-01-01T11:00:00Z",
+                                },
+                                {
+                                    "name": "execute",
+                                    "completed_at": "2026-01-01T12:00:00Z",
+                                },
+                            ],
+                            "execution_time": 1.5,
+                            "compiled_code": "select 1",
+                        },
+                        {"unique_id": "test.p.b", "status": "warn", "timing": []},
+                    ],
+                    "elapsed_time": 2.0,
+                }
+            )
+        )
+
+        assert load_run_results(str(path)) == {
+            "model.p.a": RunResult(
+                status="success",
+                completed_at=datetime(2026, 1, 1, 12, 0, 0, tzinfo=UTC),
+                execution_time=1.5,
+            ),
+            "test.p.b": RunResult(
+                status="warn", completed_at=None, execution_time=None
+            ),
+        }
+
+    def test_missing_file_is_empty(self, tmp_path):
+        assert load_run_results(str(tmp_path / "run_results.json")) == {}
+
+    def test_malformed_file_raises(self, tmp_path):
+        path = tmp_path / "run_results.json"
+        path.write_text('{"results": [{"unique_id": ')
+
+        with pytest.raises(ValueError):
+            load_run_results(str(path))
@@ -13,84 +13,11 @@ from src.orchestra_dbt.models import (
     SourceNode,
 )
 from src.orchestra_dbt.sao import (
-    build_dependency_graphs,
     calculate_nodes_to_run,
     should_mark_dirty_from_single_upstream,
 )
 
 
-class TestBuildDependencyGraphs:
-    def test_build_dependency_graphs(self):
-        assert build_dependency_graphs(
-            dag=ParsedDag(
-                nodes={
-                    "model.a": MaterialisationNode(
-                        asset_external_id="model.a",
-                        freshness=Freshness.CLEAN,
-                        checksum="1",
-                        dbt_path="models/model_a.sql",
-                        file_path="models/model_a.sql",
-                        reason="Node not seen before",
-                        sources={},
-                        freshness_config=FreshnessConfig(),
-                    ),
-                    "model.b": MaterialisationNode(
-                        asset_external_id="model.b",
-                        freshness=Freshness.CLEAN,
-                        checksum="2",
-                        dbt_path="models/model_b.sql",
-                        file_path="models/model_b.sql",
-                        reason="Node not seen before",
-                        sources={},
-                        freshness_config=FreshnessConfig(),
-                    ),
-                    "model.c": MaterialisationNode(
-                        asset_external_id="model.c",
-                        freshness=Freshness.CLEAN,
-                        checksum="3",
-                        dbt_path="models/model_c.sql",
-                        file_path="models/model_c.sql",
-                        reason="Node not seen before",
-                        sources={},
-                        freshness_config=FreshnessConfig(),
-                    ),
-                    "model.d": MaterialisationNode(
-                        asset_external_id="model.d",
-                        freshness=Freshness.CLEAN,
-                        checksum="4",
-                        dbt_path="models/model_d.sql",
-                        file_path="models/model_d.sql",
-                        reason="Node not seen before",
-                        sources={},
-                        freshness_config=FreshnessConfig(),
-                    ),
-                },
-                edges=[
-                    Edge(from_="model.a", to_="model.b"),
-                    Edge(from_="model.a", to_="model.c"),
-                    Edge(from_="model.b", to_="model.c"),
-                    Edge(from_="model.b", to_="model.d"),
-                ],
-            )
-        ) == (
-            {
-                "model.a": ["model.b", "model.c"],
-                "model.b": ["model.c", "model.d"],
-            },
-            {
-                "model.b": ["model.a"],
-                "model.c": ["model.a", "model.b"],
-                "model.d": ["model.b"],
-            },
-            {
-                "model.a": 0,
-                "model.b": 1,
-                "model.c": 2,
-                "model.d": 1,
-            },
-        )
-
-
 class TestShouldMarkDirtyFromSingleUpstream:
     @pytest.mark.parametrize(
         "upstream_id, upstream_node, current_node, expected",
@@ -361,6 +288,36 @@ class TestCalculateModelsToRun:
             and dag.nodes["model.b"].freshness == Freshness.DIRTY
         )
 
+    def test_calculate_nodes_to_run_ignores_parents_outside_the_dag(self):
+        # `model.ghost` (e.g. a disabled model) is only an edge endpoint.
+        dag = ParsedDag(
+            nodes={
+                "source.test": SourceNode(
+                    last_updated=datetime.now(),
+                ),
+                "model.a": MaterialisationNode(
+                    asset_external_id="model.a",
+                    freshness=Freshness.CLEAN,
+                    checksum="1",
+                    dbt_path="models/model_a.sql",
+                    file_path="models/model_a.sql",
+                    reason="Node not seen before",
+                    sources={},
+                    freshness_config=FreshnessConfig(),
+                ),
+            },
+            edges=[
+                Edge(from_="model.ghost", to_="model.a"),
+                Edge(from_="source.test", to_="model.a"),
+            ],
+        )
+        calculate_nodes_to_run(dag=dag)
+
+        assert (
+            isinstance(dag.nodes["model.a"], MaterialisationNode)
+            and dag.nodes["model.a"].freshness == Freshness.DIRTY
+        )
+
     def test_calculate_nodes_to_run_preserves_clean(self):
         dag = ParsedDag(
             nodes={
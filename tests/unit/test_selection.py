@@ -0,0 +1,261 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.orchestra_dbt.ls import get_node_ids_to_run
+from src.orchestra_dbt.selection import (
+    ManifestSelector,
+    UnsupportedSelectionError,
+    resolve_selection,
+)
+
+
+def _node(
+    unique_id: str,
+    resource_type: str = "model",
+    path: str = "",
+    tags: list[str] | None = None,
+    config: dict | None = None,
+    package_name: str = "jaffle",
+) -> dict:
+    name = unique_id.split(".")[-1]
+    return {
+        "unique_id": unique_id,
+        "resource_type": resource_type,
+        "name": name,
+        "package_name": package_name,
+        "fqn": [package_name, *path.split("/")[1:-1], name],
+        "original_file_path": path,
+        "tags": tags or [],
+        "config": config or {},
+    }
+
+
+@pytest.fixture
+def manifest() -> dict:
+    return {
+        "metadata": {"project_name": "jaffle"},
+        "nodes": {
+            "seed.jaffle.raw_orders": _node(
+                "seed.jaffle.raw_orders", "seed", "seeds/raw_orders.csv"
+            ),
+            "model.jaffle.stg_orders": _node(
+                "model.jaffle.stg_orders",
+                path="models/staging/stg_orders.sql",
+                tags=["staging"],
+                config={"materialized": "view"},
+            ),
+            "model.jaffle.stg_customers": _node(
+                "model.jaffle.stg_customers",
+                path="models/staging/stg_customers.sql",
+                tags=["staging", "pii"],
+                config={"materialized": "view"},
+            ),
+            "model.jaffle.orders": _node(
+                "model.jaffle.orders",
+                path="models/marts/orders.sql",
+                tags=["nightly"],
+                config={"materialized": "table", "meta": {"owner": "data"}},
+            ),
+            "snapshot.jaffle.orders_snapshot": _node(
+                "snapshot.jaffle.orders_snapshot",
+                "snapshot",
+                "snapshots/orders_snapshot.sql",
+            ),
+            "test.jaffle.not_null_orders_id": _node(
+                "test.jaffle.not_null_orders_id", "test", "models/marts/schema.yml"
+            ),
+            "model.utils.calendar": _node(
+                "model.utils.calendar",
+                path="models/calendar.sql",
+                package_name="utils",
+            ),
+        },
+        "sources": {
+            "source.jaffle.raw.customers": {
+                "resource_type": "source",
+                "package_name": "jaffle",
+                "source_name": "raw",
+                "name": "customers",
+                "fqn": ["jaffle", "raw", "customers"],
+                "original_file_path": "models/staging/sources.yml",
+                "tags": [],
+                "config": {},
+            },
+        },
+        "parent_map": {
+            "source.jaffle.raw.customers": [],
+            "seed.jaffle.raw_orders": [],
+            "model.jaffle.stg_orders": ["seed.jaffle.raw_orders"],
+            "model.jaffle.stg_customers": ["source.jaffle.raw.customers"],
+            "model.jaffle.orders": [
+                "model.jaffle.stg_orders",
+                "model.jaffle.stg_customers",
+            ],
+            "snapshot.jaffle.orders_snapshot": ["model.jaffle.orders"],
+            "test.jaffle.not_null_orders_id": ["model.jaffle.orders"],
+            "model.utils.calendar": [],
+        },
+        "child_map": {
+            "source.jaffle.raw.customers": ["model.jaffle.stg_customers"],
+            "seed.jaffle.raw_orders": ["model.jaffle.stg_orders"],
+            "model.jaffle.stg_orders": ["model.jaffle.orders"],
+            "model.jaffle.stg_customers": ["model.jaffle.orders"],
+            "model.jaffle.orders": [
+                "snapshot.jaffle.orders_snapshot",
+                "test.jaffle.not_null_orders_id",
+            ],
+            "snapshot.jaffle.orders_snapshot": [],
+            "test.jaffle.not_null_orders_id": [],
+            "model.utils.calendar": [],
+        },
+        "selectors": {
+            "nightly_marts": {
+                "name": "nightly_marts",
+                "definition": {
+                    "union": [
+                        {"method": "tag", "value": "nightly", "parents": True},
+                        {"exclude": [{"method": "resource_type", "value": "seed"}]},
+                    ]
+                },
+            },
+        },
+    }
+
+
+ALL_MATERIALISATIONS = {
+    "seed.jaffle.raw_orders",
+    "model.jaffle.stg_orders",
+    "model.jaffle.stg_customers",
+    "model.jaffle.orders",
+    "snapshot.jaffle.orders_snapshot",
+    "model.utils.calendar",
+}
+
+
+class TestResolveSelection:
+    def test_no_selection_returns_every_materialisation(self, manifest):
+        assert resolve_selection((), manifest) == ALL_MATERIALISATIONS
+
+    @pytest.mark.parametrize(
+        ("args", "expected"),
+        [
+            (("-s", "orders"), {"model.jaffle.orders"}),
+            (
+                ("--select", "jaffle.staging.*"),
+                {
+                    "model.jaffle.stg_orders",
+                    "model.jaffle.stg_customers",
+                },
+            ),
+            (("-s", "tag:pii"), {"model.jaffle.stg_customers"}),
+            (("-s", "config.materialized:table"), {"model.jaffle.orders"}),
+            (("-s", "config.meta.owner:data"), {"model.jaffle.orders"}),
+            (("-s", "package:utils"), {"model.utils.calendar"}),
+            (("-s", "file:orders_snapshot.sql"), {"snapshot.jaffle.orders_snapshot"}),
+            (("-s", "resource_type:seed"), {"seed.jaffle.raw_orders"}),
+            (
+                ("-s", "stg_orders", "stg_customers"),
+                {
+                    "model.jaffle.stg_orders",
+                    "model.jaffle.stg_customers",
+                },
+            ),
+            (("-s", "tag:staging,tag:pii"), {"model.jaffle.stg_customers"}),
+            (
+                ("-s", "tag:staging", "--exclude", "stg_orders"),
+                {"model.jaffle.stg_customers"},
+            ),
+        ],
+    )
+    def test_methods(self, manifest, args, expected):
+        assert resolve_selection(args, manifest) == expected
+
+    def test_graph_operators(self, manifest):
+        assert resolve_selection(("-s", "+orders"), manifest) == {
+            "seed.jaffle.raw_orders",
+            "model.jaffle.stg_orders",
+            "model.jaffle.stg_customers",
+            "model.jaffle.orders",
+        }
+        assert resolve_selection(("-s", "1+orders"), manifest) == {
+            "model.jaffle.stg_orders",
+            "model.jaffle.stg_customers",
+            "model.jaffle.orders",
+        }
+        assert resolve_selection(("-s", "source:raw.customers+"), manifest) == {
+            "model.jaffle.stg_customers",
+            "model.jaffle.orders",
+            "snapshot.jaffle.orders_snapshot",
+        }
+        assert resolve_selection(("-s", "@stg_customers"), manifest) == {
+            "seed.jaffle.raw_orders",
+            "model.jaffle.stg_orders",
+            "model.jaffle.stg_customers",
+            "model.jaffle.orders",
+            "snapshot.jaffle.orders_snapshot",
+        }
+
+    def test_path_method(self, manifest, tmp_path):
+        (tmp_path / "models" / "staging").mkdir(parents=True)
+        (tmp_path / "models" / "staging" / "stg_orders.sql").touch()
+
+        selected = ManifestSelector(manifest, project_root=tmp_path).select(
+            ["models/staging"], []
+        )
+
+        assert {"model.jaffle.stg_orders", "model.jaffle.stg_customers"} <= selected
+        assert "model.jaffle.orders" not in selected
+
+    def test_selector_from_manifest(self, manifest):
+        assert resolve_selection(("--selector", "nightly_marts"), manifest) == {
+            "model.jaffle.stg_orders",
+            "model.jaffle.stg_customers",
+            "model.jaffle.orders",
+        }
+
+    def test_default_selector_applies_without_selection(self, manifest):
+        manifest["selectors"]["nightly_marts"]["default"] = True
+
+        assert resolve_selection((), manifest) == {
+            "model.jaffle.stg_orders",
+            "model.jaffle.stg_customers",
+            "model.jaffle.orders",
+        }
+
+    @pytest.mark.parametrize(
+        "args",
+        [
+            ("-s", "state:modified+"),
+            ("-s", "result:error"),
+            ("--selector", "missing"),
+            ("--resource-type", "model"),
+        ],
+    )
+    def test_unsupported_selection_raises(self, manifest, args):
+        with pytest.raises(UnsupportedSelectionError):
+            resolve_selection(args, manifest)
+
+
+class TestGetNodeIdsToRun:
+    def test_uses_manifest_without_dbt_ls(self, manifest):
+        with (
+            patch("src.orchestra_dbt.ls.load_manifest", return_value=manifest),
+            patch("src.orchestra_dbt.ls._get_node_ids_from_ls") as mock_ls,
+        ):
+            assert get_node_ids_to_run(("-s", "orders")) == {"model.jaffle.orders"}
+        mock_ls.assert_not_called()
+
+    def test_falls_back_to_dbt_ls_for_unsupported_methods(self, manifest):
+        session = MagicMock()
+        with (
+            patch("src.orchestra_dbt.ls.load_manifest", return_value=manifest),
+            patch(
+                "src.orchestra_dbt.ls._get_node_ids_from_ls",
+                return_value={"model.jaffle.orders"},
+            ) as mock_ls,
+        ):
+            assert get_node_ids_to_run(("-s", "state:modified"), session) == {
+                "model.jaffle.orders"
+            }
+        mock_ls.assert_called_once_with(("-s", "state:modified"), session)
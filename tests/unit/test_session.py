@@ -0,0 +1,163 @@
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.orchestra_dbt.constants import ORCHESTRA_REUSED_NODE
+from src.orchestra_dbt.models import Freshness, FreshnessConfig, MaterialisationNode
+from src.orchestra_dbt.session import (
+    DbtSession,
+    exit_code_from_result,
+    get_args_for_parse,
+)
+
+
+class TestGetArgsForParse:
+    def test_no_user_args(self):
+        assert get_args_for_parse(()) == ["parse", "-q"]
+
+    def test_keeps_only_project_loading_flags(self):
+        assert get_args_for_parse(
+            (
+                "--select",
+                "+model_a",
+                "-t",
+                "prod",
+                "--vars",
+                "{'a': 1}",
+                "--full-refresh",
+                "--profiles-dir=/tmp/profiles",
+            )
+        ) == [
+            "parse",
+            "-q",
+            "-t",
+            "prod",
+            "--vars",
+            "{'a': 1}",
+            "--profiles-dir=/tmp/profiles",
+        ]
+
+    def test_flag_without_value_is_dropped(self):
+        assert get_args_for_parse(("--target",)) == ["parse", "-q"]
+
+
+@pytest.mark.parametrize(
+    ("success", "exception", "expected"),
+    [
+        (True, None, 0),
+        (False, None, 1),
+        (False, RuntimeError("boom"), 2),
+    ],
+)
+def test_exit_code_from_result(success, exception, expected) -> None:
+    assert (
+        exit_code_from_result(SimpleNamespace(success=success, exception=exception))
+        == expected
+    )
+
+
+class TestDbtSession:
+    def test_parses_once_and_reuses_manifest(self):
+        pytest.importorskip("dbt.cli.main")
+        import dbt.cli.requires as dbt_requires
+
+        original_adapter_management = dbt_requires.adapter_management  # pyright: ignore[reportPrivateImportUsage]
+        manifest = object()
+        runner_cls = MagicMock()
+        runner_cls.return_value.invoke.return_value = SimpleNamespace(
+            success=True, result=manifest, exception=None
+        )
+
+        with (
+            patch("dbt.cli.main.dbtRunner", runner_cls),
+            patch("dbt.adapters.factory.reset_adapters"),
+        ):
+            session = DbtSession(("-t", "prod"))
+            assert session.open() is True
+            assert dbt_requires.adapter_management is not original_adapter_management  # pyright: ignore[reportPrivateImportUsage]
+
+            session.invoke(["ls"])
+            session.invoke(["source", "freshness"])
+            session.close()
+
+        assert runner_cls.call_args_list[0] == ((), {})
+        assert runner_cls.return_value.invoke.call_args_list[0].args[0] == [
+            "parse",
+            "-q",
+            "-t",
+            "prod",
+        ]
+        assert [c.kwargs for c in runner_cls.call_args_list[1:]] == [
+            {"manifest": manifest},
+            {"manifest": manifest},
+        ]
+        assert dbt_requires.adapter_management is original_adapter_management  # pyright: ignore[reportPrivateImportUsage]
+
+    def test_open_returns_false_when_parse_fails(self):
+        pytest.importorskip("dbt.cli.main")
+        import dbt.cli.requires as dbt_requires
+
+        original_adapter_management = dbt_requires.adapter_management  # pyright: ignore[reportPrivateImportUsage]
+        runner_cls = MagicMock()
+        runner_cls.return_value.invoke.return_value = SimpleNamespace(
+            success=False, result=None, exception=RuntimeError("bad project")
+        )
+
+        with (
+            patch("dbt.cli.main.dbtRunner", runner_cls),
+            patch("dbt.adapters.factory.reset_adapters"),
+        ):
+            assert DbtSession(()).open() is False
+
+        assert dbt_requires.adapter_management is original_adapter_management  # pyright: ignore[reportPrivateImportUsage]
+
+    def test_invoke_before_open_raises(self):
+        pytest.importorskip("dbt.cli.main")
+        with pytest.raises(RuntimeError, match="not open"):
+            DbtSession(()).invoke(["ls"])
+
+    def test_tag_reused_nodes(self):
+        manifest_node = SimpleNamespace(
+            tags=["existing"],
+            meta={},
+            config=SimpleNamespace(tags=["existing"], meta={"owner": "data"}),
+        )
+        session = DbtSession(())
+        session.manifest = SimpleNamespace(nodes={"model.p.a": manifest_node})
+
+        session.tag_reused_nodes(
+            {
+                "model.p.a": MaterialisationNode(
+                    asset_external_id="model.p.a",
+                    checksum="abc",
+                    dbt_path="models/a.sql",
+                    file_path="models/a.sql",
+                    freshness_config=FreshnessConfig(minutes_sla=30),
+                    freshness=Freshness.CLEAN,
+                    reason="Upstream node(s) being reused.",
+                    sources={},
+                    last_updated=datetime(2026, 1, 1, 12, 0, 0),
+                ),
+                "model.p.missing": MaterialisationNode(
+                    asset_external_id="model.p.missing",
+                    checksum="def",
+                    dbt_path="models/missing.sql",
+                    file_path="models/missing.sql",
+                    freshness_config=FreshnessConfig(),
+                    freshness=Freshness.CLEAN,
+                    reason="reason",
+                    sources={},
+                ),
+            }
+        )
+
+        assert manifest_node.tags == ["existing", ORCHESTRA_REUSED_NODE]
+        assert manifest_node.config.tags == ["existing", ORCHESTRA_REUSED_NODE]
+        assert manifest_node.config.meta == {
+            "owner": "data",
+            "orchestra_reused_reason": "Upstream node(s) being reused.",
+            "orchestra_freshness": 30,
+            "orchestra_last_updated": "2026-01-01T12:00:00",
+        }
@@ -0,0 +1,135 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import pytz
+
+from src.orchestra_dbt.models import SourceFreshness
+from src.orchestra_dbt.run_context import get_run_context
+from src.orchestra_dbt.source_freshness.cache import (
+    SourceFreshnessCache,
+    open_source_freshness_cache,
+    source_ttl_minutes,
+)
+from src.orchestra_dbt.state_backends.local_file import LocalFileDocumentStore
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=pytz.UTC)
+LOADED_AT = datetime(2026, 3, 1, 9, 0, tzinfo=pytz.UTC)
+
+
+def _queried(*source_ids: str, minutes_ago: int = 0) -> SourceFreshness:
+    return SourceFreshness(
+        sources={source_id: LOADED_AT for source_id in source_ids},
+        snapshotted_at={
+            source_id: NOW - timedelta(minutes=minutes_ago) for source_id in source_ids
+        },
+    )
+
+
+class TestSourceFreshnessCache:
+    def test_round_trip_within_ttl(self, tmp_path: Path):
+        store = LocalFileDocumentStore(tmp_path / "source_freshness.json")
+        SourceFreshnessCache(store, ttl_minutes=30).update(
+            _queried("source.p.raw.a", minutes_ago=10)
+        )
+
+        cache = SourceFreshnessCache(store, ttl_minutes=30)
+        assert cache.fresh_sources(now=NOW) == {"source.p.raw.a": LOADED_AT}
+        assert cache.fresh_sources(now=NOW + timedelta(minutes=20)) == {}
+
+    def test_source_ttl_overrides_global_ttl(self, tmp_path: Path):
+        store = LocalFileDocumentStore(tmp_path / "source_freshness.json")
+        SourceFreshnessCache(store, ttl_minutes=None).update(
+            _queried("source.p.raw.a", "source.p.raw.b", "source.p.raw.c")
+        )
+
+        cache = SourceFreshnessCache(
+            store,
+            ttl_minutes=None,
+            source_ttls={"source.p.raw.a": 60, "source.p.raw.b": 0},
+        )
+        assert cache.fresh_sources(now=NOW + timedelta(minutes=5)) == {
+            "source.p.raw.a": LOADED_AT
+        }
+
+    def test_keeps_newer_entries_from_concurrent_jobs(self, tmp_path: Path):
+        store = LocalFileDocumentStore(tmp_path / "source_freshness.json")
+        ours = SourceFreshnessCache(store, ttl_minutes=30)
+        SourceFreshnessCache(store, ttl_minutes=30).update(
+            _queried("source.p.raw.a", "source.p.raw.b", minutes_ago=0)
+        )
+        ours.update(_queried("source.p.raw.a", minutes_ago=5))
+
+        cache = SourceFreshnessCache(store, ttl_minutes=30)
+        assert set(cache.fresh_sources(now=NOW)) == {
+            "source.p.raw.a",
+            "source.p.raw.b",
+        }
+        assert cache._entries["source.p.raw.a"].snapshotted_at == NOW
+
+    def test_ignores_sources_that_were_not_queried(self, tmp_path: Path):
+        store = LocalFileDocumentStore(tmp_path / "source_freshness.json")
+        SourceFreshnessCache(store, ttl_minutes=30).update(
+            SourceFreshness(sources={"source.p.raw.a": LOADED_AT})
+        )
+        assert store.read() is None
+
+    def test_invalid_cache_is_ignored(self, tmp_path: Path):
+        path = tmp_path / "source_freshness.json"
+        path.write_text("not json", encoding="utf-8")
+        cache = SourceFreshnessCache(LocalFileDocumentStore(path), ttl_minutes=30)
+        assert cache.fresh_sources(now=NOW) == {}
+
+    def test_unreadable_store_is_ignored(self, tmp_path: Path):
+        # A directory where the cache file should be cannot be read or written.
+        store = LocalFileDocumentStore(tmp_path)
+        cache = SourceFreshnessCache(store, ttl_minutes=30)
+        assert cache.fresh_sources(now=NOW) == {}
+
+        cache.update(_queried("source.p.raw.a", minutes_ago=10))
+        assert cache.fresh_sources(now=NOW) == {}
+
+    def test_store_bugs_are_not_swallowed(self):
+        store = MagicMock()
+        store.read.side_effect = TypeError("bug")
+        with pytest.raises(TypeError):
+            SourceFreshnessCache(store, ttl_minutes=30)
+
+
+def test_source_ttl_minutes_from_meta():
+    manifest = {
+        "sources": {
+            "source.p.raw.a": {
+                "config": {"meta": {"orchestra_freshness_ttl_minutes": 15}}
+            },
+            "source.p.raw.b": {"meta": {"orchestra_freshness_ttl_minutes": 5}},
+            "source.p.raw.c": {"meta": {"orchestra_freshness_ttl_minutes": "5"}},
+            "source.p.raw.d": {"config": {"meta": {}}},
+        }
+    }
+    assert source_ttl_minutes(manifest) == {"source.p.raw.a": 15, "source.p.raw.b": 5}
+
+
+class TestOpenSourceFreshnessCache:
+    def test_off_without_any_ttl(self):
+        assert open_source_freshness_cache(get_run_context(), {}) is None
+
+    def test_local_cache_in_cache_dir(self, monkeypatch, tmp_path: Path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("ORCHESTRA_SOURCE_FRESHNESS_TTL_MINUTES", "30")
+        cache = open_source_freshness_cache(get_run_context(), {})
+        assert cache is not None
+        cache.update(_queried("source.p.raw.a"))
+        assert (tmp_path / ".orchestra/cache/source_freshness.json").is_file()
+
+    def test_cache_beside_local_state(self, monkeypatch, tmp_path: Path):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("ORCHESTRA_API_KEY")
+        monkeypatch.setenv("ORCHESTRA_STATE_FILE", "shared/dbt_state.json")
+        monkeypatch.setenv("ORCHESTRA_SOURCE_FRESHNESS_TTL_MINUTES", "30")
+        monkeypatch.setenv("ORCHESTRA_SOURCE_FRESHNESS_CACHE", "state")
+        cache = open_source_freshness_cache(get_run_context(), {})
+        assert cache is not None
+        cache.update(_queried("source.p.raw.a"))
+        assert (tmp_path / "shared/source_freshness.json").is_file()
@@ -1,23 +1,38 @@
-from datetime import datetime, timezone
+import os
+from contextlib import nullcontext
+from datetime import UTC, datetime
+from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
 import pytz
 
+from src.orchestra_dbt.source_freshness.fallbacks.batch import BatchedSourceFreshness
+from src.orchestra_dbt.source_freshness.fallbacks.bigquery import (
+    bigquery_last_modified,
+    bigquery_last_modified_query,
+)
 from src.orchestra_dbt.source_freshness.fallbacks.common import (
     build_source_freshness_result_from_loaded_at,
+    fetch_catalog_freshness,
     parse_query_timestamp_cell,
 )
+from src.orchestra_dbt.source_freshness.fallbacks.duckdb import duckdb_last_modified
 from src.orchestra_dbt.source_freshness.fallbacks.registry import (
+    BATCH_FALLBACK_BY_ADAPTER_TYPE,
     FALLBACK_BY_ADAPTER_TYPE,
     loaded_at_fields_unset,
     try_registered_fallback,
 )
+from src.orchestra_dbt.source_freshness.fallbacks.snowflake import (
+    snowflake_last_altered,
+    snowflake_last_altered_query,
+)
 
 
 def test_parse_query_timestamp_cell_datetimes() -> None:
-    aware = datetime(2024, 6, 1, 10, 0, 0, tzinfo=timezone.utc)
+    aware = datetime(2024, 6, 1, 10, 0, 0, tzinfo=UTC)
     assert parse_query_timestamp_cell(aware) is aware
     naive = datetime(2024, 6, 1, 10, 0, 0)
     out = parse_query_timestamp_cell(naive)
@@ -26,7 +41,7 @@ def test_parse_query_timestamp_cell_datetimes() -> None:
 
 def test_parse_query_timestamp_cell_iso_strings() -> None:
     zulu = parse_query_timestamp_cell("2024-06-01T10:00:00Z")
-    assert zulu.tzinfo == timezone.utc and zulu.hour == 10
+    assert zulu.tzinfo == UTC and zulu.hour == 10
     naive_str = parse_query_timestamp_cell("2024-06-01T10:00:00")
     assert naive_str.tzinfo == pytz.UTC
 
@@ -69,7 +84,7 @@ def test_build_source_freshness_result_from_loaded_at_no_freshness_config() -> N
     from dbt.artifacts.schemas.results import FreshnessStatus
 
     node = SimpleNamespace(freshness=None, unique_id="source.x.y")
-    dt = datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc)
+    dt = datetime(2024, 1, 1, 12, 0, 0, tzinfo=UTC)
     result = build_source_freshness_result_from_loaded_at(
         max_loaded_at=dt,
         compiled_node=node,
@@ -78,3 +93,224 @@ def test_build_source_freshness_result_from_loaded_at_no_freshness_config() -> N
     assert result.status == FreshnessStatus.Pass
     assert result.max_loaded_at == dt
     assert result.node is node
+
+
+class StubAdapter:
+    """Answers every query with `rows` and records the SQL it was sent."""
+
+    def __init__(self, adapter_type: str, rows: list[tuple], error: bool = False):
+        self._adapter_type = adapter_type
+        self._rows = rows
+        self._error = error
+        self.queries: list[str] = []
+
+    def type(self) -> str:
+        return self._adapter_type
+
+    def connection_named(self, _name, _node):
+        return nullcontext()
+
+    def clear_transaction(self) -> None:
+        pass
+
+    def execute(self, sql: str, auto_begin: bool, fetch: bool):
+        self.queries.append(sql)
+        if self._error:
+            from dbt_common.exceptions import DbtDatabaseError
+
+            raise DbtDatabaseError("permission denied")
+        return None, SimpleNamespace(rows=self._rows)
+
+
+def _source(
+    name: str,
+    schema: str = "raw",
+    loaded_at_field: str | None = None,
+    database: str = "analytics",
+    meta: dict | None = None,
+) -> SimpleNamespace:
+    return SimpleNamespace(
+        unique_id=f"source.p.{schema}.{name}",
+        name=name,
+        identifier=name,
+        database=database,
+        schema=schema,
+        loaded_at_query=None,
+        loaded_at_field=loaded_at_field,
+        meta=meta or {},
+        source_meta={},
+    )
+
+
+def _manifest(*sources: SimpleNamespace) -> SimpleNamespace:
+    return SimpleNamespace(sources={source.unique_id: source for source in sources})
+
+
+def test_batch_registry() -> None:
+    assert BATCH_FALLBACK_BY_ADAPTER_TYPE == {
+        "bigquery": bigquery_last_modified,
+        "duckdb": duckdb_last_modified,
+        "snowflake": snowflake_last_altered,
+    }
+
+
+def test_batch_queries() -> None:
+    assert snowflake_last_altered_query("analytics", "o'raw") == (
+        "select table_name, last_altered from analytics.information_schema.tables "
+        "where upper(table_schema) = upper('o''raw')"
+    )
+    assert bigquery_last_modified_query("proj", "raw") == (
+        "select table_id, timestamp_millis(last_modified_time) "
+        "from `proj`.`raw`.__TABLES__"
+    )
+
+
+def test_fetch_catalog_freshness_matches_tables_case_insensitively() -> None:
+    adapter = StubAdapter(
+        "snowflake",
+        [
+            ("ORDERS", "2024-06-01T10:00:00Z"),
+            ("CUSTOMERS", datetime(2024, 6, 1, 9, 0)),
+            ("UNRELATED", "2024-06-01T08:00:00Z"),
+        ],
+    )
+    loaded_at = fetch_catalog_freshness(
+        adapter,
+        "select table_name, last_altered from tables",
+        [_source("orders"), _source("customers"), _source("payments")],
+    )
+    assert loaded_at == {
+        "source.p.raw.orders": datetime(2024, 6, 1, 10, 0, tzinfo=UTC),
+        "source.p.raw.customers": datetime(2024, 6, 1, 9, 0, tzinfo=pytz.UTC),
+    }
+    assert len(adapter.queries) == 1
+
+
+def test_batched_source_freshness_queries_each_schema_once() -> None:
+    pytest.importorskip("dbt_common")
+    orders, customers, events = (
+        _source("orders"),
+        _source("customers"),
+        _source("events", schema="web"),
+    )
+    configured = _source("payments", loaded_at_field="loaded_at")
+    manifest = _manifest(orders, customers, events, configured)
+    adapter = StubAdapter("snowflake", [("ORDERS", "2024-06-01T10:00:00Z")])
+    batched = BatchedSourceFreshness(BATCH_FALLBACK_BY_ADAPTER_TYPE)
+
+    assert batched.max_loaded_at(adapter, orders, manifest) is not None
+    assert batched.max_loaded_at(adapter, customers, manifest) is None
+    assert len(adapter.queries) == 1
+    batched.max_loaded_at(adapter, events, manifest)
+    assert len(adapter.queries) == 2
+
+
+def test_batched_source_freshness_only_queries_selected_sources() -> None:
+    pytest.importorskip("dbt_common")
+    orders, customers, payments, refunds = (
+        _source("orders"),
+        _source("customers"),
+        _source("payments"),
+        _source("refunds"),
+    )
+    manifest = _manifest(orders, customers, payments, refunds)
+    batches: list[list[str]] = []
+
+    def provider(_adapter, compiled_nodes):
+        batches.append(sorted(node.unique_id for node in compiled_nodes))
+        return {}
+
+    batched = BatchedSourceFreshness(
+        {"snowflake": provider},
+        selected={
+            "source.p.raw.orders",
+            "source.p.raw.customers",
+            "source.p.raw.refunds",
+        },
+        excluded={"source.p.raw.refunds"},
+    )
+    batched.max_loaded_at(StubAdapter("snowflake", []), orders, manifest)
+
+    assert batches == [["source.p.raw.customers", "source.p.raw.orders"]]
+
+
+def test_batched_source_freshness_without_provider_or_on_error() -> None:
+    pytest.importorskip("dbt_common")
+    orders = _source("orders")
+    manifest = _manifest(orders)
+
+    databricks = StubAdapter("databricks", [("orders", "2024-06-01T10:00:00Z")])
+    batched = BatchedSourceFreshness(BATCH_FALLBACK_BY_ADAPTER_TYPE)
+    assert batched.max_loaded_at(databricks, orders, manifest) is None
+    assert databricks.queries == []
+
+    failing = StubAdapter("bigquery", [], error=True)
+    batched = BatchedSourceFreshness(BATCH_FALLBACK_BY_ADAPTER_TYPE)
+    assert batched.max_loaded_at(failing, orders, manifest) is None
+    assert batched.max_loaded_at(failing, orders, manifest) is None
+    assert len(failing.queries) == 1
+
+
+def test_batched_source_freshness_does_not_hide_provider_bugs() -> None:
+    pytest.importorskip("dbt_common")
+    orders = _source("orders")
+
+    def provider(_adapter, _compiled_nodes):
+        raise TypeError("bug")
+
+    batched = BatchedSourceFreshness({"snowflake": provider})
+    with pytest.raises(TypeError):
+        batched.max_loaded_at(StubAdapter("snowflake", []), orders, _manifest(orders))
+
+
+class DuckDBAdapter(StubAdapter):
+    """Runs queries against a real DuckDB connection."""
+
+    def __init__(self, connection):
+        super().__init__("duckdb", [])
+        self._connection = connection
+
+    def execute(self, sql: str, auto_begin: bool, fetch: bool):
+        self.queries.append(sql)
+        return None, SimpleNamespace(rows=self._connection.execute(sql).fetchall())
+
+
+def _touch(path: Path, modified_at: datetime) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.touch()
+    os.utime(path, (modified_at.timestamp(), modified_at.timestamp()))
+
+
+def test_duckdb_last_modified_from_external_files(tmp_path: Path, capsys) -> None:
+    duckdb = pytest.importorskip("duckdb")
+    older = datetime(2024, 6, 1, 9, 0, tzinfo=pytz.UTC)
+    newer = datetime(2024, 6, 1, 10, 0, tzinfo=pytz.UTC)
+    _touch(tmp_path / "events" / "part-1.csv", older)
+    _touch(tmp_path / "events" / "part-2.csv", newer)
+    _touch(tmp_path / "sessions" / "part-1.csv", older)
+
+    connection = duckdb.connect()
+    connection.execute("create table orders (id integer)")
+    external_location = {"external_location": f"{tmp_path}/{{name}}/*.csv"}
+    events = _source("events", schema="main", meta=external_location)
+    sessions = _source("sessions", schema="main", meta=external_location)
+    orders = _source("orders", schema="main")
+    read_csv = _source(
+        "customers",
+        schema="main",
+        meta={"external_location": "read_csv('customers.csv')"},
+    )
+    adapter = DuckDBAdapter(connection)
+
+    loaded_at = duckdb_last_modified(adapter, [events, sessions, orders, read_csv])
+
+    assert loaded_at == {"source.p.main.events": newer, "source.p.main.sessions": older}
+    assert len(adapter.queries) == 1
+    output = capsys.readouterr().out
+    assert "source.p.main.customers, source.p.main.orders" in output
+
+
+def test_duckdb_last_modified_leaves_native_tables_out() -> None:
+    adapter = StubAdapter("duckdb", [])
+    assert duckdb_last_modified(adapter, [_source("orders", schema="main")]) == {}
+    assert adapter.queries == []
@@ -0,0 +1,92 @@
+from datetime import datetime, timedelta
+
+from src.orchestra_dbt.models import (
+    Edge,
+    Freshness,
+    FreshnessConfig,
+    MaterialisationNode,
+    ParsedDag,
+    SourceNode,
+)
+from src.orchestra_dbt.source_freshness.plan import plan_source_freshness
+
+NOW = datetime.now()
+
+
+def _model(
+    minutes_ago: int | None,
+    minutes_sla: int | None,
+    sources: dict[str, datetime] | None = None,
+    freshness: Freshness = Freshness.CLEAN,
+) -> MaterialisationNode:
+    return MaterialisationNode(
+        asset_external_id="model",
+        checksum="1",
+        dbt_path="models/model.sql",
+        file_path="models/model.sql",
+        freshness_config=FreshnessConfig(minutes_sla=minutes_sla),
+        freshness=freshness,
+        reason="Model in same state as last run.",
+        sources=sources or {},
+        last_updated=(
+            NOW - timedelta(minutes=minutes_ago) if minutes_ago is not None else None
+        ),
+    )
+
+
+def _dag(**models: MaterialisationNode) -> ParsedDag:
+    nodes = {
+        "source.p.raw.a": SourceNode(),
+        "source.p.raw.b": SourceNode(),
+        **{f"model.p.{name}": model for name, model in models.items()},
+    }
+    edges = [
+        Edge(from_=source_id, to_=f"model.p.{name}")
+        for name, model in models.items()
+        for source_id in model.sources
+    ]
+    return ParsedDag(nodes=nodes, edges=edges)
+
+
+class TestPlanSourceFreshness:
+    def test_skips_sources_whose_dependents_are_within_build_after(self):
+        loaded_at = NOW - timedelta(hours=2)
+        dag = _dag(
+            x=_model(10, 60, {"source.p.raw.a": loaded_at}),
+            y=_model(30, 60, {"source.p.raw.a": loaded_at - timedelta(hours=1)}),
+        )
+        assert plan_source_freshness(dag) == {"source.p.raw.a": loaded_at}
+
+    def test_queries_sources_without_dependents(self):
+        dag = _dag(x=_model(10, 60, {"source.p.raw.a": NOW}))
+        assert "source.p.raw.b" not in plan_source_freshness(dag)
+
+    def test_queries_every_source_with_empty_state(self):
+        # Built from empty state: no node has a last run or recorded sources,
+        # and nothing reads `b` yet.
+        dag = _dag(x=_model(None, 60))
+        dag.edges.append(Edge(from_="source.p.raw.a", to_="model.p.x"))
+        assert plan_source_freshness(dag) == {}
+
+    def test_queries_sources_a_dependent_has_no_record_of(self):
+        dag = _dag(
+            x=_model(10, 60, {"source.p.raw.a": NOW}),
+            y=_model(10, 60, {"source.p.raw.b": NOW}),
+        )
+        dag.edges.append(Edge(from_="source.p.raw.a", to_="model.p.y"))
+        assert plan_source_freshness(dag) == {"source.p.raw.b": NOW}
+
+    def test_queries_sources_with_a_dependent_outside_build_after(self):
+        dag = _dag(
+            x=_model(10, 60, {"source.p.raw.a": NOW}),
+            y=_model(90, 60, {"source.p.raw.a": NOW}),
+        )
+        assert "source.p.raw.a" not in plan_source_freshness(dag)
+
+    def test_queries_sources_with_a_dependent_without_build_after(self):
+        dag = _dag(x=_model(10, None, {"source.p.raw.a": NOW}))
+        assert "source.p.raw.a" not in plan_source_freshness(dag)
+
+    def test_queries_sources_with_a_dirty_dependent(self):
+        dag = _dag(x=_model(10, 60, {"source.p.raw.a": NOW}, freshness=Freshness.DIRTY))
+        assert "source.p.raw.a" not in plan_source_freshness(dag)
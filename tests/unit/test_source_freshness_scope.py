@@ -0,0 +1,84 @@
+from src.orchestra_dbt.source_freshness.scope import (
+    command_node_ids,
+    selected_source_id,
+    source_selectors,
+    upstream_source_ids,
+)
+
+MANIFEST = {
+    "parent_map": {
+        "model.p.mart": ["model.p.int", "model.p.other"],
+        "model.p.int": ["model.p.stg", "seed.p.lookup"],
+        "model.p.stg": ["source.p.raw.events"],
+        "model.p.other": ["source.p.raw.users", "model.p.stg"],
+        "model.p.unrelated": ["source.p.raw.orders"],
+        "seed.p.lookup": [],
+        "source.p.raw.events": [],
+        "source.p.raw.users": [],
+        "source.p.raw.orders": [],
+    },
+    "sources": {
+        "source.p.raw.events": {
+            "package_name": "p",
+            "source_name": "raw",
+            "name": "events",
+        },
+        "source.p.raw.users": {
+            "package_name": "p",
+            "source_name": "raw",
+            "name": "users",
+        },
+    },
+}
+
+
+class TestUpstreamSourceIds:
+    def test_walks_every_ancestor(self):
+        assert upstream_source_ids({"model.p.mart"}, MANIFEST) == {
+            "source.p.raw.events",
+            "source.p.raw.users",
+        }
+
+    def test_only_sources_of_the_selection(self):
+        assert upstream_source_ids({"model.p.stg"}, MANIFEST) == {"source.p.raw.events"}
+
+    def test_no_upstream_sources(self):
+        assert upstream_source_ids({"seed.p.lookup"}, MANIFEST) == set()
+        assert upstream_source_ids(set(), MANIFEST) == set()
+
+
+class TestSourceSelectors:
+    def test_sorted_selectors_from_source_names(self):
+        assert source_selectors(
+            {"source.p.raw.users", "source.p.raw.events"}, MANIFEST
+        ) == ["source:p.raw.events", "source:p.raw.users"]
+
+    def test_selectors_map_back_to_unique_ids(self):
+        source_ids = {"source.p.raw.users", "source.p.raw.orders"}
+        assert {
+            selected_source_id(selector)
+            for selector in source_selectors(source_ids, MANIFEST)
+        } == source_ids
+
+    def test_falls_back_to_unique_id_without_source_entry(self):
+        assert source_selectors({"source.p.raw.orders"}, MANIFEST) == [
+            "source:p.raw.orders"
+        ]
+
+
+class TestCommandNodeIds:
+    SELECTED = {"model.p.stg", "model.p.int", "seed.p.lookup"}
+
+    def test_seed_and_run_keep_their_resource_type(self):
+        assert command_node_ids("seed", self.SELECTED, MANIFEST) == {"seed.p.lookup"}
+        assert command_node_ids("run", self.SELECTED, MANIFEST) == {
+            "model.p.stg",
+            "model.p.int",
+        }
+
+    def test_build_keeps_the_selection(self):
+        assert command_node_ids("build", self.SELECTED, MANIFEST) is self.SELECTED
+        assert command_node_ids("build", None, MANIFEST) is None
+
+    def test_unresolved_selection_uses_every_node_of_the_type(self):
+        assert command_node_ids("seed", None, MANIFEST) == {"seed.p.lookup"}
@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from unittest.mock import MagicMock, patch
 
@@ -23,7 +24,6 @@ from src.orchestra_dbt.models import (
 from src.orchestra_dbt.state import (
     StateLoadError,
     StateSaveError,
-    _load_run_results,
     load_state,
     save_state,
     update_state,
@@ -200,26 +200,34 @@ class TestSaveState:
 
 
 class TestUpdateState:
-    @pytest.fixture(autouse=True)
-    def clear_lru_cache_run_results(self):
-        yield
-        _load_run_results.cache_clear()
+    @pytest.fixture
+    def write_run_results(self, monkeypatch: pytest.MonkeyPatch, tmp_path):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "target").mkdir()
+
+        def write(run_results: dict) -> None:
+            (tmp_path / "target" / "run_results.json").write_text(
+                json.dumps(run_results), encoding="utf-8"
+            )
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_with_model_and_run_results(self, mock_load_json):
+        return write
+
+    def test_update_state_with_model_and_run_results(self, write_run_results):
         """Test updating state with a model node that has successful run results."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
-                    ],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -248,21 +256,97 @@ class TestUpdateState:
         )
         assert state.state["model.test_project.model_a"].sources == {}
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_with_source_parents(self, mock_load_json):
+    def test_update_state_records_seed_checksum_algorithm(self, write_run_results):
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "seed.test_project.seed_a",
+                        "status": "success",
+                        "timing": [
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
+        state = StateApiModel(state={})
+        parsed_dag = ParsedDag(
+            nodes={
+                "seed.test_project.seed_a": MaterialisationNode(
+                    asset_external_id="seed.test_project.seed_a",
+                    checksum="b2",
+                    checksum_algorithm="blake2b",
+                    freshness=Freshness.DIRTY,
+                    dbt_path="seeds/seed_a.csv",
+                    file_path="seeds/seed_a.csv",
+                    reason="Checksum changed since last run.",
+                    sources={},
+                    freshness_config=FreshnessConfig(),
+                )
+            },
+            edges=[],
+        )
+
+        update_state(state, parsed_dag, SourceFreshness(sources={}))
+
+        assert state.state["seed.test_project.seed_a"].checksum == "b2"
+        assert state.state["seed.test_project.seed_a"].checksum_algorithm == "blake2b"
+
+    def test_update_state_leaves_default_checksum_algorithm_implicit(
+        self, write_run_results
+    ):
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "seed.test_project.seed_a",
+                        "status": "success",
+                        "timing": [
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
+        state = StateApiModel(state={})
+        parsed_dag = ParsedDag(
+            nodes={
+                "seed.test_project.seed_a": MaterialisationNode(
+                    asset_external_id="seed.test_project.seed_a",
+                    checksum="s2",
+                    checksum_algorithm="sha256",
+                    freshness=Freshness.DIRTY,
+                    dbt_path="seeds/seed_a.csv",
+                    file_path="seeds/seed_a.csv",
+                    reason="Checksum changed since last run.",
+                    sources={},
+                    freshness_config=FreshnessConfig(),
+                )
+            },
+            edges=[],
+        )
+
+        update_state(state, parsed_dag, SourceFreshness(sources={}))
+
+        assert state.state["seed.test_project.seed_a"].checksum_algorithm is None
+
+    def test_update_state_with_source_parents(self, write_run_results):
         """Test updating state with a model that has source parents."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
-                    ],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -299,10 +383,9 @@ class TestUpdateState:
             "source.test_db.test_schema.test_table": datetime(2024, 1, 1, 11, 0, 0)
         }
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_skips_model_without_run_results(self, mock_load_json):
+    def test_update_state_skips_model_without_run_results(self, write_run_results):
         """Test that models without run results are skipped."""
-        mock_load_json.return_value = {"results": []}
+        write_run_results({"results": []})
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -326,21 +409,22 @@ class TestUpdateState:
 
         assert state.state == {}
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_skips_model_with_failed_status(self, mock_load_json):
+    def test_update_state_skips_model_with_failed_status(self, write_run_results):
         """Test that models with failed status are skipped."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "error",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
-                    ],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "error",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -364,21 +448,22 @@ class TestUpdateState:
 
         assert state.state == {}
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_skips_non_model_nodes(self, mock_load_json):
+    def test_update_state_skips_non_model_nodes(self, write_run_results):
         """Test that non-model nodes (like sources) are skipped."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "source.test_db.test_schema.test_table",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
-                    ],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "source.test_db.test_schema.test_table",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -393,29 +478,30 @@ class TestUpdateState:
 
         assert state.state == {}
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_with_multiple_models(self, mock_load_json):
+    def test_update_state_with_multiple_models(self, write_run_results):
         """Test updating state with multiple model nodes."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
-                    ],
-                },
-                {
-                    "unique_id": "model.test_project.model_b",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T11:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T13:00:00"},
-                    ],
-                },
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    },
+                    {
+                        "unique_id": "model.test_project.model_b",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T11:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T13:00:00"},
+                        ],
+                    },
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -453,21 +539,22 @@ class TestUpdateState:
         assert state.state["model.test_project.model_a"].checksum == "abc123"
         assert state.state["model.test_project.model_b"].checksum == "def456"
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_with_multiple_source_parents(self, mock_load_json):
+    def test_update_state_with_multiple_source_parents(self, write_run_results):
         """Test updating state with a model that has multiple source parents."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
-                    ],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -516,21 +603,22 @@ class TestUpdateState:
             in state.state["model.test_project.model_a"].sources
         )
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_skips_source_not_in_freshness(self, mock_load_json):
+    def test_update_state_skips_source_not_in_freshness(self, write_run_results):
         """Test that source parents not in source_freshness are skipped."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
-                    ],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -580,21 +668,22 @@ class TestUpdateState:
             not in state.state["model.test_project.model_a"].sources
         )
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_overwrites_existing_state(self, mock_load_json):
+    def test_update_state_overwrites_existing_state(self, write_run_results):
         """Test that update_state overwrites existing state entries."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T14:00:00"},
-                    ],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T14:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
 
         # Start with existing state
         state = StateApiModel(
@@ -630,21 +719,22 @@ class TestUpdateState:
             2024, 1, 1, 14, 0, 0
         )
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_skips_model_parents(self, mock_load_json):
+    def test_update_state_skips_model_parents(self, write_run_results):
         """Test that model parents (not sources) are not included in sources dict."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_b",
-                    "status": "success",
-                    "timing": [
-                        {"name": "compile", "started_at": "2024-01-01T10:00:00"},
-                        {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
-                    ],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_b",
+                        "status": "success",
+                        "timing": [
+                            {"name": "compile", "started_at": "2024-01-01T10:00:00"},
+                            {"name": "execute", "completed_at": "2024-01-01T12:00:00"},
+                        ],
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -685,18 +775,19 @@ class TestUpdateState:
         # model_a is a parent but not a source, so it shouldn't be in sources dict
         assert state.state["model.test_project.model_b"].sources == {}
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_handles_missing_timing(self, mock_load_json):
+    def test_update_state_handles_missing_timing(self, write_run_results):
         """Test that models with missing timing data are skipped."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "success",
-                    # Missing timing field
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "success",
+                        # Missing timing field
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -720,18 +811,19 @@ class TestUpdateState:
 
         assert state.state == {}
 
-    @patch("src.orchestra_dbt.state.load_json")
-    def test_update_state_handles_empty_timing(self, mock_load_json):
+    def test_update_state_handles_empty_timing(self, write_run_results):
         """Test that models with empty timing array are skipped."""
-        mock_load_json.return_value = {
-            "results": [
-                {
-                    "unique_id": "model.test_project.model_a",
-                    "status": "success",
-                    "timing": [],
-                }
-            ]
-        }
+        write_run_results(
+            {
+                "results": [
+                    {
+                        "unique_id": "model.test_project.model_a",
+                        "status": "success",
+                        "timing": [],
+                    }
+                ]
+            }
+        )
 
         state = StateApiModel(state={})
         parsed_dag = ParsedDag(
@@ -811,6 +903,62 @@ class TestSaveStateFile:
         loaded = load_state()
         assert loaded.state["model.test"].checksum == "123"
 
+    def test_save_state_file_keeps_baseline_format(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path
+    ):
+        # A state file written before seeds recorded their checksum algorithm.
+        baseline = (
+            '{"state":{"seed.test_project.seed_a":{"last_updated":'
+            '"2024-01-01T12:00:00","checksum":"s2","sources":{}}}}'
+        )
+        p = tmp_path / "st.json"
+        p.write_text(baseline, encoding="utf-8")
+        (tmp_path / "target").mkdir()
+        (tmp_path / "target" / "run_results.json").write_text(
+            json.dumps(
+                {
+                    "results": [
+                        {
+                            "unique_id": "seed.test_project.seed_a",
+                            "status": "success",
+                            "timing": [
+                                {
+                                    "name": "execute",
+                                    "completed_at": "2024-01-01T12:00:00",
+                                }
+                            ],
+                        }
+                    ]
+                }
+            ),
+            encoding="utf-8",
+        )
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.delenv("ORCHESTRA_API_KEY", raising=False)
+        monkeypatch.setenv("ORCHESTRA_STATE_FILE", str(p))
+        parsed_dag = ParsedDag(
+            nodes={
+                "seed.test_project.seed_a": MaterialisationNode(
+                    asset_external_id="seed.test_project.seed_a",
+                    checksum="s2",
+                    checksum_algorithm="sha256",
+                    freshness=Freshness.CLEAN,
+                    dbt_path="seeds/seed_a.csv",
+                    file_path="seeds/seed_a.csv",
+                    reason="Seed in same state as last run.",
+                    sources={},
+                    freshness_config=FreshnessConfig(),
+                )
+            },
+            edges=[],
+        )
+
+        state = load_state()
+        update_state(state, parsed_dag, SourceFreshness(sources={}))
+        save_state(state)
+
+        assert p.read_text(encoding="utf-8") == baseline
+
 
 class TestLoadStateS3:
     @mock_aws
@@ -882,14 +1030,14 @@ class TestLoadStateGCS:
         from cloud_storage_mocker._core import Client as MockClient
 
         with gcs_patch(
-            mounts=[Mount("test-bucket", tmp_path / "gcs", readable=True, writable=True)]
+            mounts=[
+                Mount("test-bucket", tmp_path / "gcs", readable=True, writable=True)
+            ]
         ):
             with patch.object(MockClient, "get_bucket", return_value=None, create=True):
                 assert load_state() == StateApiModel(state={})
 
-    def test_load_state_gcs_success(
-        self, monkeypatch: pytest.MonkeyPatch, tmp_path
-    ):
+    def test_load_state_gcs_success(self, monkeypatch: pytest.MonkeyPatch, tmp_path):
         bucket_dir = tmp_path / "gcs"
         blob_path = bucket_dir / "k.json"
         bucket_dir.mkdir()
@@ -997,9 +1145,7 @@ class TestAzureStateBackend:
 
     @patch("src.orchestra_dbt.state_backends.azure.BlobServiceClient")
     @patch("src.orchestra_dbt.state_backends.azure.DefaultAzureCredential")
-    def test_load_raises_when_container_missing(
-        self, mock_credential, mock_client_cls
-    ):
+    def test_load_raises_when_container_missing(self, mock_credential, mock_client_cls):
         from azure.core.exceptions import ResourceNotFoundError
         from src.orchestra_dbt.state_errors import StateLoadError
 
@@ -1076,7 +1222,12 @@ class TestAzureStateBackend:
         with pytest.raises(StateSaveError):
             backend.save(StateApiModel(state={}))
 
-    @patch.dict("os.environ", {"AZURE_STORAGE_CONNECTION_STRING": "DefaultEndpointsProtocol=https;AccountName=myaccount;AccountKey=fake;EndpointSuffix=core.windows.net"})
+    @patch.dict(
+        "os.environ",
+        {
+            "AZURE_STORAGE_CONNECTION_STRING": "DefaultEndpointsProtocol=https;AccountName=myaccount;AccountKey=fake;EndpointSuffix=core.windows.net"
+        },
+    )
     @patch("src.orchestra_dbt.state_backends.azure.BlobServiceClient")
     def test_load_uses_connection_string_when_set(self, mock_client_cls):
         payload = '{"state": {}}'
@@ -1119,7 +1270,12 @@ class TestAzureStateBackend:
         mock_client_cls.assert_called_once()
         assert result == StateApiModel(state={})
 
-    @patch.dict("os.environ", {"AZURE_STORAGE_CONNECTION_STRING": "DefaultEndpointsProtocol=https;AccountName=otheraccount;AccountKey=fake;EndpointSuffix=core.windows.net"})
+    @patch.dict(
+        "os.environ",
+        {
+            "AZURE_STORAGE_CONNECTION_STRING": "DefaultEndpointsProtocol=https;AccountName=otheraccount;AccountKey=fake;EndpointSuffix=core.windows.net"
+        },
+    )
     @patch("src.orchestra_dbt.state_backends.azure.BlobServiceClient")
     def test_load_raises_when_connection_string_account_mismatches_uri(
         self, mock_client_cls
@@ -1134,7 +1290,12 @@ class TestAzureStateBackend:
 
         mock_client_cls.from_connection_string.assert_not_called()
 
-    @patch.dict("os.environ", {"AZURE_STORAGE_CONNECTION_STRING": "DefaultEndpointsProtocol=https;AccountName=otheraccount;AccountKey=fake;EndpointSuffix=core.windows.net"})
+    @patch.dict(
+        "os.environ",
+        {
+            "AZURE_STORAGE_CONNECTION_STRING": "DefaultEndpointsProtocol=https;AccountName=otheraccount;AccountKey=fake;EndpointSuffix=core.windows.net"
+        },
+    )
     @patch("src.orchestra_dbt.state_backends.azure.BlobServiceClient")
     def test_save_raises_when_connection_string_account_mismatches_uri(
         self, mock_client_cls
@@ -1149,7 +1310,10 @@ class TestAzureStateBackend:
 
         mock_client_cls.from_connection_string.assert_not_called()
 
-    @patch.dict("os.environ", {"AZURE_STORAGE_CONNECTION_STRING": "not-a-valid-connection-string"})
+    @patch.dict(
+        "os.environ",
+        {"AZURE_STORAGE_CONNECTION_STRING": "not-a-valid-connection-string"},
+    )
     @patch("src.orchestra_dbt.state_backends.azure.BlobServiceClient")
     def test_load_wraps_invalid_connection_string_as_state_load_error(
         self, mock_client_cls
@@ -1,8 +1,17 @@
+from pathlib import Path
+
+import boto3
 import pytest
+from moto import mock_aws
 
-from src.orchestra_dbt.state_backends.factory import resolve_state_backend_config
+from src.orchestra_dbt.state_backends.factory import (
+    document_store_beside_state,
+    resolve_state_backend_config,
+)
 from src.orchestra_dbt.state_types import (
+    StateBackendConfig,
     StateBackendKind,
+    backend_config_from_state_location,
     parse_abfs_uri,
     parse_gcs_uri,
     parse_s3_uri,
@@ -165,3 +174,35 @@ def test_abfs_uri_routes_to_azure_backend(
     assert cfg.azure_account == "myaccount"
     assert cfg.azure_container == "mycontainer"
     assert cfg.azure_key == "path/state.json"
+
+
+def test_document_store_beside_local_state(tmp_path) -> None:
+    cfg = backend_config_from_state_location(
+        "state/dbt_state.json", resolve_relative_from=tmp_path
+    )
+    store = document_store_beside_state(cfg, "source_freshness.json")
+    assert store is not None
+    assert store.read() is None
+    store.write(b"{}")
+    assert (tmp_path / "state" / "source_freshness.json").read_bytes() == b"{}"
+
+
+@mock_aws
+def test_document_store_beside_s3_state() -> None:
+    conn = boto3.client("s3", region_name="us-east-1")
+    conn.create_bucket(Bucket="bucket")
+    cfg = backend_config_from_state_location(
+        "s3://bucket/dir/f.json", resolve_relative_from=Path.cwd()
+    )
+    store = document_store_beside_state(cfg, "source_freshness.json")
+    assert store is not None
+    assert store.read() is None
+    store.write(b"{}")
+    body = conn.get_object(Bucket="bucket", Key="dir/source_freshness.json")["Body"]
+    assert body.read() == b"{}"
+    assert store.read() == b"{}"
+
+
+def test_no_document_store_beside_http_state() -> None:
+    cfg = StateBackendConfig(kind=StateBackendKind.HTTP)
+    assert document_store_beside_state(cfg, "source_freshness.json") is None